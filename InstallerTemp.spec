@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('*.py', '.'), ('*.pyw', '.'), ('Assets', 'Assets')],
-    hiddenimports=['game_switcher', 'actions_context', 'actions_settings', 'ui_components', 'win32com.client'],
+    hiddenimports=['game_switcher', 'actions_context', 'actions_settings', 'ui_components', 'asset_cache', 'job_runner', 'switch_service', 'main_window', 'instrumentation', 'platform_backend', 'game_registry', 'settings_adapters', 'settings_snapshots', 'launch_monitor', 'switch_metrics', 'trash_reaper', 'switch_coordinator', 'file_locks', 'profile_watcher', 'account_index', 'account_order', 'account_usage', 'quick_switch', 'profile_prefetch', 'cold_storage', 'win32com.client'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
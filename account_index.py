@@ -0,0 +1,213 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from game_registry import GAMES
+
+# Scores per kind of match; a term counts once, with its best match.
+EXACT, NAME_PREFIX, WORD_PREFIX, TAG_PREFIX, SUBSTRING, FUZZY = 100, 80, 60, 40, 30, 10
+# Share of a term's trigrams a name must contain to count as a typo'd match.
+FUZZY_THRESHOLD = 0.6
+# Trigrams found in more than this share of accounts (and at least COMMON_TRIGRAM_MIN of them) say little
+# about a match and are skipped in fuzzy matching.
+COMMON_TRIGRAM_SHARE = 0.25
+COMMON_TRIGRAM_MIN = 100
+
+_WORD_SPLIT = re.compile(r"[^\w]+|_")
+
+
+def _fold(text):
+    return text.casefold().strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _prefix_end(prefix):
+    # Smallest string greater than every string starting with prefix.
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class _SortedPostings:
+    """Keys kept sorted with the account each belongs to in a parallel list, so a prefix selects one slice."""
+
+    def __init__(self):
+        self.keys = []
+        self.names = []
+
+    def load(self, pairs):
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+
+    def add(self, key, name):
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.names.insert(i, name)
+
+    def remove(self, key, name):
+        lo, hi = bisect_left(self.keys, key), bisect_right(self.keys, key)
+        try:
+            i = self.names.index(name, lo, hi)
+        except ValueError:
+            return
+        del self.keys[i]
+        del self.names[i]
+
+    def prefix_range(self, prefix):
+        return bisect_left(self.keys, prefix), bisect_left(self.keys, _prefix_end(prefix))
+
+
+class AccountIndex:
+    """
+    In-memory search index over account names, games and tags. Name and word prefixes are one bisect into
+    sorted lists, substrings and typos go through a trigram index, and results are merged with set/dict
+    operations, so a keystroke stays well under a millisecond with thousands of accounts.
+    Kept up to date with add/remove/rename instead of being rebuilt.
+    """
+
+    def __init__(self, accounts=None):
+        self._entries = {} # name -> (folded name, words, tags)
+        self._names = _SortedPostings()
+        self._words = _SortedPostings()
+        self._tags = {} # tag or game word -> set of names
+        self._tag_keys = [] # sorted keys of _tags
+        self._trigrams = {} # trigram -> set of names
+        if accounts:
+            self.rebuild(accounts)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def rebuild(self, accounts):
+        """accounts: {name: (game, tags)}."""
+        self._entries, self._tags, self._trigrams = {}, {}, {}
+        names, words = [], []
+        for name, (game, tags) in accounts.items():
+            folded, name_words = self._index(name, game, tags)
+            names.append((folded, name))
+            words.extend((word, name) for word in name_words)
+        self._names.load(names)
+        self._words.load(words)
+        self._tag_keys = sorted(self._tags)
+
+    def add(self, name, game=None, tags=()):
+        if name in self._entries:
+            self.remove(name)
+        folded, name_words = self._index(name, game, tags)
+        self._names.add(folded, name)
+        for word in name_words:
+            self._words.add(word, name)
+        if len(self._tag_keys) != len(self._tags):
+            self._tag_keys = sorted(self._tags)
+
+    def remove(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        folded, name_words, tags = entry
+        self._names.remove(folded, name)
+        for word in name_words:
+            self._words.remove(word, name)
+        for tag in tags:
+            names = self._tags.get(tag)
+            if names is not None:
+                names.discard(name)
+                if not names: del self._tags[tag]
+        for trigram in _trigrams(folded):
+            names = self._trigrams.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names: del self._trigrams[trigram]
+        if len(self._tag_keys) != len(self._tags):
+            self._tag_keys = sorted(self._tags)
+        return True
+
+    def rename(self, old_name, new_name, game=None, tags=()):
+        self.remove(old_name)
+        self.add(new_name, game, tags)
+
+    def _index(self, name, game, tags):
+        folded = _fold(name)
+        # A word the name starts with is already covered by the (stronger) name prefix match.
+        words = {word for word in _WORD_SPLIT.split(folded) if word and not folded.startswith(word)}
+        tag_keys = set()
+        games = GAMES if game == "both" else {game: GAMES[game]} if game in GAMES else {}
+        for key, config in games.items():
+            tag_keys.add(key)
+            tag_keys.update(_fold(config["display_name"]).split())
+        tag_keys.update(_fold(tag) for tag in tags or () if _fold(tag))
+        for tag in tag_keys:
+            self._tags.setdefault(tag, set()).add(name)
+        for trigram in _trigrams(folded):
+            self._trigrams.setdefault(trigram, set()).add(name)
+        self._entries[name] = (folded, words, tag_keys)
+        return folded, words
+
+    def _term_scores(self, term):
+        # Weakest kind first, so each update leaves every account with its best match.
+        scores = {}
+        lo, hi = bisect_left(self._tag_keys, term), bisect_left(self._tag_keys, _prefix_end(term))
+        for tag in self._tag_keys[lo:hi]:
+            scores.update(dict.fromkeys(self._tags[tag], TAG_PREFIX))
+        lo, hi = self._words.prefix_range(term)
+        scores.update(dict.fromkeys(self._words.names[lo:hi], WORD_PREFIX))
+        lo, hi = self._names.prefix_range(term)
+        scores.update(dict.fromkeys(self._names.names[lo:hi], NAME_PREFIX))
+        if lo < hi and self._names.keys[lo] == term:
+            for i in range(lo, bisect_right(self._names.keys, term, lo, hi)):
+                scores[self._names.names[i]] = EXACT
+        if len(term) >= 3 and len(scores) < len(self._entries):
+            self._trigram_matches(term, scores)
+        return scores
+
+    def _trigram_matches(self, term, scores):
+        grams = _trigrams(term)
+        postings = sorted((self._trigrams.get(g, set()) for g in grams), key=len)
+        # Only names no prefix matched yet need checking; starting from the rarest trigram keeps every step small.
+        candidates = postings[0].difference(scores)
+        if candidates:
+            candidates.intersection_update(*postings[1:])
+            for name in candidates:
+                if term in self._entries[name][0]:
+                    scores[name] = SUBSTRING
+        if scores:
+            return
+        # Nothing contains the term as typed: fall back to names sharing most of its trigrams (typos).
+        common = max(COMMON_TRIGRAM_MIN, COMMON_TRIGRAM_SHARE * len(self._entries))
+        useful = [posting for posting in postings if len(posting) <= common]
+        counts = Counter()
+        for posting in useful:
+            counts.update(posting)
+        needed = FUZZY_THRESHOLD * len(useful)
+        for name, count in counts.items():
+            if count >= needed:
+                scores[name] = FUZZY * count / len(useful)
+
+    def match(self, query):
+        """{name: score} for every account matching all terms of query; every account (score 0) if it is empty."""
+        terms = _fold(query).split()
+        if not terms:
+            return dict.fromkeys(self._entries, 0)
+        total = self._term_scores(terms[0])
+        for term in terms[1:]:
+            if not total:
+                break
+            scores = self._term_scores(term)
+            total = {name: total[name] + score for name, score in scores.items() if name in total}
+        return total
+
+    def search(self, query, limit=None):
+        """Matching account names, best first (ties in name order)."""
+        scores = self.match(query)
+        ranked = sorted(scores, key=lambda name: (-scores[name], self._entries[name][0]))
+        return ranked[:limit] if limit else ranked
+
+    def top_hit(self, query):
+        scores = self.match(query)
+        if not scores:
+            return None
+        return min(scores, key=lambda name: (-scores[name], self._entries[name][0]))
@@ -0,0 +1,156 @@
+"""
+Account ordering as fractional ranks: every account has a short base-62 rank string and the order is the
+sort order of those strings. Moving an account gives it a rank between its new neighbours, so one move changes
+one entry instead of shifting a list, and config.json only stores {name: rank}. Accounts without a rank (new
+ones, or everyone before anything was moved) follow the ranked ones in name order.
+"""
+from bisect import bisect_left, insort
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+# Repeated inserts at the same spot make ranks longer; past this length every rank is spread out again.
+MAX_RANK_LENGTH = 12
+_VALUE = {d: i for i, d in enumerate(DIGITS)}
+
+
+def rank_between(low=None, high=None):
+    """A rank sorting strictly between low and high (None meaning the start or the end). Never ends in '0'."""
+    low, result, i = low or "", [], 0
+    while True:
+        lo = _VALUE[low[i]] if i < len(low) else 0
+        hi = (_VALUE[high[i]] if i < len(high) else 0) if high is not None else BASE
+        if lo == hi:
+            result.append(DIGITS[lo])
+        elif hi - lo > 1:
+            result.append(DIGITS[(lo + hi) // 2])
+            return "".join(result)
+        else:
+            # No digit fits between them here: keep low's digit and find room after it, with no upper bound.
+            result.append(DIGITS[lo])
+            high = None
+        i += 1
+
+
+def spread_ranks(count):
+    """count ranks spaced evenly over the whole range, so later inserts anywhere stay short."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    ranks = []
+    for i in range(count):
+        value = (i + 1) * BASE ** width // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+class AccountOrder:
+    """The ranks of one install, kept in a sorted list so lookups and neighbour searches are a bisect."""
+
+    def __init__(self, ranks=None):
+        self.ranks = {}
+        self._sorted = [] # (rank, name)
+        for name, rank in (ranks or {}).items():
+            if isinstance(rank, str) and rank and rank[-1] != "0" and all(c in _VALUE for c in rank):
+                self.ranks[name] = rank
+        self._sorted = sorted((rank, name) for name, rank in self.ranks.items())
+
+    @classmethod
+    def from_names(cls, names):
+        """An order that puts names in exactly this sequence (migrates the old ordered_accounts list)."""
+        order = cls()
+        order.reset(names)
+        return order
+
+    def reset(self, names):
+        """Replaces every rank with evenly spread ones for names, in that sequence."""
+        names = list(dict.fromkeys(names))
+        self.ranks = dict(zip(names, spread_ranks(len(names))))
+        self._sorted = sorted((rank, name) for name, rank in self.ranks.items())
+
+    def to_config(self):
+        return dict(self.ranks)
+
+    def ordered(self, names=None):
+        """names (every ranked account if None) in display order: ranked ones first, then the rest by name."""
+        ranked = [name for _, name in self._sorted]
+        if names is None:
+            return ranked
+        names = set(names)
+        return [name for name in ranked if name in names] + sorted(names.difference(self.ranks))
+
+    def _remove_sorted(self, name):
+        rank = self.ranks.pop(name)
+        i = bisect_left(self._sorted, (rank, name))
+        del self._sorted[i]
+
+    def _place(self, name, rank):
+        self.ranks[name] = rank
+        insort(self._sorted, (rank, name))
+
+    def append(self, name):
+        if name in self.ranks:
+            self._remove_sorted(name)
+        self._place(name, rank_between(self._sorted[-1][0] if self._sorted else None, None))
+
+    def remove(self, name):
+        if name in self.ranks:
+            self._remove_sorted(name)
+
+    def rename(self, old_name, new_name):
+        if old_name in self.ranks:
+            rank = self.ranks[old_name]
+            self._remove_sorted(old_name)
+            self._place(new_name, rank)
+
+    def retain(self, names):
+        """Drops the ranks of accounts that no longer exist."""
+        for name in [n for n in self.ranks if n not in names]:
+            self._remove_sorted(name)
+
+    def rank_all(self, names):
+        """Gives every unranked account in names a rank after the ranked ones, in name order."""
+        for name in sorted(set(names).difference(self.ranks)):
+            self.append(name)
+
+    def move(self, name, before=None, after=None):
+        """
+        Places name directly before `before` or directly after `after` (at the end if neither). Only name's rank
+        changes. Both the account and its anchor must be ranked (see rank_all).
+        """
+        if name in (before, after):
+            return self.ranks.get(name)
+        if name in self.ranks:
+            self._remove_sorted(name)
+        if before is not None:
+            i = bisect_left(self._sorted, (self.ranks[before], before))
+            low = self._sorted[i - 1][0] if i > 0 else None
+            rank = rank_between(low, self.ranks[before])
+        elif after is not None:
+            i = bisect_left(self._sorted, (self.ranks[after], after)) + 1
+            high = self._sorted[i][0] if i < len(self._sorted) else None
+            rank = rank_between(self.ranks[after], high)
+        else:
+            rank = rank_between(self._sorted[-1][0] if self._sorted else None, None)
+        self._place(name, rank)
+        if len(rank) > MAX_RANK_LENGTH:
+            self.rebalance()
+        return self.ranks[name]
+
+    def rebalance(self):
+        """Respreads every rank, keeping the order (rare: only after many moves into the same gap)."""
+        self.reset(self.ordered())
+
+
+def group_accounts(names, groups):
+    """
+    Splits ordered names into [(group, [names])]: ungrouped accounts first (group None), then each group in the
+    order its first account appears. groups: {name: group or None}.
+    """
+    sections = {None: []}
+    for name in names:
+        sections.setdefault(groups.get(name) or None, []).append(name)
+    return [(group, members) for group, members in sections.items() if members]
@@ -0,0 +1,136 @@
+import os
+import json
+import math
+import time
+import threading
+from file_locks import write_json_atomic
+
+USAGE_FILE = "account_usage.json"
+# A switch counts half as much after this long, so recent use outranks old habits without forgetting them.
+HALF_LIFE_SECONDS = 3 * 24 * 3600
+
+
+class UsageStats:
+    """
+    Per-account switch history for MRU/frequency ranking: {name: {"n": switches, "t": last switch, "s": score,
+    "next": {account switched to right after this one: times}}} in account_usage.json. The score is a decayed
+    count (frecency). The file is only re-read when it changed.
+    """
+
+    def __init__(self, path, lock=None, half_life=HALF_LIFE_SECONDS):
+        self.path = path
+        self.lock = lock # a FileLock shared with other processes, or None
+        self.half_life = half_life
+        self._data = {}
+        self._stamp = None
+        self._mutex = threading.Lock()
+
+    def _load(self):
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return self._data
+        data = {}
+        if stamp is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                data = {k: v for k, v in loaded.items() if isinstance(v, dict)} if isinstance(loaded, dict) else {}
+            except (OSError, ValueError):
+                print("Warning: account_usage.json is corrupted; starting a new usage history.")
+        self._data, self._stamp = data, stamp
+        return data
+
+    def _update(self, mutate):
+        with self._mutex:
+            if self.lock is not None:
+                self.lock.acquire()
+            try:
+                self._stamp = None # always re-read under the lock
+                data = dict(self._load())
+                mutate(data)
+                try:
+                    write_json_atomic(self.path, data, separators=(",", ":"))
+                except OSError as e:
+                    print(f"Could not save account usage: {e}")
+                self._data, self._stamp = data, None
+            finally:
+                if self.lock is not None:
+                    self.lock.release()
+
+    def _decayed(self, entry, now):
+        return entry.get("s", 0.0) * math.pow(0.5, max(0.0, now - entry.get("t", now)) / self.half_life)
+
+    def record(self, name, now=None):
+        now = time.time() if now is None else now
+        def bump(data):
+            previous = max(data, key=lambda n: data[n].get("t", 0), default=None)
+            entry = data.get(name, {})
+            data[name] = dict(entry, n=entry.get("n", 0) + 1, t=now, s=round(self._decayed(entry, now) + 1.0, 4))
+            if previous is not None and previous != name:
+                following = dict(data[previous].get("next", {}))
+                following[name] = following.get(name, 0) + 1
+                data[previous] = dict(data[previous], next=following)
+        self._update(bump)
+
+    def rename(self, old_name, new_name):
+        def move(data):
+            if old_name in data: data[new_name] = data.pop(old_name)
+            for name, entry in data.items():
+                if old_name in entry.get("next", {}):
+                    following = dict(entry["next"])
+                    following[new_name] = following.pop(old_name)
+                    data[name] = dict(entry, next=following)
+        self._update(move)
+
+    def remove(self, name):
+        def drop(data):
+            data.pop(name, None)
+            for other, entry in data.items():
+                if name in entry.get("next", {}):
+                    data[other] = dict(entry, next={n: c for n, c in entry["next"].items() if n != name})
+        self._update(drop)
+
+    def entry(self, name):
+        with self._mutex:
+            return dict(self._load().get(name, {}))
+
+    def last_used(self):
+        """{name: time of the last switch} for every account that was ever switched to."""
+        with self._mutex:
+            return {name: entry.get("t", 0) for name, entry in self._load().items()}
+
+    def scores(self, now=None):
+        """{name: frecency score right now} for every account that was ever switched to."""
+        now = time.time() if now is None else now
+        with self._mutex:
+            data = self._load()
+            return {name: self._decayed(entry, now) for name, entry in data.items()}
+
+    def ranked(self, names, now=None):
+        """names ordered by frecency, most recently used first on ties; never-used accounts keep their order at the end."""
+        scores = self.scores(now)
+        with self._mutex:
+            data = self._data
+            used = sorted((n for n in names if n in scores), key=lambda n: (-scores[n], -data[n].get("t", 0)))
+        return used + [n for n in names if n not in scores]
+
+    def predict(self, current=None, names=None, limit=2, now=None):
+        """
+        The accounts most likely to be switched to next: those that most often followed current (the most recently
+        used account if None), then by frecency. Only names are considered if given; current is never included.
+        """
+        scores = self.scores(now)
+        with self._mutex:
+            data = self._data
+            if current is None and data:
+                current = max(data, key=lambda n: data[n].get("t", 0))
+            following = data.get(current, {}).get("next", {})
+        candidates = set(scores).union(following)
+        if names is not None:
+            candidates.intersection_update(names)
+        candidates.discard(current)
+        return sorted(candidates, key=lambda n: (-following.get(n, 0), -scores.get(n, 0.0), n))[:limit]
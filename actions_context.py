@@ -24,7 +24,7 @@ class ContextActions:
             if self.switcher.rename_account(old_name, new_name):
                 self.parent.status_label.setText(f"Renamed '{old_name}' to '{new_name}'.")
                 self.parent.selected_account_name = new_name 
-                self.parent.load_accounts()
+                self.parent.refresh_accounts(new_name)
 
     def delete(self):
         name = self.parent.get_selected_account_name()
@@ -34,7 +34,7 @@ class ContextActions:
         ) == QMessageBox.Yes:
             if self.switcher.delete_account(name):
                 self.parent.status_label.setText(f"Account '{name}' deleted.")
-                self.parent.load_accounts()
+                self.parent.refresh_accounts(name)
 
     def change_icon(self):
         name = self.parent.get_selected_account_name()
@@ -45,7 +45,7 @@ class ContextActions:
         if path:
             if self.switcher.set_account_icon(name, path):
                 self.parent.status_label.setText(f"Icon updated for '{name}'.")
-                self.parent.load_accounts()
+                self.parent.refresh_accounts(name)
             else:
                 self.parent.status_label.setText(f"Failed to update icon for '{name}'.")
 
@@ -58,10 +58,38 @@ class ContextActions:
         ) == QMessageBox.Yes:
             if self.switcher.remove_account_icon(name):
                 self.parent.status_label.setText(f"Icon removed for '{name}'.")
-                self.parent.load_accounts()
+                self.parent.refresh_accounts(name)
             else:
                 self.parent.status_label.setText(f"Failed to remove icon for '{name}'.")
 
+    def set_group(self, group):
+        name = self.parent.get_selected_account_name()
+        if not name: return
+        if self.switcher.set_account_group(name, group):
+            self.parent.status_label.setText(f"Moved '{name}' to {group}." if group else f"Removed '{name}' from its group.")
+            self.parent.refresh_accounts(name)
+        else:
+            self.parent.status_label.setText(f"Failed to set the group for '{name}'.")
+
+    def new_group(self):
+        name = self.parent.get_selected_account_name()
+        if not name: return
+        dialog = InputDialog("New Group", f"Enter a group name for '{name}':", "", self.parent)
+        if dialog.exec_() == QDialog.Accepted and dialog.get_text().strip():
+            self.set_group(dialog.get_text().strip())
+
+    def edit_tags(self):
+        name = self.parent.get_selected_account_name()
+        if not name: return
+        current = ", ".join(self.switcher.get_account_tags(name))
+        dialog = InputDialog("Edit Tags", f"Tags for '{name}' (comma separated):", current, self.parent)
+        if dialog.exec_() == QDialog.Accepted:
+            if self.switcher.set_account_tags(name, dialog.get_text().split(",")):
+                self.parent.status_label.setText(f"Tags updated for '{name}'.")
+                self.parent.refresh_accounts(name)
+            else:
+                self.parent.status_label.setText(f"Failed to update tags for '{name}'.")
+
     def create_shortcut(self):
         name = self.parent.get_selected_account_name()
         if name:
@@ -75,6 +103,15 @@ class ContextActions:
         if name:
             if self.switcher.set_account_game(name, game):
                 self.parent.status_label.setText(f"Set game for '{name}' to {game.capitalize()}. ")
-                self.parent.load_accounts()
+                self.parent.refresh_accounts(name)
             else:
                 self.parent.status_label.setText(f"Failed to set game for '{name}'.")
+
+    def assign_preset(self, preset_id):
+        name = self.parent.get_selected_account_name()
+        if name:
+            if self.switcher.assign_preset([name], preset_id):
+                label = self.switcher.get_presets()[preset_id]["name"] if preset_id else "the global settings"
+                self.parent.status_label.setText(f"'{name}' now uses {label}.")
+            else:
+                self.parent.status_label.setText(f"Failed to set preset for '{name}'.")
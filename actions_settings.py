@@ -1,6 +1,7 @@
 import os
 from PyQt5.QtWidgets import QMessageBox, QFileDialog, QDialog
-from ui_components import SaveAccountDialog, ExportIMAMenuDialog, OptionsDialog, CustomMessageDialog
+from ui_components import SaveAccountDialog, ExportIMAMenuDialog, OptionsDialog, CustomMessageDialog, SwitchStatsDialog
+from switch_metrics import format_summary
 
 class SettingsActions:
     def __init__(self, parent):
@@ -11,8 +12,24 @@ class SettingsActions:
         self.parent = parent
         self.switcher = parent.switcher
 
+    def _run_job(self, name, func, on_finished, busy_message="Another operation is still running. Please wait.", cancellable=False):
+        job = self.parent.jobs.submit(
+            name, func,
+            on_finished=on_finished,
+            on_failed=lambda error: QMessageBox.critical(self.parent, "Error", f"An error occurred: {error}"),
+            on_progress=self.parent.on_job_progress,
+            cancellable=cancellable,
+        )
+        if job is None:
+            self.parent.status_label.setText(busy_message)
+        return job
+
     def add_account(self):
-        if self.switcher.add_account_flow():
+        self.parent.status_label.setText("Preparing Riot Client for a new account...")
+        self._run_job("add_account", lambda job: self.switcher.add_account_flow(), self._on_add_account_ready)
+
+    def _on_add_account_ready(self, ready):
+        if ready:
             self.save_current_account()
         else:
             QMessageBox.critical(
@@ -31,19 +48,24 @@ class SettingsActions:
             if name in self.switcher.get_saved_accounts():
                 QMessageBox.warning(self.parent, "Account Exists", f'An account named "{name}" already exists.')
                 return
-            self.switcher.save_account(name, game)
-            self.parent.status_label.setText(f"Account '{name}' saved for {game.capitalize()}.")
-            self.parent.load_accounts()
+            self.parent.status_label.setText(f"Saving '{name}'...")
+            self._run_job("save_account", lambda job: self.switcher.save_account(name, game), lambda _: self._on_account_saved(name, game))
+
+    def _on_account_saved(self, name, game):
+        self.parent.status_label.setText(f"Account '{name}' saved for {game.capitalize()}.")
+        self.parent.load_accounts()
 
     def backup_profiles(self):
         suggested_filename = self.switcher.get_backup_filename()
         path, _ = QFileDialog.getSaveFileName(self.parent, "Save Backup", suggested_filename, "ZIP Files (*.zip)")
         if path:
             if not path.endswith(".zip"): path += ".zip"
-            if self.switcher.backup_profiles(path):
-                self.parent.status_label.setText(f"Profiles backed up successfully.")
-            else:
-                self.parent.status_label.setText("Backup failed.")
+            self._run_job(
+                "backup",
+                lambda job: self.switcher.backup_profiles(path, progress=job.report_progress, cancel_event=job.cancel_event),
+                lambda ok: self.parent.status_label.setText("Profiles backed up successfully." if ok else "Backup failed."),
+                cancellable=True,
+            )
 
     def restore_profiles(self):
         path, _ = QFileDialog.getOpenFileName(self.parent, "Select Backup", "", "ZIP Files (*.zip)")
@@ -52,14 +74,33 @@ class SettingsActions:
             "Confirm Restore", "This will overwrite all current profiles. Continue?",
             QMessageBox.Yes | QMessageBox.No
         ) == QMessageBox.Yes:
-            if self.switcher.restore_profiles(path):
-                self.parent.status_label.setText("Profiles restored successfully.")
-                self.parent.load_accounts()
-            else:
-                self.parent.status_label.setText("Restore failed.")
+            watcher = self.parent.watcher
+            if watcher: watcher.pause() # its folder watches would keep profiles/ from being swapped
+            job = self._run_job(
+                "restore",
+                lambda job: self.switcher.restore_profiles(path, progress=job.report_progress, cancel_event=job.cancel_event),
+                self._on_restore_finished,
+                cancellable=True,
+            )
+            if watcher:
+                if job is None:
+                    watcher.resume()
+                else:
+                    for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+                        signal.connect(lambda *_: watcher.resume())
+
+    def _on_restore_finished(self, ok):
+        if ok:
+            self.parent.status_label.setText("Profiles restored successfully.")
+            self.parent.load_accounts()
+        else:
+            self.parent.status_label.setText("Restore failed.")
+
+    def show_switch_stats(self):
+        SwitchStatsDialog(format_summary(self.switcher.metrics.summary()), self.parent).exec_()
 
     def open_profiles_folder(self):
-        os.startfile(self.switcher.profiles_dir)
+        self.switcher.backend.open_path(self.switcher.profiles_dir)
 
     def export_ima_menu(self):
         accounts_data = self.switcher.get_saved_accounts()
@@ -68,6 +109,7 @@ class SettingsActions:
             return
 
         ima_config = self.switcher.get_ima_config()
+        ima_config["ordered_accounts"] = self.switcher.get_account_order().ordered(accounts_data)
         if not ima_config.get("menu_icon_path"):
             default_ico = r"C:\Program Files\iMA Menu\icons\valorant.ico"
             if os.path.exists(default_ico): ima_config["menu_icon_path"] = default_ico
@@ -81,12 +123,14 @@ class SettingsActions:
                 output_dir = QFileDialog.getExistingDirectory(self.parent, "Could not find default iMA Menu path. Please locate the 'imports' folder.")
                 if not output_dir: return
             if not output_dir: return # Added this line to handle cancellation
-            try:
-                self.switcher.generate_ima_menu_script(**settings, output_dir=output_dir, save_config=True)
-                msg_dialog = CustomMessageDialog("Export Successful", "Accounts added to iMA Menu", self.parent)
-                msg_dialog.exec_()
-            except Exception as e:
-                QMessageBox.critical(self.parent, "Export Failed", f"An error occurred: {e}")
+            job = self.parent.jobs.submit(
+                "export_ima_menu",
+                lambda job: self.switcher.generate_ima_menu_script(**settings, output_dir=output_dir, save_config=True),
+                on_finished=lambda _: CustomMessageDialog("Export Successful", "Accounts added to iMA Menu", self.parent).exec_(),
+                on_failed=lambda error: QMessageBox.critical(self.parent, "Export Failed", f"An error occurred: {error}"),
+            )
+            if job is None:
+                self.parent.status_label.setText("Another operation is still running. Please wait.")
 
     def open_options_dialog(self):
         dialog = OptionsDialog(self.switcher, self.parent)
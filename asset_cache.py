@@ -0,0 +1,83 @@
+import os
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QPixmap
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Assets")
+
+GAME_ICONS = {"valorant": "valorant.png", "lol": "lol.png", "both": "Riot.png"}
+PRESCALED_SIZES = {"valorant.png": (24, 80), "lol.png": (24, 80), "riot.png": (24, 80)}
+
+
+class AssetCache:
+    """Loads every image in Assets/ once and hands out shared, pre-scaled copies."""
+
+    def __init__(self, assets_dir=ASSETS_DIR):
+        self.assets_dir = assets_dir
+        self._pixmaps = {}
+        self._scaled = {}
+        self._icons = {}
+        self._loaded = False
+
+    def _load_all(self):
+        # QPixmap needs a QApplication, so loading is deferred to the first lookup.
+        if self._loaded: return
+        self._loaded = True
+        root = self.assets_dir
+        try:
+            names = [n for n in os.listdir(root) if n.lower().endswith(".png")]
+        except FileNotFoundError:
+            print(f"Assets folder not found: {root}")
+            names = []
+
+        for name in names:
+            pixmap = QPixmap(f"{root}/{name}")
+            if pixmap.isNull(): continue
+            key = name.lower()
+            self._pixmaps[key] = pixmap
+            for size in PRESCALED_SIZES.get(key, ()):
+                self._scaled[(key, size)] = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def pixmap(self, name, size=None):
+        """Returns the (optionally scaled) pixmap for an asset file name, or None if it doesn't exist."""
+        self._load_all()
+        key = name.lower()
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None or size is None:
+            return pixmap
+        scaled = self._scaled.get((key, size))
+        if scaled is None:
+            scaled = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._scaled[(key, size)] = scaled
+        return scaled
+
+    def icon(self, name):
+        self._load_all()
+        key = name.lower()
+        icon = self._icons.get(key)
+        if icon is None and key in self._pixmaps:
+            icon = QIcon(self._pixmaps[key])
+            self._icons[key] = icon
+        return icon
+
+    def game_pixmap(self, game, size):
+        file_name = GAME_ICONS.get(game)
+        return self.pixmap(file_name, size) if file_name else None
+
+    def game_icon(self, game):
+        file_name = GAME_ICONS.get(game)
+        return self.icon(file_name) if file_name else None
+
+
+_cache = AssetCache()
+
+def asset_pixmap(name, size=None):
+    return _cache.pixmap(name, size)
+
+def asset_icon(name):
+    return _cache.icon(name)
+
+def game_pixmap(game, size):
+    return _cache.game_pixmap(game, size)
+
+def game_icon(game):
+    return _cache.game_icon(game)
@@ -0,0 +1,274 @@
+"""
+Benchmarks the switch pipeline against a synthetic Riot environment built in a temp folder.
+Runs on the fake platform backend (in-memory processes, symlinks, no launches), so it works on any OS without a Riot install.
+
+    python benchmark_switch.py --sizes 10 100 1000 --configs 20 --output results.json
+    python benchmark_switch.py --compare results.json --max-regression 25
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+from unittest import mock
+
+GAME_USER_SETTINGS_INI = """[/Script/ShooterGame.ShooterGameUserSettings]
+bUseVSync=False
+bUseDynamicResolution=False
+ResolutionSizeX=2560
+ResolutionSizeY=1440
+LastUserConfirmedResolutionSizeX=2560
+LastUserConfirmedResolutionSizeY=1440
+WindowPosX=-1
+WindowPosY=-1
+FullscreenMode=1
+LastConfirmedFullscreenMode=1
+PreferredFullscreenMode=1
+Version=5
+AudioQualityLevel=0
+LastConfirmedAudioQualityLevel=0
+FrameRateLimit=0.000000
+DesiredScreenWidth=1280
+DesiredScreenHeight=720
+LastUserConfirmedDesiredScreenWidth=1280
+LastUserConfirmedDesiredScreenHeight=720
+LastRecommendedScreenWidth=-1.000000
+LastRecommendedScreenHeight=-1.000000
+LastCPUBenchmarkResult=-1.000000
+LastGPUBenchmarkResult=-1.000000
+LastGPUBenchmarkMultiplier=1.000000
+bUseHDRDisplayOutput=False
+HDRDisplayOutputNits=1000
+
+[ScalabilityGroups]
+sg.ResolutionQuality=100.000000
+sg.ViewDistanceQuality=3
+sg.AntiAliasingQuality=3
+sg.ShadowQuality=3
+sg.PostProcessQuality=3
+sg.TextureQuality=3
+sg.EffectsQuality=3
+sg.FoliageQuality=3
+sg.ShadingQuality=3
+
+[ShaderPipelineCache.CacheFile]
+LastOpened=ShooterGame
+"""
+
+RIOT_USER_SETTINGS_INI = """[/Script/ShooterGame.ShooterGameUserSettings]
+EAresBoolSettingName::PushToTalkEnabled=True
+EAresFloatSettingName::OverallVolume=0.700000
+EAresFloatSettingName::SoundEffectsVolume=0.800000
+EAresFloatSettingName::VoiceOverVolume=0.500000
+EAresFloatSettingName::VideoVolume=0.000000
+EAresFloatSettingName::AllMusicOverallVolume=0.100000
+EAresFloatSettingName::MenuAndLobbyMusicVolume=0.000000
+EAresFloatSettingName::CharacterSelectMusicVolume=0.000000
+EAresIntSettingName::MaterialQuality=0
+EAresIntSettingName::TextureQuality=0
+EAresIntSettingName::DetailQuality=0
+EAresIntSettingName::UIQuality=0
+EAresIntSettingName::NvidiaReflexLowLatencySetting=2
+EAresIntSettingName::MicVolume=60
+EAresIntSettingName::VoiceVolume=80
+EAresStringSettingName::SavedCrosshairProfileData={"currentProfile":0,"profiles":[{"primary":{"color":{"r":0,"g":255,"b":255,"a":255}}}]}
+"""
+
+GRAPHICS_SETTINGS = {
+    "display_mode": "Windowed Fullscreen",
+    "quality": {key: 0 for key in (
+        "sg.ViewDistanceQuality", "sg.AntiAliasingQuality", "sg.ShadowQuality", "sg.PostProcessQuality",
+        "sg.TextureQuality", "sg.EffectsQuality", "sg.FoliageQuality", "sg.ShadingQuality")},
+    "riot_settings": {
+        "EAresIntSettingName::MaterialQuality": "0", "EAresIntSettingName::TextureQuality": "High",
+        "EAresIntSettingName::DetailQuality": "1", "EAresIntSettingName::UIQuality": "0",
+        "EAresIntSettingName::NvidiaReflexLowLatencySetting": "On",
+    },
+    "audio_settings": {
+        "EAresFloatSettingName::OverallVolume": "0.500000", "EAresFloatSettingName::SoundEffectsVolume": "MAX",
+        "EAresFloatSettingName::VoiceOverVolume": "0.300000", "EAresFloatSettingName::VideoVolume": "0.000000",
+        "EAresFloatSettingName::AllMusicOverallVolume": "0.000000", "EAresFloatSettingName::MenuAndLobbyMusicVolume": "1.000000",
+        "EAresFloatSettingName::CharacterSelectMusicVolume": "1.000000", "EAresIntSettingName::MicVolume": "75",
+        "EAresIntSettingName::VoiceVolume": "100", "EAresBoolSettingName::PushToTalkEnabled": "False",
+        "EAresBoolSettingName::EnableHRTF": "True",
+    },
+}
+
+LOGIN_DATA_ITEMS = ("Config", "Data", "Logs")
+
+
+def _write_tree(root, num_files, file_size):
+    for item in LOGIN_DATA_ITEMS:
+        item_dir = os.path.join(root, item)
+        os.makedirs(item_dir, exist_ok=True)
+        for i in range(num_files):
+            with open(os.path.join(item_dir, f"file_{i}.dat"), 'wb') as f:
+                f.write(os.urandom(file_size))
+
+
+def build_environment(root, num_profiles, files_per_profile=4, file_size=4096, num_configs=10):
+    """Creates a fake LOCALAPPDATA, Riot Client data tree, profiles and VALORANT config folders under root."""
+    env = {
+        "root": root,
+        "local_app_data": os.path.join(root, "LocalAppData"),
+        "program_files": os.path.join(root, "Program Files"),
+        "base_dir": os.path.join(root, "iMA Switcher"),
+    }
+    riot_data = os.path.join(env["local_app_data"], "Riot Games", "Riot Client")
+    _write_tree(riot_data, files_per_profile, file_size)
+
+    riot_exe_dir = os.path.join(env["program_files"], "Riot Games", "Riot Client")
+    os.makedirs(riot_exe_dir)
+    open(os.path.join(riot_exe_dir, "RiotClientServices.exe"), 'wb').close()
+
+    profiles_dir = os.path.join(env["base_dir"], "profiles")
+    for i in range(num_profiles):
+        account_dir = os.path.join(profiles_dir, f"account_{i:05d}")
+        _write_tree(account_dir, files_per_profile, file_size)
+        with open(os.path.join(account_dir, "game.json"), 'w') as f:
+            json.dump({"game": "valorant" if i % 3 else "lol"}, f)
+
+    config_root = os.path.join(env["local_app_data"], "VALORANT", "Saved", "Config")
+    for i in range(num_configs):
+        windows_dir = os.path.join(config_root, f"{i:08x}-0000-0000-0000-000000000000-na", "Windows")
+        os.makedirs(windows_dir)
+        with open(os.path.join(windows_dir, "GameUserSettings.ini"), 'w', encoding='utf-8') as f:
+            f.write(GAME_USER_SETTINGS_INI)
+        with open(os.path.join(windows_dir, "RiotUserSettings.ini"), 'w', encoding='utf-8') as f:
+            f.write(RIOT_USER_SETTINGS_INI)
+    return env
+
+
+@contextlib.contextmanager
+def simulated_switcher(env, exit_delay=0.0):
+    """Yields a GameSwitcher on a FakeBackend wired to the synthetic environment."""
+    import game_switcher
+    import launch_monitor
+    from platform_backend import FakeBackend
+    riot_exe = os.path.join(env["program_files"], "Riot Games", "Riot Client", "RiotClientServices.exe")
+    backend = FakeBackend(local_app_data=env["local_app_data"], riot_client_path=riot_exe, exit_delay=exit_delay)
+    # Settings are timed on their own below, so keep the launch monitor (and the settings it applies) out of switch timings.
+    with mock.patch.object(launch_monitor.LaunchMonitor, "start"):
+        switcher = game_switcher.GameSwitcher(base_directory=env["base_dir"], backend=backend)
+        yield switcher
+
+
+def _switch(switcher, name):
+    # Every switch finds a running client to kill, as it would in real use.
+    for exe in switcher.GAMES["valorant"]["processes_to_kill"]:
+        switcher.backend.spawn(exe)
+    return switcher.switch_account(name, selected_game="valorant")
+
+
+def _time(func, repeat):
+    samples = []
+    for i in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(i)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _time_search(switcher, names, repeat):
+    # Types a name one character at a time, as the search box sees it; one sample per keystroke.
+    from account_index import AccountIndex
+    index = AccountIndex({name: (game, []) for name, (_, game) in switcher.get_saved_accounts().items()})
+    samples = []
+    for i in range(repeat):
+        name = names[(i * 7919) % len(names)]
+        samples.extend(_time(lambda n: index.match(name[:n + 1]), len(name)))
+    return samples
+
+
+def _stats(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def run_benchmark(num_profiles, repeat=10, files_per_profile=4, file_size=4096, num_configs=10, exit_delay=0.0):
+    root = tempfile.mkdtemp(prefix="ima_bench_")
+    try:
+        env = build_environment(root, num_profiles, files_per_profile, file_size, num_configs)
+        with simulated_switcher(env, exit_delay) as switcher:
+            switcher._ensure_initialized()
+            names = sorted(os.listdir(switcher.profiles_dir))
+            results = {
+                "get_saved_accounts": _time(lambda i: switcher.get_saved_accounts(), repeat),
+                "switch_account": _time(lambda i: _switch(switcher, names[i % len(names)]), repeat),
+                "save_account": _time(lambda i: switcher.save_account(f"bench_saved_{i}"), repeat),
+                "update_all_game_user_settings": _time(lambda i: switcher.update_all_game_user_settings(GRAPHICS_SETTINGS), repeat),
+                "account_search_keystroke": _time_search(switcher, names, repeat),
+            }
+        return {stage: _stats(samples) for stage, samples in results.items()}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def compare(current, baseline, max_regression):
+    """Prints per-stage p50 deltas against a baseline report. Returns False if any stage regressed too far."""
+    ok = True
+    for size, stages in current["results"].items():
+        for stage, stats in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(stage)
+            if not base or not base["p50_ms"]: continue
+            delta = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100
+            flag = ""
+            if max_regression is not None and delta > max_regression:
+                flag, ok = "  REGRESSION", False
+            print(f"N={size:>5} {stage:<32} {base['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms ({delta:+.1f}%){flag}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the iMA Switcher switch pipeline in a simulated Riot environment.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Profile counts to benchmark.")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per stage.")
+    parser.add_argument("--files", type=int, default=4, help="Files per Config/Data/Logs folder in each profile.")
+    parser.add_argument("--file-size", type=int, default=4096, help="Size of each profile file in bytes.")
+    parser.add_argument("--configs", type=int, default=10, help="Number of VALORANT config folders.")
+    parser.add_argument("--exit-delay", type=float, default=0.0, help="Milliseconds a killed client takes to exit (overlaps with profile preparation).")
+    parser.add_argument("--output", help="Write the report as JSON to this path.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare p50 timings against.")
+    parser.add_argument("--max-regression", type=float, help="Fail if any stage's p50 is this many percent slower than the baseline.")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"repeat": args.repeat, "files": args.files, "file_size": args.file_size, "configs": args.configs, "exit_delay": args.exit_delay},
+        "results": {},
+    }
+    for size in args.sizes:
+        report["results"][str(size)] = run_benchmark(size, args.repeat, args.files, args.file_size, args.configs, args.exit_delay / 1000)
+        print(f"N={size}")
+        for stage, stats in report["results"][str(size)].items():
+            print(f"  {stage:<32} p50 {stats['p50_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms   mean {stats['mean_ms']:>10.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import shutil
+from zipfile import ZipFile, ZIP_DEFLATED
+
+# The packed login data of a cold profile, inside its folder next to game.json and icon.png.
+ARCHIVE_NAME = "profile.ima-cold.zip"
+THAW_DIR_NAME = ".ima-thaw"
+# Defaults for the config keys cold_storage_days / cold_storage_max_hot.
+COLD_AFTER_DAYS = 30
+MAX_HOT = 20
+
+
+class InterruptedFreeze(Exception):
+    pass
+
+
+class ColdStorage:
+    """
+    Packs the login data of rarely used profiles into one compressed archive and unpacks it again on demand.
+    A cold profile keeps its folder with game.json and icon.png, so listing, icons, groups, renames and backups
+    work the same for hot and cold accounts; only the Data/Config items become an archive.
+
+    Both directions are crash-safe: the archive only replaces the items once it is complete, and it is only
+    deleted once every item is back in place, so an interrupted thaw is simply repeated.
+    """
+
+    def __init__(self, remove_path=None):
+        self.remove_path = remove_path # e.g. GameSwitcher._remove_junction_or_dir, which hands folders to the trash reaper
+
+    def archive_path(self, account_path):
+        return os.path.join(account_path, ARCHIVE_NAME)
+
+    def is_cold(self, account_path):
+        return os.path.exists(self.archive_path(account_path))
+
+    def _discard(self, path):
+        if self.remove_path is not None:
+            self.remove_path(path)
+        elif os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+    def freeze(self, account_path, items, cancel_event=None):
+        """
+        Packs the profile's items (e.g. "Data", "Config") into its archive and removes them.
+        Returns (bytes before, archive bytes); raises InterruptedFreeze if cancel_event was set.
+        """
+        archive = self.archive_path(account_path)
+        partial = archive + ".tmp"
+        present = [item for item in items if os.path.lexists(os.path.join(account_path, item))]
+        if not present:
+            return 0, 0
+        original = 0
+        try:
+            with ZipFile(partial, 'w', ZIP_DEFLATED) as zip_ref:
+                for item in present:
+                    item_path = os.path.join(account_path, item)
+                    if os.path.isfile(item_path):
+                        original += os.path.getsize(item_path)
+                        zip_ref.write(item_path, item)
+                        continue
+                    for root, dirs, names in os.walk(item_path):
+                        relative = os.path.relpath(root, account_path)
+                        if not dirs and not names:
+                            zip_ref.write(root, relative) # keep empty folders
+                        for name in names:
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise InterruptedFreeze(f"Packing {account_path} was interrupted.")
+                            file_path = os.path.join(root, name)
+                            original += os.path.getsize(file_path)
+                            zip_ref.write(file_path, os.path.join(relative, name))
+            os.replace(partial, archive)
+        except BaseException:
+            if os.path.exists(partial): os.remove(partial)
+            raise
+        for item in present:
+            self._discard(os.path.join(account_path, item))
+        return original, os.path.getsize(archive)
+
+    def thaw(self, account_path, progress=None):
+        """
+        Unpacks a cold profile in place. progress(done, total) is called per file. Returns the number of files.
+        Files are extracted next to the profile first, so a failed thaw leaves the archive as it was.
+        """
+        archive = self.archive_path(account_path)
+        staging = os.path.join(account_path, THAW_DIR_NAME)
+        if os.path.exists(staging): shutil.rmtree(staging)
+        try:
+            with ZipFile(archive, 'r') as zip_ref:
+                members = zip_ref.infolist()
+                for i, member in enumerate(members):
+                    zip_ref.extract(member, staging)
+                    if progress: progress(i + 1, len(members))
+            for item in os.listdir(staging):
+                target = os.path.join(account_path, item)
+                if os.path.lexists(target): self._discard(target) # left over from an interrupted freeze
+                os.rename(os.path.join(staging, item), target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        os.remove(archive)
+        return len(members)
+
+    def drop(self, account_path):
+        """Deletes the archive without unpacking it, for when the profile was just saved again."""
+        archive = self.archive_path(account_path)
+        if os.path.exists(archive): os.remove(archive)
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+LOCKS_DIR = "locks"
+LOCK_TIMEOUT = 30
+POLL_INTERVAL = 0.02
+
+
+class LockTimeout(Exception):
+    pass
+
+
+def _pid_alive(pid):
+    if sys.platform == "win32":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION, STILL_ACTIVE = 0x1000, 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+
+def _os_try_lock(f, shared):
+    """One non-blocking attempt at a shared or exclusive lock on byte 0 of f. Raises OSError if it is taken."""
+    if sys.platform == "win32":
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+        LOCKFILE_FAIL_IMMEDIATELY, LOCKFILE_EXCLUSIVE_LOCK = 0x1, 0x2
+        class OVERLAPPED(ctypes.Structure):
+            _fields_ = [("Internal", ctypes.c_void_p), ("InternalHigh", ctypes.c_void_p),
+                        ("Offset", wintypes.DWORD), ("OffsetHigh", wintypes.DWORD), ("hEvent", wintypes.HANDLE)]
+        flags = LOCKFILE_FAIL_IMMEDIATELY | (0 if shared else LOCKFILE_EXCLUSIVE_LOCK)
+        if not ctypes.windll.kernel32.LockFileEx(wintypes.HANDLE(msvcrt.get_osfhandle(f.fileno())), flags, 0, 1, 0,
+                                                 ctypes.byref(OVERLAPPED())):
+            raise OSError("lock is held by another process")
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+
+
+class FileLock:
+    """
+    Reader/writer lock shared by every iMA Switcher process of one install. Threads of this process queue on an
+    in-process lock first; the first holder then takes a shared or exclusive OS lock on the lock file (flock,
+    or LockFileEx on Windows), which the OS drops if the process dies. Re-entrant per thread, and a thread
+    holding it exclusively may also take it shared. Exclusive holders leave their pid in '<lock>.owner' so a
+    timeout can name who is holding it.
+    """
+
+    def __init__(self, path, name=None, timeout=LOCK_TIMEOUT, on_wait=None):
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self.timeout = timeout
+        self.on_wait = on_wait # on_wait(name, wait_ms, shared), called after every acquire
+        self.owner_path = path + ".owner"
+        self._condition = threading.Condition()
+        self._readers = {} # thread id -> depth
+        self._writer = None
+        self._writer_depth = 0
+        self._acquiring = None # thread taking the OS lock right now, outside the condition
+        self._file = None
+
+    def _os_acquire(self, shared, deadline, timeout):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        f = open(self.path, 'a+')
+        while True:
+            try:
+                _os_try_lock(f, shared)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    f.close()
+                    raise LockTimeout(self._timeout_message(timeout))
+                time.sleep(POLL_INTERVAL)
+        self._file = f
+        if not shared:
+            try:
+                with open(self.owner_path, 'w', encoding='utf-8') as owner:
+                    json.dump({"pid": os.getpid(), "since": time.time()}, owner)
+            except OSError:
+                pass
+
+    def _os_release(self, shared):
+        if not shared:
+            try: os.remove(self.owner_path)
+            except OSError: pass
+        # Closing the handle drops the OS lock.
+        self._file.close()
+        self._file = None
+
+    def _timeout_message(self, timeout):
+        message = f"Timed out after {timeout:g}s waiting for the {self.name} lock"
+        try:
+            with open(self.owner_path, 'r', encoding='utf-8') as f:
+                owner = json.load(f)
+        except (OSError, ValueError):
+            return message + "."
+        held_for = time.time() - owner.get("since", time.time())
+        if not _pid_alive(owner.get("pid", 0)):
+            # The OS releases locks of dead processes, so the holder is a process that inherited the handle.
+            return message + f" (stale: owner process {owner.get('pid')} has exited; close processes it started)."
+        return message + f" (held by process {owner.get('pid')} for {held_for:.0f}s)."
+
+    def acquire(self, shared=False, timeout=None):
+        """Returns the time spent waiting, in ms. Raises LockTimeout."""
+        me = threading.get_ident()
+        start = time.perf_counter()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return 0.0
+            if me in self._readers:
+                if not shared:
+                    raise RuntimeError(f"Cannot upgrade a shared {self.name} lock to exclusive.")
+                self._readers[me] += 1
+                return 0.0
+            while self._writer is not None or self._acquiring is not None or (not shared and self._readers):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LockTimeout(self._timeout_message(timeout))
+                self._condition.wait(remaining)
+            if shared and self._readers:
+                self._readers[me] = 1 # the OS lock is already held shared
+                need_os_lock = False
+            else:
+                self._acquiring = me
+                need_os_lock = True
+        if need_os_lock:
+            # Polled without the condition, so other threads keep their own timeouts meanwhile.
+            try:
+                self._os_acquire(shared, deadline, timeout)
+            finally:
+                with self._condition:
+                    self._acquiring = None
+                    if self._file is not None:
+                        if shared:
+                            self._readers[me] = 1
+                        else:
+                            self._writer, self._writer_depth = me, 1
+                    self._condition.notify_all()
+        wait_ms = (time.perf_counter() - start) * 1000
+        if self.on_wait is not None:
+            self.on_wait(self.name, wait_ms, shared)
+        return wait_ms
+
+    def release(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth -= 1
+                if self._writer_depth == 0:
+                    self._writer = None
+                    self._os_release(False)
+            elif me in self._readers:
+                self._readers[me] -= 1
+                if self._readers[me] == 0:
+                    del self._readers[me]
+                    if not self._readers:
+                        self._os_release(True)
+            else:
+                raise RuntimeError(f"{self.name} lock released by a thread that does not hold it.")
+            self._condition.notify_all()
+
+    @contextmanager
+    def hold(self, shared=False, timeout=None, metrics=None):
+        """Context manager around acquire/release; adds the wait to metrics' "lock_wait" stage if given."""
+        wait_ms = self.acquire(shared, timeout)
+        if metrics is not None:
+            metrics.add_stage("lock_wait", wait_ms)
+        try:
+            yield wait_ms
+        finally:
+            self.release()
+
+
+def write_json_atomic(path, data, **dump_args):
+    """Writes data to a temp file and swaps it in, so readers never see a half-written file."""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_args)
+    os.replace(temp_path, path)
@@ -0,0 +1,49 @@
+"""
+Per-title configuration for the switch engine. Adding a Riot title means adding an entry here;
+GameSwitcher reads launch args, kill lists, LoginData items and the settings adapter from it.
+"""
+
+DEFAULT_GAME = "valorant"
+
+# Riot Client folders under %LOCALAPPDATA%\Riot Games\Riot Client that hold the login session.
+RIOT_CLIENT_LOGIN_DATA = ("Config", "Data", "Logs")
+
+GAMES = {
+    "valorant": {
+        "display_name": "Valorant",
+        "launch_args": "--launch-product=valorant --launch-patchline=live",
+        "processes_to_kill": ["VALORANT.exe", "RiotClientServices.exe", "VALORANT-Win64-Shipping.exe"],
+        "executable_name": "RiotClientServices.exe",
+        "game_processes": ["VALORANT-Win64-Shipping.exe"],
+        "login_data": RIOT_CLIENT_LOGIN_DATA,
+        "settings_adapter": "valorant",
+    },
+    "lol": {
+        "display_name": "League of Legends",
+        "launch_args": "--launch-product=league_of_legends --launch-patchline=live",
+        "processes_to_kill": ["LeagueClient.exe", "RiotClientServices.exe", "LeagueClientUx.exe"],
+        "executable_name": "LeagueClientUx.exe",
+        "game_processes": ["LeagueClient.exe", "League of Legends.exe"],
+        "login_data": RIOT_CLIENT_LOGIN_DATA,
+        "settings_adapter": "lol",
+    },
+}
+
+
+def select_games(names=None):
+    """Returns the registry entries for names (all titles if None), in registry order."""
+    if names is None:
+        return dict(GAMES)
+    unknown = [n for n in names if n not in GAMES]
+    if unknown:
+        raise ValueError(f"Unknown game(s): {', '.join(unknown)}")
+    return {name: GAMES[name] for name in GAMES if name in names}
+
+
+def processes_to_kill(games):
+    """Every executable the given titles run, deduplicated and in a stable order."""
+    return list(dict.fromkeys(exe for game in games.values() for exe in game["processes_to_kill"]))
+
+
+def login_data_items(games):
+    return list(dict.fromkeys(item for game in games.values() for item in game["login_data"]))
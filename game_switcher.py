@@ -1,46 +1,73 @@
 import os
 import shutil
-import subprocess
 import json
-import ctypes
+import re
 import sys
 import threading
-from zipfile import ZipFile
+import time
+from zipfile import ZipFile, ZIP_DEFLATED, BadZipFile
 from datetime import datetime
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-    print("Warning: Pillow not installed. Image conversion for icons will not work. Please install it with 'pip install Pillow'")
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import span
+from platform_backend import get_backend
+from game_registry import DEFAULT_GAME, select_games, processes_to_kill, login_data_items
+from settings_adapters import get_adapter, read_key_values
+from settings_snapshots import SnapshotStore
+from launch_monitor import LaunchMonitor, READY, FAILED
+from switch_metrics import MetricsLog, METRICS_FILE
+from trash_reaper import TrashReaper, TRASH_DIR_NAME
+from switch_coordinator import SwitchCoordinator
+from file_locks import FileLock, LockTimeout, LOCKS_DIR, write_json_atomic
+from account_order import AccountOrder, group_accounts
+from account_usage import UsageStats, USAGE_FILE
+from profile_prefetch import ProfilePrefetcher, PREFETCH_ACCOUNTS
+from cold_storage import ColdStorage, InterruptedFreeze, COLD_AFTER_DAYS, MAX_HOT
+
+PROCESS_EXIT_TIMEOUT = 5
+# Lock waits at least this long also get their own "lock_wait" record in the metrics log.
+LOCK_WAIT_REPORT_MS = 50
+# Suffix of the links a switch builds next to the live ones while the old client is exiting.
+STAGED_LINK_SUFFIX = ".ima-next"
+# Seconds after a launch settles before rarely used profiles are packed into cold storage.
+COMPACT_DELAY = 60
+
+def default_base_dir():
+    return os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
 
 class GameSwitcher:
-    def __init__(self, base_directory=None):
-        self.app_data_path = os.getenv('LOCALAPPDATA')
-        if base_directory:
-            self.base_dir = base_directory
-        else:
-            self.base_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    def __init__(self, base_directory=None, backend=None, games=None):
+        self.backend = backend or get_backend()
+        self.app_data_path = self.backend.local_app_data()
+        self.base_dir = base_directory or default_base_dir()
         
         self.profiles_dir = os.path.join(self.base_dir, "profiles")
         self.config_path = os.path.join(self.base_dir, "config.json")
+        self.snapshots = SnapshotStore(os.path.join(self.base_dir, "snapshots"))
+        self.metrics = MetricsLog(os.path.join(self.base_dir, METRICS_FILE))
+        self.trash = TrashReaper(self.backend)
+        self.prefetcher = ProfilePrefetcher(self.backend)
+        self.cold = ColdStorage(self._remove_junction_or_dir)
+        self._compaction = None # background thread packing cold profiles
+        self._compaction_cancel = threading.Event()
+        # Cross-process locks, always taken in this order: switch -> profiles -> links -> config -> usage.
+        locks_dir = os.path.join(self.base_dir, LOCKS_DIR)
+        self.profiles_lock = FileLock(os.path.join(locks_dir, "profiles.lock"), "profiles", on_wait=self._on_lock_wait)
+        self.links_lock = FileLock(os.path.join(locks_dir, "links.lock"), "links", on_wait=self._on_lock_wait)
+        self.config_lock = FileLock(os.path.join(locks_dir, "config.lock"), "config", on_wait=self._on_lock_wait)
+        self.usage = UsageStats(os.path.join(self.base_dir, USAGE_FILE), FileLock(os.path.join(locks_dir, "usage.lock"), "usage", on_wait=self._on_lock_wait))
+        self.switch_queue = SwitchCoordinator(self._run_switch, self.base_dir, on_lock_wait=self._on_lock_wait)
         self.config = None
 
-        self.GAMES = {
-            "valorant": {
-                "launch_args": "--launch-product=valorant --launch-patchline=live",
-                "processes_to_kill": ["VALORANT.exe", "RiotClientServices.exe", "VALORANT-Win64-Shipping.exe"],
-                "executable_name": "RiotClientServices.exe"
-            },
-            "lol": {
-                "launch_args": "--launch-product=league_of_legends --launch-patchline=live",
-                "processes_to_kill": ["LeagueClient.exe", "RiotClientServices.exe", "LeagueClientUx.exe"],
-                "executable_name": "LeagueClientUx.exe"
-            }
-        }
+        # The titles this switcher manages; see game_registry.GAMES.
+        self.GAMES = select_games(games)
 
         self.riot_client_data_path = None
+        self.last_launch = None # LaunchMonitor for the most recent switch
+        self._pending_switch_metrics = None # finished once last_launch reports ready/failed
+        self._kill_executor = None
         self.riot_games_config = {}
-        self.initialize_riot_client_paths()
+        with span("path_discovery"):
+            self.initialize_riot_client_paths()
 
     def _ensure_initialized(self):
         os.makedirs(self.profiles_dir, exist_ok=True)
@@ -48,25 +75,39 @@ class GameSwitcher:
             self.config = self._load_config()
 
     def is_admin(self):
-        try: return ctypes.windll.shell32.IsUserAnAdmin()
-        except: return False
+        return self.backend.is_admin()
+
+    def _on_lock_wait(self, name, wait_ms, shared):
+        if wait_ms >= LOCK_WAIT_REPORT_MS:
+            self.metrics.append({
+                "ts": datetime.now().isoformat(timespec="seconds"), "op": "lock_wait", "account": None, "ok": True,
+                "ms": round(wait_ms, 2), "stages": {name: round(wait_ms, 2)}, "shared": shared,
+            })
 
     def _load_config(self):
-        defaults = {"output_dir": None, "title": "Valorant", "menu_icon_path": "", "ordered_accounts": [], "riot_client_exe_path": None, "ui_settings": {"show_game_icons": True}}
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
-                    defaults.update(loaded_config)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                print("Warning: config.json is corrupted or has encoding issues. Using defaults.")
-        return defaults
-
-    def _save_config(self):
-        if self.config is None:
-            self.config = self._load_config() 
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=4, ensure_ascii=False)
+        with span("config_load"):
+            defaults = {"output_dir": None, "title": "Valorant", "menu_icon_path": "", "account_order": {}, "riot_client_exe_path": None, "background_service": True, "watch_profiles": True, "quick_switch_hotkey": "Ctrl+Alt+S", "prefetch_profiles": True, "cold_storage": False, "cold_storage_days": COLD_AFTER_DAYS, "cold_storage_max_hot": MAX_HOT, "ui_settings": {"show_game_icons": True}}
+            if os.path.exists(self.config_path):
+                try:
+                    with self.config_lock.hold(shared=True), open(self.config_path, 'r', encoding='utf-8') as f:
+                        loaded_config = json.load(f)
+                        defaults.update(loaded_config)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    print("Warning: config.json is corrupted or has encoding issues. Using defaults.")
+            return defaults
+
+    def _update_config(self, mutate):
+        """
+        Read-modify-write of config.json under the exclusive config lock: mutate(config) is applied to what is on
+        disk now, not to this process's copy, so concurrent processes never drop each other's changes.
+        Returns whatever mutate returns.
+        """
+        with self.config_lock.hold():
+            config = self._load_config()
+            result = mutate(config)
+            write_json_atomic(self.config_path, config, indent=4, ensure_ascii=False)
+            self.config = config
+        return result
 
     def get_ima_config(self):
         self._ensure_initialized() 
@@ -75,8 +116,7 @@ class GameSwitcher:
 
     def set_ima_config(self, settings):
         self._ensure_initialized() 
-        self.config.update(settings)
-        self._save_config()
+        self._update_config(lambda config: config.update(settings))
 
     def initialize_riot_client_paths(self, riot_client_exe_path=None):
         if self.config is None:
@@ -90,94 +130,230 @@ class GameSwitcher:
             exe_path = self._find_riot_client_path()
 
         self.riot_games_config["ExeLocationDefault"] = exe_path if exe_path and os.path.exists(exe_path) else ""
+        self._settings_adapters = {} # Adapters derive install paths from the client location.
         self.riot_client_data_path = os.path.join(self.app_data_path, "Riot Games", "Riot Client")
         self.riot_games_config.update(self._load_riot_games_config_defaults())
 
     def _find_riot_client_path(self):
-        common_paths = [
-            os.path.join("C:", os.sep, "Riot Games", "Riot Client", "RiotClientServices.exe"),
-            os.path.join(os.getenv('PROGRAMFILES'), "Riot Games", "Riot Client", "RiotClientServices.exe"),
-            os.path.join(os.getenv('PROGRAMFILES(X86)'), "Riot Games", "Riot Client", "RiotClientServices.exe"),
-        ]
-        for path in common_paths:
+        for path in self.backend.riot_client_candidates():
             if os.path.exists(path):
                 return path
         return None
 
     def _load_riot_games_config_defaults(self):
         return {
-            "LoginData": {"Config": "d", "Data": "d", "Logs": "d"}
+            "LoginData": {item: "d" for item in login_data_items(self.GAMES)}
         }
 
     def set_riot_client_paths(self, exe_path):
         self.initialize_riot_client_paths(exe_path)
-        if self.config is None:
-            self.config = self._load_config() 
-        self.config["riot_client_exe_path"] = exe_path
-        self._save_config()
+        self._update_config(lambda config: config.update(riot_client_exe_path=exe_path))
 
     def _get_account_path(self, account_name): return os.path.join(self.profiles_dir, account_name)
 
     def _terminate_processes(self):
-        all_processes = self.GAMES['valorant']["processes_to_kill"] + self.GAMES['lol']["processes_to_kill"]
-        for exe in all_processes:
-            subprocess.run(f"taskkill /f /im {exe}", shell=True, check=False, capture_output=True)
+        """Kills the client and waits for the processes to exit, so their file handles are released."""
+        with span("process_kill"):
+            pids = self.backend.kill_processes(processes_to_kill(self.GAMES))
+            remaining = self.backend.wait_for_exit(pids, PROCESS_EXIT_TIMEOUT) if pids else []
+            if remaining:
+                print(f"Processes still running after {PROCESS_EXIT_TIMEOUT}s: {remaining}")
 
     def _create_junction(self, source, link_name):
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        subprocess.run(['cmd', '/c', 'mklink', '/J', link_name, source], check=True, startupinfo=startupinfo)
+        self.backend.create_link(source, link_name)
+
+    def _trash_dir_for(self, path):
+        """Trash folder on the same volume as path. Anything under base_dir shares one outside profiles/."""
+        base = os.path.abspath(self.base_dir)
+        if os.path.abspath(path).startswith(base + os.sep):
+            return os.path.join(base, TRASH_DIR_NAME)
+        return os.path.join(os.path.dirname(path), TRASH_DIR_NAME)
+
+    def start_trash_reaper(self):
+        """
+        Called by long-lived processes (the main window, --service): deletes trashed folders in the background,
+        including what short-lived --switch runs left behind. Only one process at a time reaps. Returns True if this one does.
+        """
+        lock = FileLock(os.path.join(self.base_dir, LOCKS_DIR, "trash.lock"), "trash")
+        if not self.trash.start(lock):
+            return False
+        for trash_dir in (os.path.join(self.base_dir, TRASH_DIR_NAME), os.path.join(self.riot_client_data_path, TRASH_DIR_NAME)):
+            self.trash.recover(trash_dir)
+        return True
 
     def _remove_junction_or_dir(self, path):
         if not os.path.lexists(path): return
-        try:
-            if os.path.isdir(path) and not os.path.islink(path):
-                shutil.rmtree(path)
-            else:
-                os.remove(path)
-        except:
+        if os.path.islink(path) or not os.path.isdir(path):
             try:
-                os.rmdir(path)
-            except OSError as e:
-                print(f"Failed to remove {path}: {e}")
+                os.remove(path)
+                return
+            except OSError:
+                pass
+        try:
+            os.rmdir(path) # junctions and empty folders go in O(1)
+            return
+        except OSError:
+            pass
+        # A real folder (e.g. Riot data right after add_account_flow): rename it aside, the reaper deletes it later.
+        try:
+            self.trash.discard(path, self._trash_dir_for(path))
+        except OSError as e:
+            print(f"Failed to remove {path}: {e}")
 
-    def get_account_game(self, account_name):
+    def _read_profile_meta(self, account_name):
+        """Contents of the profile's game.json (game, preset, ...), or {} if missing or corrupt."""
         game_config_path = os.path.join(self._get_account_path(account_name), 'game.json')
-        if os.path.exists(game_config_path):
+        try:
             with open(game_config_path, 'r') as f:
-                try:
-                    return json.load(f).get('game', 'valorant')
-                except json.JSONDecodeError:
-                    return 'valorant'
-        return 'valorant'
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
 
-    def set_account_game(self, account_name, game):
+    def _update_profile_meta(self, account_name, **updates):
         account_path = self._get_account_path(account_name)
-        if not os.path.exists(account_path):
+        with self.profiles_lock.hold():
+            if not os.path.exists(account_path):
+                return False
+            meta = self._read_profile_meta(account_name)
+            meta.update(updates)
+            meta = {k: v for k, v in meta.items() if v is not None}
+            write_json_atomic(os.path.join(account_path, 'game.json'), meta)
+        return True
+
+    def get_account_game(self, account_name):
+        return self._read_profile_meta(account_name).get('game', DEFAULT_GAME)
+
+    def get_account_meta(self, account_name):
+        return self._read_profile_meta(account_name)
+
+    def get_account_tags(self, account_name, meta=None):
+        tags = (self._read_profile_meta(account_name) if meta is None else meta).get('tags', [])
+        return [t for t in tags if isinstance(t, str)] if isinstance(tags, list) else []
+
+    def set_account_tags(self, account_name, tags):
+        tags = list(dict.fromkeys(t.strip() for t in tags if t.strip()))
+        return self._update_profile_meta(account_name, tags=tags or None)
+
+    def get_account_group(self, account_name, meta=None):
+        group = (self._read_profile_meta(account_name) if meta is None else meta).get('group')
+        return group if isinstance(group, str) and group else None
+
+    def set_account_group(self, account_name, group):
+        if not self._update_profile_meta(account_name, group=(group or "").strip() or None):
             return False
-        game_config_path = os.path.join(account_path, 'game.json')
-        with open(game_config_path, 'w') as f:
-            json.dump({'game': game}, f)
+        self.update_ima_menu_if_enabled('update', account_name)
         return True
 
-    def save_account(self, account_name, game='valorant'):
-        account_path = self._get_account_path(account_name)
-        os.makedirs(account_path, exist_ok=True)
-        for item_name in self.riot_games_config["LoginData"].keys():
-            source_path = os.path.join(self.riot_client_data_path, item_name)
-            dest_path = os.path.join(account_path, item_name)
-            if not os.path.exists(source_path):
-                continue
-            self._remove_junction_or_dir(dest_path)
-            if os.path.isdir(source_path):
-                shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-            elif os.path.isfile(source_path):
-                shutil.copy2(source_path, dest_path)
-        self.set_account_game(account_name, game)
+    def _profile_names(self):
+        try:
+            with os.scandir(self.profiles_dir) as it:
+                return [e.name for e in it if e.is_dir()]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _account_order_from(config):
+        if config.get("account_order"):
+            return AccountOrder(config["account_order"])
+        # Installs from before ranks only have the flat list.
+        return AccountOrder.from_names(config.get("ordered_accounts", []))
+
+    def get_account_order(self):
+        return self._account_order_from(self.get_ima_config())
+
+    def _update_account_order(self, mutate):
+        """Applies mutate(order) to the order in config.json under the config lock. Returns the updated order."""
+        def apply(config):
+            order = self._account_order_from(config)
+            mutate(order)
+            config["account_order"] = order.to_config()
+            config.pop("ordered_accounts", None)
+            return order
+        return self._update_config(apply)
+
+    def move_account(self, account_name, before=None, after=None):
+        """Moves one account before or after another in the grid and iMA Menu order. Returns the new AccountOrder."""
+        names = self._profile_names()
+        def move(order):
+            order.rank_all(names)
+            order.move(account_name, before=before, after=after)
+        order = self._update_account_order(move)
+        self.update_ima_menu_if_enabled('move', account_name)
+        return order
+
+    def set_account_game(self, account_name, game):
+        return self._update_profile_meta(account_name, game=game)
+
+    def save_account(self, account_name, game=DEFAULT_GAME):
+        with self.metrics.begin("save", account_name) as metrics, \
+                self.profiles_lock.hold(metrics=metrics), self.links_lock.hold(shared=True, metrics=metrics):
+            account_path = self._get_account_path(account_name)
+            os.makedirs(account_path, exist_ok=True)
+            with metrics.stage("copy"):
+                for item_name in self.riot_games_config["LoginData"].keys():
+                    source_path = os.path.join(self.riot_client_data_path, item_name)
+                    dest_path = os.path.join(account_path, item_name)
+                    if not os.path.exists(source_path):
+                        continue
+                    self._remove_junction_or_dir(dest_path)
+                    if os.path.isdir(source_path):
+                        shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
+                    elif os.path.isfile(source_path):
+                        shutil.copy2(source_path, dest_path)
+                self.cold.drop(account_path) # the fresh login data replaces whatever was packed
+            self.set_account_game(account_name, game)
         self.update_ima_menu_if_enabled('add', account_name)
         return True
 
-    def switch_account(self, account_name, selected_game=None):
+    def _report(self, progress, percent, message):
+        if progress:
+            progress(percent, message)
+
+    def switch_account(self, account_name, selected_game=None, progress=None, cancel_event=None, intent=None):
+        """
+        Every switch (UI, context menu, shortcuts, service) comes through here and is queued by the coordinator:
+        bursts collapse to the newest request, and dropped ones return (True, message, COALESCED).
+        intent is the time.perf_counter() of the user's action, so the switch record covers intent -> ready.
+        Successful switches are counted in self.usage for MRU ranking.
+        """
+        if selected_game is None and self.get_account_game(account_name) == "both":
+            return True, "Game selection required.", "both" # only a prompt; nothing to queue
+        return self.switch_queue.submit(account_name, selected_game, progress, cancel_event, intent)
+
+    def _run_switch(self, account_name, selected_game, progress, cancel_event, intent=None):
+        metrics = self.metrics.begin("switch", account_name, start=intent)
+        prefetch = self.prefetcher.claim(account_name) # also stops any warming so it stays off the switch's disk
+        if prefetch: metrics.fields["prefetch"] = prefetch
+        self._compaction_cancel.set() # packing stops at the next file and frees the profiles lock
+        try:
+            # Unpacking a cold profile changes it, which needs the profiles lock to itself. Coldness is checked
+            # again once the lock is held: a compaction (maybe in another process) can pack it while we wait.
+            shared = not self.is_account_cold(account_name)
+            while True:
+                with self.profiles_lock.hold(shared=shared, metrics=metrics):
+                    if not shared or not self.is_account_cold(account_name):
+                        result = self._switch_account(account_name, selected_game, progress, cancel_event, metrics)
+                        break
+                shared = False
+        except LockTimeout as e:
+            metrics.finish(False, error=e)
+            return False, f"Profiles are busy (a save, backup or restore is still running). Please try again.\n{e}", None
+        except Exception as e:
+            metrics.finish(False, error=e)
+            raise
+        success, message, game = result
+        if game == "both":
+            metrics.cancel() # only asked which game to launch
+        elif not success and cancel_event is not None and cancel_event.is_set():
+            metrics.cancel() # cancelled or replaced by a newer request; not a failure
+        elif not success:
+            metrics.finish(False, error=message)
+        else:
+            self.usage.record(account_name)
+        return result
+
+    def _switch_account(self, account_name, selected_game, progress, cancel_event, metrics):
         if not self.is_admin():
             return False, "Administrator rights are required to switch accounts.", None
         
@@ -191,31 +367,65 @@ class GameSwitcher:
             return True, "Game selection required.", "both"
         elif game == 'both' and selected_game is not None:
             game = selected_game
-
-        self._terminate_processes()
-        
-        for item_name in self.riot_games_config["LoginData"].keys():
-            riot_item_path = os.path.join(self.riot_client_data_path, item_name)
-            profile_item_path = os.path.join(account_path, item_name)
-            self._remove_junction_or_dir(riot_item_path)
-            if os.path.exists(profile_item_path):
-                try:
-                    self._create_junction(profile_item_path, riot_item_path)
-                except Exception as e:
-                    return False, f"Failed to create junction for '{item_name}': {e}\nEnsure you are running as Administrator.", None
-
+        if game not in self.GAMES:
+            # A single-title switcher (e.g. ValorantSwitcher) launches its title for every profile.
+            if len(self.GAMES) != 1:
+                return False, f"This switcher is not set up for '{game}'.", None
+            game = next(iter(self.GAMES))
+
+        if cancel_event is not None and cancel_event.is_set():
+            return False, "Switch cancelled.", None
+
+        metrics.fields["game"] = game
+        self._report(progress, 10, "Closing Riot Client...")
+        if self.last_launch is not None: self.last_launch.stop()
+        if self._pending_switch_metrics is not None:
+            # The previous launch never reported; record it without ready/settings timings.
+            self._pending_switch_metrics.fields["note"] = "superseded before the client was ready"
+            self._pending_switch_metrics.finish(True)
+            self._pending_switch_metrics = None
+
+        # Stage 1: kill the client on a helper thread and prepare the next profile while it exits.
+        kill = self._kill_pool().submit(self._timed_terminate, metrics)
+        try:
+            with span("switch_prepare", account=account_name), metrics.stage("prepare"):
+                staged, error = [], self._thaw_profile(account_name, account_path, progress, metrics)
+                if error is None:
+                    staged, error = self._stage_links(account_path)
+                graphics_settings = self.get_account_settings(account_name) if self.GAMES[game]["settings_adapter"] else None
+                if graphics_settings is not None:
+                    adapter = self.settings_adapter(self.GAMES[game]["settings_adapter"])
+                    if adapter is not None: adapter.compile(graphics_settings) # warm the plan cache for the hand-off
+        finally:
+            kill.result() # waits on the exit handles; re-raises if the kill itself failed
+        if error:
+            self._discard_staged_links(staged)
+            return False, error, None
+        if cancel_event is not None and cancel_event.is_set():
+            self._discard_staged_links(staged)
+            return False, "Switch cancelled.", None
+
+        # Stage 2: the old client has released its handles; swap the links in.
+        self._report(progress, 40, "Linking profile...")
+        with span("link_swap", account=account_name), self.links_lock.hold(metrics=metrics):
+            error = self._commit_staged_links(staged, metrics)
+        if error:
+            return False, error, None
+
+        self._report(progress, 80, "Launching Riot Client...")
         try:
             launch_args = self.GAMES[game]["launch_args"].split()
             command = [self.riot_games_config["ExeLocationDefault"]] + launch_args
-            
-            creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == "win32" else 0
-            subprocess.Popen(command, creationflags=creationflags, close_fds=True)
-            
-            if game == 'valorant':
-                graphics_settings = self.get_graphics_settings()
-                update_thread = threading.Thread(target=self.update_all_game_user_settings, args=(graphics_settings,))
-                update_thread.daemon = True
-                update_thread.start()
+            with span("client_launch", game=game), metrics.stage("launch"):
+                process = self.backend.launch(command)
+
+            # Stage 3: hand off to the launch monitor, which applies settings once the client is ready.
+            self.last_launch = LaunchMonitor(self.backend, process, game, account_name,
+                                             os.path.join(self.riot_client_data_path, "Config", "lockfile"),
+                                             self.GAMES[game]["game_processes"])
+            self._pending_switch_metrics = metrics
+            self.last_launch.subscribe(self._on_launch_settled(game, graphics_settings, metrics))
+            self.last_launch.start()
             
             return True, "Account switched successfully.", game
         except FileNotFoundError:
@@ -223,57 +433,259 @@ class GameSwitcher:
         except Exception as e:
             return False, f"Failed to launch Riot Client: {e}", None
 
+    def _thaw_profile(self, account_name, account_path, progress, metrics):
+        """Unpacks a cold profile while the old client exits. Returns an error message or None."""
+        if not self.cold.is_cold(account_path):
+            return None
+        metrics.fields["cold"] = True
+        def report(done, total):
+            self._report(progress, 10 + done * 25 // total, f"Unpacking profile {done}/{total} files...")
+        try:
+            with span("profile_thaw", account=account_name), metrics.stage("unpack"):
+                self.cold.thaw(account_path, report)
+        except (OSError, BadZipFile) as e:
+            return f"Could not unpack the profile for '{account_name}': {e}"
+        return None
+
+    def _kill_pool(self):
+        if self._kill_executor is None:
+            self._kill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SwitchKill")
+        return self._kill_executor
+
+    def _timed_terminate(self, metrics):
+        with metrics.stage("kill"):
+            self._terminate_processes()
+
+    def _stage_links(self, account_path):
+        """
+        Creates the profile's links next to the live ones as '<item>.ima-next' while the client is still exiting,
+        so the swap afterwards is one rename per item. Returns ([(live path, profile path, staged path)], error).
+        """
+        staged = []
+        for item_name in self.riot_games_config["LoginData"].keys():
+            riot_item_path = os.path.join(self.riot_client_data_path, item_name)
+            profile_item_path = os.path.join(account_path, item_name)
+            if not os.path.exists(profile_item_path):
+                staged.append((riot_item_path, None, None))
+                continue
+            staged_path = riot_item_path + STAGED_LINK_SUFFIX
+            self._remove_junction_or_dir(staged_path) # left over from an interrupted switch
+            try:
+                self._create_junction(profile_item_path, staged_path)
+            except Exception as e:
+                return staged, f"Failed to create junction for '{item_name}': {e}\nEnsure you are running as Administrator."
+            staged.append((riot_item_path, profile_item_path, staged_path))
+        return staged, None
+
+    def _discard_staged_links(self, staged):
+        for _, _, staged_path in staged:
+            if staged_path: self._remove_junction_or_dir(staged_path)
+
+    def _commit_staged_links(self, staged, metrics):
+        for riot_item_path, profile_item_path, staged_path in staged:
+            with metrics.stage("unlink"):
+                self._remove_junction_or_dir(riot_item_path)
+            if staged_path is None:
+                continue
+            with metrics.stage("link"):
+                try:
+                    os.replace(staged_path, riot_item_path)
+                except OSError:
+                    # The old folder could not be moved out of the way; link directly so the error names the real cause.
+                    self._remove_junction_or_dir(staged_path)
+                    try:
+                        self._create_junction(profile_item_path, riot_item_path)
+                    except Exception as e:
+                        return f"Failed to create junction for '{os.path.basename(riot_item_path)}': {e}\nEnsure you are running as Administrator."
+        return None
+
+    def _on_launch_settled(self, game, graphics_settings, metrics):
+        """
+        Launch monitor callback: applies settings once the client is up (or the wait gave up) instead of racing it,
+        then finishes the switch's metrics record with the ready and settings timings.
+        """
+        settled = threading.Event()
+        def on_event(event):
+            if event["event"] not in (READY, FAILED) or settled.is_set():
+                return
+            settled.set()
+            if event["event"] == READY:
+                metrics.add_stage("ready", event["elapsed_ms"])
+            if graphics_settings is not None:
+                with metrics.stage("settings"):
+                    self.apply_game_settings(game, graphics_settings)
+            if self._pending_switch_metrics is metrics:
+                self._pending_switch_metrics = None
+            metrics.finish(event["event"] == READY, error=event["detail"].get("reason"))
+            self.schedule_prefetch(metrics.account)
+            self.schedule_compaction()
+        return on_event
+
+    def schedule_prefetch(self, current=None, delay=None):
+        """
+        Queues the profiles of the accounts most likely to be switched to after current (the last one used if None)
+        for page-cache warming once things are idle. Off with "prefetch_profiles": false. Returns the accounts.
+        """
+        if not self._load_config().get("prefetch_profiles", True):
+            return []
+        predicted = self.usage.predict(current, self._profile_names(), PREFETCH_ACCOUNTS)
+        items = list(self.riot_games_config["LoginData"])
+        targets = []
+        for name in predicted:
+            account_path = self._get_account_path(name)
+            if self.cold.is_cold(account_path):
+                targets.append((name, [self.cold.archive_path(account_path)])) # makes the unpack read from memory
+            else:
+                targets.append((name, [os.path.join(account_path, item) for item in items]))
+        self.prefetcher.schedule(targets, delay)
+        return predicted
+
+    def is_account_cold(self, account_name):
+        return self.cold.is_cold(self._get_account_path(account_name))
+
+    def _linked_account(self):
+        """The profile the Riot Client data currently links to, or None."""
+        profiles = os.path.normcase(os.path.realpath(self.profiles_dir)) + os.sep
+        for item_name in self.riot_games_config["LoginData"]:
+            target = os.path.normcase(os.path.realpath(os.path.join(self.riot_client_data_path, item_name)))
+            if target.startswith(profiles):
+                return os.path.relpath(target, profiles).split(os.sep)[0]
+        return None
+
+    def cold_storage_candidates(self, now=None, force=False):
+        """
+        Accounts to pack: everything but the cold_storage_max_hot most recently used that has not been used for
+        cold_storage_days, never the one currently linked. Accounts never switched to since usage was recorded
+        count from when their profile was last saved. Empty unless "cold_storage" is turned on or force is set.
+        """
+        config = self._load_config()
+        if not force and not config.get("cold_storage", False):
+            return []
+        now = time.time() if now is None else now
+        cutoff = now - config.get("cold_storage_days", COLD_AFTER_DAYS) * 86400
+        used = self.usage.last_used()
+        last_used = {}
+        for name in self._profile_names():
+            try:
+                last_used[name] = used.get(name) or os.stat(self._get_account_path(name)).st_mtime
+            except OSError:
+                continue
+        by_recency = sorted(last_used, key=lambda n: (-last_used[n], n))
+        linked = self._linked_account()
+        return [n for n in by_recency[max(0, config.get("cold_storage_max_hot", MAX_HOT)):]
+                if last_used[n] < cutoff and n != linked and not self.is_account_cold(n)]
+
+    def compact_profiles(self, progress=None, cancel_event=None, force=False):
+        """
+        Packs every cold storage candidate, one profile at a time. force packs them even with cold storage
+        turned off (--compact-profiles). Returns (profiles packed, bytes saved).
+        """
+        metrics = self.metrics.begin("compact")
+        packed, saved = 0, 0
+        candidates = self.cold_storage_candidates(force=force)
+        items = list(self.riot_games_config["LoginData"])
+        for i, name in enumerate(candidates):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            self._report(progress, i * 100 // len(candidates), f"Packing '{name}' ({i + 1}/{len(candidates)})...")
+            try:
+                with self.profiles_lock.hold(metrics=metrics):
+                    account_path = self._get_account_path(name)
+                    if not os.path.isdir(account_path) or self.cold.is_cold(account_path) or name == self._linked_account():
+                        continue
+                    with metrics.stage("pack"):
+                        original, archived = self.cold.freeze(account_path, items, cancel_event)
+            except InterruptedFreeze:
+                break
+            except (OSError, ValueError) as e:
+                print(f"Could not pack the profile for '{name}': {e}")
+                continue
+            packed += 1
+            saved += max(0, original - archived)
+        metrics.fields.update({"packed": packed, "saved_bytes": saved})
+        if packed: metrics.finish(True)
+        else: metrics.cancel() # nothing to record
+        return packed, saved
+
+    def schedule_compaction(self, delay=COMPACT_DELAY):
+        """Packs rarely used profiles on a background-priority thread after delay seconds; a switch cancels it."""
+        if not self._load_config().get("cold_storage", False):
+            return False
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        self._compaction_cancel = cancel = threading.Event()
+        def run():
+            self.backend.lower_thread_priority()
+            if not cancel.wait(delay):
+                self.compact_profiles(cancel_event=cancel)
+        self._compaction = threading.Thread(target=run, name="ProfileCompaction", daemon=True)
+        self._compaction.start()
+        return True
+
     def add_account_flow(self):
         if not self.is_admin(): return False
-        game = 'valorant'  # Default to valorant for this flow
         self._terminate_processes()
-        for item_name in self.riot_games_config["LoginData"].keys():
-            riot_item_path = os.path.join(self.riot_client_data_path, item_name)
-            self._remove_junction_or_dir(riot_item_path)
+        with self.links_lock.hold():
+            for item_name in self.riot_games_config["LoginData"].keys():
+                riot_item_path = os.path.join(self.riot_client_data_path, item_name)
+                self._remove_junction_or_dir(riot_item_path)
         try:
-            subprocess.Popen([self.riot_games_config["ExeLocationDefault"]])
+            self.backend.launch([self.riot_games_config["ExeLocationDefault"]])
             return True
         except FileNotFoundError:
             return False
 
     def get_saved_accounts(self):
-        accounts_data = {}
-        try:
-            dirs = [d for d in os.listdir(self.profiles_dir) if os.path.isdir(os.path.join(self.profiles_dir, d))]
-            for account_name in sorted(dirs):
-                icon_path = os.path.join(self._get_account_path(account_name), "icon.png")
-                game = self.get_account_game(account_name)
-                accounts_data[account_name] = (icon_path if os.path.exists(icon_path) else None, game)
-        except FileNotFoundError:
-            os.makedirs(self.profiles_dir, exist_ok=True)
-        return accounts_data
+        with span("account_scan"), self.profiles_lock.hold(shared=True):
+            accounts_data = {}
+            try:
+                dirs = [d for d in os.listdir(self.profiles_dir) if os.path.isdir(os.path.join(self.profiles_dir, d))]
+                for account_name in sorted(dirs):
+                    icon_path = os.path.join(self._get_account_path(account_name), "icon.png")
+                    game = self.get_account_game(account_name)
+                    accounts_data[account_name] = (icon_path if os.path.exists(icon_path) else None, game)
+            except FileNotFoundError:
+                os.makedirs(self.profiles_dir, exist_ok=True)
+            return accounts_data
 
     def rename_account(self, old_name, new_name):
         old_path, new_path = self._get_account_path(old_name), self._get_account_path(new_name)
-        if os.path.exists(old_path) and not os.path.exists(new_path):
+        with self.profiles_lock.hold():
+            if not os.path.exists(old_path) or os.path.exists(new_path):
+                return False
             os.rename(old_path, new_path)
-            self.update_ima_menu_if_enabled('rename', new_name, old_name=old_name)
-            return True
-        return False
+        self.usage.rename(old_name, new_name)
+        self.prefetcher.forget(old_name)
+        self.update_ima_menu_if_enabled('rename', new_name, old_name=old_name)
+        return True
 
     def delete_account(self, account_name):
         account_path = self._get_account_path(account_name)
-        if os.path.exists(account_path):
-            shutil.rmtree(account_path)
-            self.update_ima_menu_if_enabled('delete', account_name)
-            return True
-        return False
+        with self.profiles_lock.hold():
+            if not os.path.exists(account_path):
+                return False
+            self.trash.discard(account_path, self._trash_dir_for(account_path))
+        self.usage.remove(account_name)
+        self.prefetcher.forget(account_name)
+        self.update_ima_menu_if_enabled('delete', account_name)
+        return True
 
     def set_account_icon(self, account_name, source_icon_path):
         account_path = self._get_account_path(account_name)
         if not os.path.isdir(account_path): return False
         dest_icon_path = os.path.join(account_path, "icon.png")
         try:
-            if Image:
-                img = Image.open(source_icon_path)
-                img.save(dest_icon_path, "PNG")
-            else:
-                shutil.copy(source_icon_path, dest_icon_path)
+            from PIL import Image
+        except ImportError:
+            Image = None
+            print("Warning: Pillow not installed. Image conversion for icons will not work. Please install it with 'pip install Pillow'")
+        try:
+            with self.profiles_lock.hold():
+                if Image:
+                    img = Image.open(source_icon_path)
+                    img.save(dest_icon_path, "PNG")
+                else:
+                    shutil.copy(source_icon_path, dest_icon_path)
             self.update_ima_menu_if_enabled('update', account_name)
             return True
         except Exception as e:
@@ -285,7 +697,8 @@ class GameSwitcher:
         icon_path = os.path.join(account_path, "icon.png")
         if os.path.exists(icon_path):
             try:
-                os.remove(icon_path)
+                with self.profiles_lock.hold():
+                    os.remove(icon_path)
                 self.update_ima_menu_if_enabled('update', account_name)
                 return True
             except Exception as e:
@@ -341,42 +754,73 @@ class GameSwitcher:
         timestamp = now.strftime("GameAccountBackup_%H%M_%d%m%Y")
         return timestamp
 
-    def backup_profiles(self, backup_file_path):
-        try: 
-            shutil.make_archive(base_name=backup_file_path.replace('.zip', ''), format='zip', root_dir=self.base_dir, base_dir='profiles')
+    def backup_profiles(self, backup_file_path, progress=None, cancel_event=None):
+        metrics = self.metrics.begin("backup")
+        try:
+            with self.profiles_lock.hold(shared=True, metrics=metrics), ZipFile(backup_file_path, 'w', ZIP_DEFLATED) as zip_ref:
+                files = []
+                for root, dirs, names in os.walk(self.profiles_dir):
+                    files.extend(os.path.join(root, n) for n in names)
+                for i, file_path in enumerate(files):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise InterruptedError("Backup cancelled.")
+                    zip_ref.write(file_path, os.path.relpath(file_path, self.base_dir))
+                    self._report(progress, (i + 1) * 100 // len(files), f"Backing up {i + 1}/{len(files)} files...")
+            metrics.fields["files"] = len(files)
+            metrics.finish(True)
             return True
         except Exception as e:
-            print(f"Backup failed: {e}"); return False
+            print(f"Backup failed: {e}")
+            metrics.finish(False, error=e)
+            if os.path.exists(backup_file_path): os.remove(backup_file_path)
+            return False
             
-    def restore_profiles(self, backup_file_path):
+    def restore_profiles(self, backup_file_path, progress=None, cancel_event=None):
+        staging_dir = os.path.join(self.base_dir, "profiles.restore")
+        metrics = self.metrics.begin("restore")
         try:
-            if os.path.exists(self.profiles_dir): shutil.rmtree(self.profiles_dir)
-            with ZipFile(backup_file_path, 'r') as zip_ref: zip_ref.extractall(self.base_dir)
+            if os.path.exists(staging_dir): shutil.rmtree(staging_dir)
+            with ZipFile(backup_file_path, 'r') as zip_ref:
+                members = [m for m in zip_ref.namelist() if m.replace('\\', '/').startswith('profiles/')]
+                if not members: raise ValueError("Backup does not contain a profiles folder.")
+                # Extract next to the live folder first so a cancelled or broken restore leaves profiles untouched.
+                for i, member in enumerate(members):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise InterruptedError("Restore cancelled.")
+                    zip_ref.extract(member, staging_dir)
+                    self._report(progress, (i + 1) * 100 // len(members), f"Restoring {i + 1}/{len(members)} files...")
+            with self.profiles_lock.hold(metrics=metrics), metrics.stage("swap"):
+                if os.path.exists(self.profiles_dir): self.trash.discard(self.profiles_dir, self._trash_dir_for(self.profiles_dir))
+                os.rename(os.path.join(staging_dir, "profiles"), self.profiles_dir)
+                shutil.rmtree(staging_dir, ignore_errors=True)
             self.update_ima_menu_if_enabled('restore', list(self.get_saved_accounts().keys()))
+            metrics.fields["files"] = len(members)
+            metrics.finish(True)
             return True
         except Exception as e:
-            print(f"Restore failed: {e}"); return False
+            print(f"Restore failed: {e}")
+            metrics.finish(False, error=e)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return False
 
     def update_ima_menu_if_enabled(self, action, name, old_name=None):
         ima_config = self.get_ima_config()
+        # Accounts without a rank simply follow the ranked ones, so only renames and removals touch the order.
+        ranks = self._account_order_from(ima_config).ranks
+        if action == 'rename' and old_name in ranks:
+            self._update_account_order(lambda order: order.rename(old_name, name))
+        elif action == 'delete' and name in ranks:
+            self._update_account_order(lambda order: order.remove(name))
+        elif action == 'restore' and ranks:
+            self._update_account_order(lambda order: order.retain(set(name))) # name is the restored account list
         if not ima_config.get("output_dir"): return
         
         print(f"iMA Auto-Update: Action='{action}', Name='{name}'")
         
-        current_ordered_list = ima_config.get("ordered_accounts", [])
-        if action == 'add' and name not in current_ordered_list: current_ordered_list.append(name)
-        elif action == 'delete' and name in current_ordered_list: current_ordered_list.remove(name)
-        elif action == 'rename' and old_name in current_ordered_list: current_ordered_list[current_ordered_list.index(old_name)] = name
-        elif action == 'restore': current_ordered_list = sorted(list(self.get_saved_accounts().keys()))
-        
-        ima_config["ordered_accounts"] = current_ordered_list
-        self.set_ima_config(ima_config)
-        
         try:
             self.generate_ima_menu_script(
                 output_dir=ima_config["output_dir"],
                 title=ima_config["title"],
-                ordered_accounts=ima_config["ordered_accounts"],
                 menu_icon_path=ima_config.get("menu_icon_path", ""),
                 save_config=False  
             )
@@ -384,9 +828,13 @@ class GameSwitcher:
         except Exception as e:
             print(f"Automatic iMA menu update failed: {e}")
 
-    def generate_ima_menu_script(self, output_dir, title, ordered_accounts, menu_icon_path="", save_config=False):
+    def generate_ima_menu_script(self, output_dir, title, ordered_accounts=None, menu_icon_path="", save_config=False):
+        """Writes valo.nss: one item per account in the saved order (or ordered_accounts), grouped accounts in submenus."""
         if save_config:
-            self.set_ima_config({"output_dir": output_dir, "title": title, "menu_icon_path": menu_icon_path, "ordered_accounts": ordered_accounts})
+            self.set_ima_config({"output_dir": output_dir, "title": title, "menu_icon_path": menu_icon_path})
+            if ordered_accounts is not None:
+                # The export dialog hands over a complete new order.
+                self._update_account_order(lambda order: order.reset(ordered_accounts))
         
         script_path = os.path.join(output_dir, 'valo.nss')
         icons_dir = os.path.join(output_dir, "icons"); os.makedirs(icons_dir, exist_ok=True)
@@ -404,58 +852,46 @@ class GameSwitcher:
         script_content = [f"menu(where=sel.count>0 type='namespace|back' mode='multiple' title='{title}'{menu_icon_arg})", "{"]
         main_app_path = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(sys.argv[0])
         accounts_data = self.get_saved_accounts()
+        if ordered_accounts is None:
+            ordered_accounts = self.get_account_order().ordered(accounts_data)
+        groups = {name: self.get_account_group(name) for name in accounts_data}
         
-        for account_name in ordered_accounts:
-            if account_name not in accounts_data: continue
-            item_icon_arg = ""
-            icon_source_path, _ = accounts_data.get(account_name)
-            if icon_source_path and os.path.exists(icon_source_path):
-                formatted_icon_path = icon_source_path.replace(os.sep, '\\')
-                item_icon_arg = f" icon='{formatted_icon_path}'"
-            
-            cmd_executable = f'"{main_app_path}"'
-            cmd_args = f'--switch "{account_name}"'
-            item_line = f"    item(title='{account_name}' cmd='{cmd_executable}' args='{cmd_args}'{item_icon_arg})"
-            script_content.append(item_line)
+        for group, members in group_accounts([n for n in ordered_accounts if n in accounts_data], groups):
+            indent = "    "
+            if group is not None:
+                script_content.append(f"    menu(title='{group}')")
+                script_content.append("    {")
+                indent = "        "
+            for account_name in members:
+                item_icon_arg = ""
+                icon_source_path, _ = accounts_data.get(account_name)
+                if icon_source_path and os.path.exists(icon_source_path):
+                    formatted_icon_path = icon_source_path.replace(os.sep, '\\')
+                    item_icon_arg = f" icon='{formatted_icon_path}'"
+                
+                cmd_executable = f'"{main_app_path}"'
+                cmd_args = f'--switch "{account_name}"'
+                item_line = f"{indent}item(title='{account_name}' cmd='{cmd_executable}' args='{cmd_args}'{item_icon_arg})"
+                script_content.append(item_line)
+            if group is not None:
+                script_content.append("    }")
             
         script_content.append("}")
         final_script = "\n".join(script_content)
         with open(script_path, 'w', encoding='utf-8') as f:
             f.write(final_script)
 
-    def _find_game_user_settings_files(self):
-        valorant_config_path = os.path.join(os.getenv('LOCALAPPDATA'), "VALORANT", "Saved", "Config")
-        ini_files = []
-        print(f"Searching for GameUserSettings.ini in: {valorant_config_path}")
-        if not os.path.exists(valorant_config_path):
-            print(f"Valorant config path does not exist: {valorant_config_path}")
-            return []
+    def settings_adapter(self, key):
+        """The cached settings adapter for a registry adapter key ('valorant', 'lol'), or None."""
+        if key not in self._settings_adapters:
+            self._settings_adapters[key] = get_adapter(key, self.app_data_path, self.riot_games_config.get("ExeLocationDefault"))
+        return self._settings_adapters[key]
 
-        for root, dirs, files in os.walk(valorant_config_path):
-            if "GameUserSettings.ini" in files and os.path.basename(root) == "Windows":
-                ini_file_path = os.path.join(root, "GameUserSettings.ini")
-                ini_files.append(ini_file_path)
-                print(f"Found: {ini_file_path}")
-        if not ini_files:
-            print("No GameUserSettings.ini files found.")
-        return ini_files
+    def _find_game_user_settings_files(self):
+        return self.settings_adapter("valorant").discover()["game_user"]
 
     def _find_riot_user_settings_files(self):
-        valorant_config_path = os.path.join(os.getenv('LOCALAPPDATA'), "VALORANT", "Saved", "Config")
-        ini_files = []
-        print(f"Searching for RiotUserSettings.ini in: {valorant_config_path}")
-        if not os.path.exists(valorant_config_path):
-            print(f"Valorant config path does not exist: {valorant_config_path}")
-            return []
-
-        for root, dirs, files in os.walk(valorant_config_path):
-            if "RiotUserSettings.ini" in files and os.path.basename(root) == "Windows":
-                ini_file_path = os.path.join(root, "RiotUserSettings.ini")
-                ini_files.append(ini_file_path)
-                print(f"Found: {ini_file_path}")
-        if not ini_files:
-            print("No RiotUserSettings.ini files found.")
-        return ini_files
+        return self.settings_adapter("valorant").discover()["riot_user"]
 
     def get_graphics_settings(self):
         self._ensure_initialized()
@@ -475,167 +911,129 @@ class GameSwitcher:
                 "display_mode": "Default",
                 "quality": {k: v for k, v in quality_settings.items() if k.startswith("sg.")},
                 "riot_settings": {k: v for k, v in riot_settings.items() if "EAresIntSettingName::" in k},
-                "audio_settings": {k: v for k, v in riot_settings.items() if "EAresFloatSettingName::" in k or "EAresBoolSettingName::" in k}
+                "audio_settings": {k: v for k, v in riot_settings.items() if "EAresFloatSettingName::" in k or "EAresBoolSettingName::" in k},
+                "lol_display_mode": "Default",
+                "lol_settings": {}
             }
-            self.config["graphics_settings"] = graphics_settings
-            self._save_config()
+            self._update_config(lambda config: config.setdefault("graphics_settings", graphics_settings))
         return self.config["graphics_settings"]
 
     def save_graphics_settings(self, settings):
         self._ensure_initialized()
         # Extract ui_settings if present
         ui_settings = settings.pop("ui_settings", None)
-        if ui_settings is not None:
-            self.config["ui_settings"] = ui_settings
-        self.config["graphics_settings"] = settings
-        self._save_config()
+        def mutate(config):
+            if ui_settings is not None:
+                config["ui_settings"] = ui_settings
+            config["graphics_settings"] = settings
+        self._update_config(mutate)
+
+    def get_presets(self):
+        """{preset id: {"name": ..., "settings": graphics_settings}} from config.json."""
+        self._ensure_initialized()
+        return self.config.get("settings_presets", {})
+
+    def save_preset(self, name, settings, preset_id=None):
+        """Creates or overwrites a named preset. Returns its id."""
+        self._ensure_initialized()
+        preset_id = preset_id or re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "preset"
+        settings = {k: v for k, v in settings.items() if k != "ui_settings"}
+        self._update_config(lambda config: config.setdefault("settings_presets", {}).update({preset_id: {"name": name, "settings": settings}}))
+        return preset_id
+
+    def delete_preset(self, preset_id):
+        """Removes a preset. Accounts still pointing at it fall back to the global settings."""
+        self._ensure_initialized()
+        return self._update_config(lambda config: config.get("settings_presets", {}).pop(preset_id, None) is not None)
+
+    def get_account_preset(self, account_name):
+        preset_id = self._read_profile_meta(account_name).get('preset')
+        return preset_id if preset_id in self.get_presets() else None
+
+    def assign_preset(self, account_names, preset_id):
+        """
+        Points each account at preset_id (None for the global settings) in one pass over their game.json files.
+        Returns the number of accounts updated. The preset is applied on the next switch to each account.
+        """
+        if preset_id is not None and preset_id not in self.get_presets():
+            return 0
+        return sum(1 for name in account_names if self._update_profile_meta(name, preset=preset_id))
+
+    def get_account_settings(self, account_name):
+        """The graphics settings a switch to account_name applies: its preset if assigned, else the global settings."""
+        preset_id = self.get_account_preset(account_name)
+        if preset_id:
+            return self.get_presets()[preset_id]["settings"]
+        return self.get_graphics_settings()
 
     def _get_global_game_user_settings_from_file(self):
         ini_files = self._find_game_user_settings_files()
         if not ini_files: return None, "No GameUserSettings.ini files found to load settings from."
-        settings = {}
         try:
-            with open(ini_files[0], 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip().startswith("sg.") and "=" in line:
-                        key, value = line.split("=", 1)
-                        settings[key.strip()] = value.strip()
-            return settings, None
+            return read_key_values(ini_files[0], prefix="sg."), None
         except Exception as e:
             return None, f"Error reading {ini_files[0]}: {e}"
 
     def _get_global_riot_user_settings_from_file(self):
         ini_files = self._find_riot_user_settings_files()
         if not ini_files: return None, "No RiotUserSettings.ini files found to load settings from."
-        settings = {}
         try:
-            with open(ini_files[0], 'r', encoding='utf-8') as f:
-                for line in f:
-                    stripped_line = line.strip()
-                    if stripped_line.startswith("EAres") and "=" in stripped_line:
-                        key, value = stripped_line.split("=", 1)
-                        settings[key.strip()] = value.strip()
-            return settings, None
+            return read_key_values(ini_files[0], prefix="EAres"), None
         except Exception as e:
             return None, f"Error reading {ini_files[0]}: {e}"
 
+    def apply_game_settings(self, game, graphics_settings, snapshot=None):
+        """Applies graphics_settings to one title's files. Originals of changed files go into a snapshot for rollback_settings()."""
+        adapter_key = self.GAMES.get(game, {}).get("settings_adapter")
+        adapter = self.settings_adapter(adapter_key) if adapter_key else None
+        if adapter is None:
+            return True, None
+        operation = snapshot or self.snapshots.begin(f"{game} settings")
+        with span("ini_apply", game=game):
+            result = adapter.apply(graphics_settings, snapshot=operation)
+        if snapshot is None:
+            operation.commit()
+        return result
+
+    def preview_settings(self, graphics_settings):
+        """
+        Dry run of update_all_game_user_settings: reads every target file and reports what would change
+        without writing. Returns {"files": {path: [(key, old, new), ...]}, "errors": {path: message},
+        "games": {game: {"files_scanned", "keys_changed"}}, "files_scanned", "files_changed", "keys_changed"}.
+        """
+        files, errors, games, scanned = {}, {}, {}, 0
+        for game, game_config in self.GAMES.items():
+            adapter = self.settings_adapter(game_config["settings_adapter"]) if game_config["settings_adapter"] else None
+            if adapter is None: continue
+            results, failed = adapter.run_plan(adapter.compile(graphics_settings), write=False)
+            scanned += len(results) + len(failed)
+            files.update((path, changes) for path, changes in results.items() if changes)
+            errors.update(failed)
+            games[game] = {"files_scanned": len(results) + len(failed), "keys_changed": sum(len(changes) for changes in results.values())}
+        return {
+            "files": files, "errors": errors, "games": games, "files_scanned": scanned,
+            "files_changed": len(files), "keys_changed": sum(len(changes) for changes in files.values()),
+        }
+
     def update_all_game_user_settings(self, graphics_settings):
-        game_user_ini_files = self._find_game_user_settings_files()
-        riot_user_ini_files = self._find_riot_user_settings_files()
+        """Pushes graphics_settings to the settings files of every title this switcher manages."""
         all_success = True
-
-        if not game_user_ini_files:
-            print("No GameUserSettings.ini files found to update.")
-        else:
-            display_mode = graphics_settings.get("display_mode", "Default")
-            quality_settings = graphics_settings.get("quality", {})
-            
-            for ini_file_path in game_user_ini_files:
-                try:
-                    with open(ini_file_path, 'r', encoding='utf-8') as f: lines = f.readlines()
-                    
-                    temp_lines = []
-                    settings_to_update = {}
-                    if display_mode == "Fullscreen":
-                        settings_to_update = {
-                            "ResolutionSizeX": "1920", "ResolutionSizeY": "1080",
-                            "LastUserConfirmedResolutionSizeX": "1920", "LastUserConfirmedResolutionSizeY": "1080",
-                            "WindowPosX": "0", "WindowPosY": "0",
-                            "LastConfirmedFullscreenMode": "0", "PreferredFullscreenMode": "0"
-                        }
-                    elif display_mode == "Windowed Fullscreen":
-                        settings_to_update = {
-                            "ResolutionSizeX": "1920", "ResolutionSizeY": "1080",
-                            "LastUserConfirmedResolutionSizeX": "1280", "LastUserConfirmedResolutionSizeY": "720",
-                            "WindowPosX": "0", "WindowPosY": "0",
-                            "LastConfirmedFullscreenMode": "1", "PreferredFullscreenMode": "1"
-                        }
-                    elif display_mode == "Windowed":
-                        settings_to_update = {
-                            "ResolutionSizeX": "1920", "ResolutionSizeY": "1032",
-                            "LastUserConfirmedResolutionSizeX": "1280", "LastUserConfirmedResolutionSizeY": "720",
-                            "WindowPosX": "0", "WindowPosY": "24",
-                            "LastConfirmedFullscreenMode": "2", "PreferredFullscreenMode": "1"
-                        }
-
-                    for line in lines:
-                        stripped = line.strip()
-                        key_to_update = next((key for key in settings_to_update if stripped.startswith(key + "=")), None)
-                        if key_to_update:
-                            temp_lines.append(f"{key_to_update}={settings_to_update[key_to_update]}\n")
-                            del settings_to_update[key_to_update]
-                            continue
-                        
-                        if stripped.startswith("sg."):
-                            key = stripped.split('=')[0]
-                            if key in quality_settings:
-                                temp_lines.append(f"{key}={quality_settings[key]}\n")
-                                continue
-
-                        if display_mode != "Default" and stripped.startswith("FullscreenMode="):
-                            continue
-
-                        temp_lines.append(line)
-
-                    if display_mode != "Default":
-                        if display_mode in ["Windowed", "Windowed Fullscreen"]:
-                            fs_val = "1" if display_mode == "Windowed Fullscreen" else "2"
-                            hdr_idx = next((i for i, l in enumerate(temp_lines) if l.strip().startswith("HDRDisplayOutputNits=")), -1)
-                            if hdr_idx != -1: temp_lines.insert(hdr_idx + 1, f"FullscreenMode={fs_val}\n")
-
-                    with open(ini_file_path, 'w', encoding='utf-8') as f: f.writelines(temp_lines)
-                    print(f"Successfully updated: {ini_file_path}")
-                except Exception as e:
-                    print(f"Error updating {ini_file_path}: {e}"); all_success = False
-
-        if not riot_user_ini_files:
-            print("No RiotUserSettings.ini files found to update.")
-        else:
-            riot_settings = graphics_settings.get("riot_settings", {})
-            audio_settings = graphics_settings.get("audio_settings", {})
-            all_settings_to_apply = {**riot_settings, **audio_settings}
-
-            for ini_file_path in riot_user_ini_files:
-                try:
-                    with open(ini_file_path, 'r', encoding='utf-8') as f: lines = f.readlines()
-                    
-                    temp_lines = []
-                    keys_to_process = set(all_settings_to_apply.keys())
-                    
-                    for line in lines:
-                        stripped = line.strip()
-                        key_found = next((key for key in keys_to_process if stripped.startswith(key + "=")), None)
-                        
-                        if key_found:
-                            value = all_settings_to_apply[key_found]
-                            if value in ["High", "On", "MAX"]:
-                                continue
-                            else:
-                                temp_lines.append(f"{key_found}={value}\n")
-                            keys_to_process.remove(key_found)
-                        else:
-                            temp_lines.append(line)
-                    
-                    if keys_to_process:
-                        last_ea_line_idx = -1
-                        for i, line in reversed(list(enumerate(temp_lines))):
-                            if line.strip().startswith("EAres"):
-                                last_ea_line_idx = i
-                                break
-                        
-                        for key in sorted(list(keys_to_process)):
-                            value = all_settings_to_apply[key]
-                            if value not in ["High", "On", "MAX"]:
-                                insert_line = f"{key}={value}\n"
-                                if last_ea_line_idx != -1:
-                                    temp_lines.insert(last_ea_line_idx + 1, insert_line)
-                                else:
-                                    temp_lines.append(insert_line)
-
-                    with open(ini_file_path, 'w', encoding='utf-8') as f: f.writelines(temp_lines)
-                    print(f"Successfully updated: {ini_file_path}")
-                except Exception as e:
-                    print(f"Error updating {ini_file_path}: {e}"); all_success = False
-
+        operation = self.snapshots.begin("Options apply")
+        for game in self.GAMES:
+            success, _ = self.apply_game_settings(game, graphics_settings, snapshot=operation)
+            all_success = all_success and success
+        operation.commit()
         return all_success, None if all_success else "One or more files failed to update."
 
+    def rollback_settings(self, op_id=None):
+        """Puts back every settings file an apply changed. Defaults to the most recent apply. Returns (success, message)."""
+        if op_id is None:
+            operations = self.snapshots.list_operations()
+            if not operations:
+                return False, "No settings changes to undo."
+            op_id = operations[0]
+        success, message = self.snapshots.rollback(op_id)
+        if success:
+            # Drop the undone apply from history so the next undo walks further back.
+            self.snapshots.discard(op_id)
+        return success, message
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import nullcontext
+
+TRACE_ENV = "IMA_SWITCHER_TRACE"
+TRACE_FORMAT_ENV = "IMA_SWITCHER_TRACE_FORMAT"
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start_ns")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.start_ns, end_ns, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Collects named timing spans (path discovery, account scan, link swap, ...).
+    Disabled by default; enable with --trace PATH or the IMA_SWITCHER_TRACE environment variable.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self.output_format = "chrome"
+        self._events = []
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._registered_exit = False
+
+    def enable(self, output_path=None, output_format=None):
+        self.enabled = True
+        self.output_path = output_path
+        if output_format: self.output_format = output_format
+        if output_path and not self._registered_exit:
+            atexit.register(self.export)
+            self._registered_exit = True
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _record(self, name, start_ns, end_ns, args):
+        event = {
+            "name": name,
+            "start_ms": (start_ns - self._origin_ns) / 1e6,
+            "duration_ms": (end_ns - start_ns) / 1e6,
+            "thread": threading.current_thread().name,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def summary(self):
+        """Returns {span name: (count, total ms, max ms)}."""
+        totals = {}
+        for event in self.events():
+            count, total, longest = totals.get(event["name"], (0, 0.0, 0.0))
+            totals[event["name"]] = (count + 1, total + event["duration_ms"], max(longest, event["duration_ms"]))
+        return totals
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": e["name"], "ph": "X", "pid": pid, "tid": e["tid"],
+                "ts": round(e["start_ms"] * 1000, 3), "dur": round(e["duration_ms"] * 1000, 3),
+                "args": {k: str(v) for k, v in e["args"].items()},
+            }
+            for e in self.events()
+        ]
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, path=None, output_format=None):
+        path = path or self.output_path
+        if not path: return False
+        output_format = output_format or self.output_format
+        data = self.to_chrome_trace() if output_format == "chrome" else {"pid": os.getpid(), "spans": self.events()}
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, default=str)
+            return True
+        except OSError as e:
+            print(f"Could not write trace to {path}: {e}")
+            return False
+
+
+tracer = Tracer()
+span = tracer.span
+
+if os.getenv(TRACE_ENV):
+    tracer.enable(os.getenv(TRACE_ENV), os.getenv(TRACE_FORMAT_ENV))
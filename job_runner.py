@@ -0,0 +1,126 @@
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    started = pyqtSignal()
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """A unit of background work. The callable receives the job as its only argument and may raise JobCancelled."""
+
+    def __init__(self, name, func, conflict_key=None, cancellable=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.name = name
+        self.func = func
+        self.conflict_key = conflict_key
+        self.cancellable = cancellable # func stops when cancel_event is set, so the UI offers a cancel button
+        self.signals = JobSignals()
+        # Handed to switcher methods, which check it at points where stopping is safe.
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report_progress(self, percent, message=""):
+        self.signals.progress.emit(int(percent), message)
+
+    def run(self):
+        self.signals.started.emit()
+        try:
+            if self.is_cancelled():
+                raise JobCancelled()
+            result = self.func(self)
+            # Switcher methods report a cancel as a failed result rather than raising.
+            if self.is_cancelled() and not _succeeded(result):
+                raise JobCancelled()
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+def _succeeded(result):
+    return bool(result[0] if isinstance(result, tuple) and result else result)
+
+
+class JobRunner(QObject):
+    """
+    Runs switcher operations on a QThreadPool so the GUI thread never blocks.
+    Jobs that share a conflict key never run at the same time; a second submit is refused.
+    """
+    job_started = pyqtSignal(str)
+    job_ended = pyqtSignal(str)
+    job_cancelled = pyqtSignal(str)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._active = {}
+
+    def is_busy(self, conflict_key=None, except_name=None):
+        if conflict_key is None:
+            return bool(self._active)
+        return any(job.conflict_key == conflict_key and job.name != except_name for job in self._active.values())
+
+    def submit(self, name, func, conflict_key="profiles", on_finished=None, on_failed=None, on_progress=None, on_cancelled=None,
+               share_with_same_name=False, cancellable=False):
+        """
+        share_with_same_name lets jobs of the same name overlap (switches, which the switcher queues itself).
+        cancellable marks jobs whose func honours job.cancel_event; cancel_running() only stops those.
+        """
+        if conflict_key is not None and self.is_busy(conflict_key, except_name=name if share_with_same_name else None):
+            return None
+
+        job = Job(name, func, conflict_key, cancellable)
+        # Connected first so the conflict key is already free when the callbacks below run.
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_, j=job: self._on_job_ended(j))
+        job.signals.cancelled.connect(lambda j=job: self.job_cancelled.emit(j.name))
+        if on_finished: job.signals.finished.connect(on_finished)
+        if on_failed: job.signals.failed.connect(on_failed)
+        if on_progress: job.signals.progress.connect(on_progress)
+        if on_cancelled: job.signals.cancelled.connect(on_cancelled)
+
+        self._active[id(job)] = job
+        self.job_started.emit(name)
+        self.pool.start(job)
+        return job
+
+    def running(self):
+        """The most recently started cancellable job that is still active, or None."""
+        jobs = [job for job in self._active.values() if job.cancellable and not job.is_cancelled()]
+        return jobs[-1] if jobs else None
+
+    def cancel_running(self):
+        job = self.running()
+        if job is not None: job.cancel()
+        return job
+
+    def cancel_all(self):
+        for job in self._active.values():
+            job.cancel()
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _on_job_ended(self, job):
+        if self._active.pop(id(job), None) is not None:
+            self.job_ended.emit(job.name)
@@ -0,0 +1,141 @@
+import os
+import time
+import threading
+
+LAUNCHED = "launched"
+READY = "ready"
+GAME_STARTED = "game_started"
+FAILED = "failed"
+
+# Processes that only exist once the Riot Client UI is up.
+RIOT_CLIENT_READY_PROCESSES = ("RiotClientUx.exe", "Riot Client.exe")
+
+READY_TIMEOUT = 90
+GAME_TIMEOUT = 300
+POLL_INTERVAL = 0.25
+# The process table is far more expensive to read than a stat(), so it is only polled every Nth tick.
+PROCESS_POLL_EVERY = 4
+
+
+class LaunchMonitor:
+    """
+    Follows one client launch: launched -> ready -> game_started, or failed.
+    Ready is a lockfile written after the launch or a Riot Client UI process; game_started is one of the
+    title's own processes. Events are dicts {"event", "game", "account", "elapsed_ms", "detail"} delivered
+    to subscribers on the monitor thread.
+    """
+
+    def __init__(self, backend, process, game, account_name, lockfile_path, game_processes=(),
+                 ready_timeout=READY_TIMEOUT, game_timeout=GAME_TIMEOUT, poll_interval=POLL_INTERVAL):
+        self.backend = backend
+        self.process = process
+        self.game = game
+        self.account_name = account_name
+        self.lockfile_path = lockfile_path
+        self.game_processes = {name.lower() for name in game_processes}
+        self.ready_timeout = ready_timeout
+        self.game_timeout = game_timeout
+        self.poll_interval = poll_interval
+        self.started_at = time.time()
+        self._start_perf = time.perf_counter()
+        self.events = []
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._settled = threading.Event() # set once ready/failed subscribers have run, or on stop
+        self._thread = None
+        self._emit(LAUNCHED, pid=getattr(process, "pid", None))
+
+    def subscribe(self, callback):
+        """Calls callback(event) for every event, starting with the ones already emitted."""
+        with self._lock:
+            past = list(self.events)
+            self._subscribers.append(callback)
+        for event in past:
+            self._deliver(callback, event)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _deliver(self, callback, event):
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Launch monitor subscriber failed: {e}")
+
+    def _emit(self, name, **detail):
+        event = {
+            "event": name, "game": self.game, "account": self.account_name,
+            "elapsed_ms": round((time.perf_counter() - self._start_perf) * 1000, 1), "detail": detail,
+        }
+        with self._lock:
+            self.events.append(event)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            self._deliver(callback, event)
+
+    def last_event(self):
+        with self._lock:
+            return self.events[-1] if self.events else None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="LaunchMonitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops watching without emitting anything, e.g. when another switch replaces this launch."""
+        self._stop.set()
+        self._settled.set()
+
+    def wait_ready(self, timeout=None):
+        """Blocks until the client is ready or the launch failed, and every subscriber has seen it. Returns True if ready."""
+        self._settled.wait(timeout)
+        return self._ready.is_set()
+
+    def _lockfile_fresh(self):
+        try:
+            # Profiles carry the lockfile of the session they were saved from; only a newer one counts.
+            return os.path.getmtime(self.lockfile_path) >= self.started_at - 1
+        except OSError:
+            return False
+
+    def _running(self):
+        try:
+            return {name.lower() for _, name in self.backend.list_processes()}
+        except Exception as e:
+            print(f"Launch monitor could not read the process table: {e}")
+            return set()
+
+    def _run(self):
+        ready_names = {name.lower() for name in RIOT_CLIENT_READY_PROCESSES}
+        deadline = time.perf_counter() + self.ready_timeout
+        tick = 0
+        while not self._stop.is_set():
+            running = self._running() if tick % PROCESS_POLL_EVERY == 0 else None
+            tick += 1
+            if not self._ready.is_set():
+                if self._lockfile_fresh() or (running and running & ready_names):
+                    self._ready.set()
+                    self._emit(READY, source="lockfile" if self._lockfile_fresh() else "process")
+                    self._settled.set()
+                    deadline = time.perf_counter() + self.game_timeout
+                else:
+                    return_code = self.process.poll() if self.process is not None else None
+                    if return_code not in (None, 0):
+                        self._emit(FAILED, reason=f"Riot Client exited with code {return_code}.")
+                        self._settled.set()
+                        return
+                    if time.perf_counter() > deadline:
+                        self._emit(FAILED, reason=f"Riot Client was not ready after {self.ready_timeout}s.")
+                        self._settled.set()
+                        return
+            if self._ready.is_set() and running and running & self.game_processes:
+                self._emit(GAME_STARTED)
+                return
+            if self._ready.is_set() and time.perf_counter() > deadline:
+                return # Client is up but no game was started; nothing left to report.
+            self._stop.wait(self.poll_interval)
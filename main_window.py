@@ -0,0 +1,779 @@
+import sys
+import os
+import math
+import shutil 
+import subprocess 
+
+from PyQt5.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QScrollArea,
+    QGridLayout,
+    QDesktopWidget,
+    QMenu,
+    QAction,
+    QDialog,
+    QLineEdit,
+    QPushButton,
+)
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QFont, QColor
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
+
+from game_switcher import GameSwitcher
+from ui_components import (
+    CustomTitleBar,
+    AccountWidget,
+    HoverButton,
+    SettingsDialog,
+    LaunchNotificationWidget,
+    InstallerDialog, 
+    GameSelectionDialog
+)
+from actions_settings import SettingsActions
+from actions_context import ContextActions
+from asset_cache import asset_icon, game_icon
+from job_runner import JobRunner
+from switch_service import SwitchService
+from switch_coordinator import COALESCED
+from account_index import AccountIndex
+from account_order import AccountOrder, group_accounts
+from profile_watcher import ProfileWatcher, ADDED, REMOVED, RENAMED, ICON_CHANGED, GAME_CHANGED, META_CHANGED
+from quick_switch import QuickSwitchPalette, GlobalHotkey
+from instrumentation import span
+
+# What each row of the account grid holds, for sizing the window to it.
+HEADER_ROW = "header"
+ACCOUNT_ROW = "accounts"
+
+def create_shortcut(target_path, shortcut_path):
+    try:
+        import win32com.client
+        shell = win32com.client.Dispatch("WScript.Shell")
+        shortcut = shell.CreateShortCut(shortcut_path)
+        shortcut.Targetpath = target_path
+        shortcut.WorkingDirectory = os.path.dirname(target_path)
+        shortcut.IconLocation = target_path 
+        shortcut.save()
+        return True
+    except Exception as e:
+        print(f"Error creating shortcut {shortcut_path}: {e}")
+        return False
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+    print("Warning: Pillow not installed. Image conversion for icons will not work. Please install it with 'pip install Pillow'")
+
+def generate_icon(name, path=None):
+    """Generates a QIcon from a path or creates a default one with the account's first letter."""
+    with span("icon_decode", account=name):
+        return _generate_icon(name, path)
+
+def _generate_icon(name, path):
+    if path and os.path.exists(path):
+        try:
+            if Image:
+                pil_image = Image.open(path)
+                pil_image = pil_image.convert("RGBA")
+                from io import BytesIO
+                byte_array = BytesIO()
+                pil_image.save(byte_array, format="PNG")
+                byte_array.seek(0)
+                
+                pixmap = QPixmap()
+                pixmap.loadFromData(byte_array.getvalue(), "PNG")
+                return QIcon(pixmap)
+            else:
+                return QIcon(path)
+        except Exception as e:
+            print(f"Error loading icon from {path}: {e}. Using default icon.")
+    
+    pixmap = QPixmap(128, 128)
+    pixmap.fill(QColor("#c89f68"))
+    p = QPainter(pixmap)
+    p.setPen(QColor("#2c2a2b"))
+    p.setFont(QFont("Segoe UI", 56, QFont.Bold))
+    p.drawText(pixmap.rect(), Qt.AlignCenter, name[0].upper())
+    p.end()
+    return QIcon(pixmap)
+
+_app = None # kept here so the QApplication outlives the function that created it
+
+def _create_app():
+    global _app
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
+def run_installer():
+    _create_app()
+    dialog = InstallerDialog()
+    if dialog.exec_() == QDialog.Accepted:
+        install_path = dialog.get_install_path()
+        current_exe = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(sys.argv[0])
+        
+        try:
+            os.makedirs(install_path, exist_ok=True)
+            
+            destination_exe_path = os.path.join(install_path, "iMA Switcher.exe")
+            shutil.copy2(current_exe, destination_exe_path)
+
+            riot_games_exe_path = dialog.get_riot_games_path()
+            switcher_instance = GameSwitcher(base_directory=install_path) 
+            if riot_games_exe_path:
+                switcher_instance.set_riot_client_paths(riot_games_exe_path)
+
+            if dialog.should_add_desktop_shortcut():
+                desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
+                shortcut_path = os.path.join(desktop_path, "iMA Switcher.lnk")
+                create_shortcut(destination_exe_path, shortcut_path)
+
+            if dialog.should_add_start_menu_shortcut():
+                start_menu_path = os.path.join(os.getenv("APPDATA"), "Microsoft", "Windows", "Start Menu", "Programs")
+                shortcut_path = os.path.join(start_menu_path, "iMA Switcher.lnk")
+                create_shortcut(destination_exe_path, shortcut_path)
+            
+            subprocess.Popen([destination_exe_path])
+            sys.exit(0)
+            
+        except Exception as e:
+            QMessageBox.critical(
+                None, 
+                "Installation Error",
+                f"An error occurred during installation:\n{e}"
+            )
+            sys.exit(1)
+    else:
+        sys.exit(0) 
+
+
+class ModernValorantSwitcher(QMainWindow):
+    remote_switch_done = pyqtSignal(str, object)
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        self.switcher = GameSwitcher()
+        self.switcher._ensure_initialized() 
+        if not self.switcher.is_admin():
+            QMessageBox.critical(
+                self,
+                "Administrator Rights Required",
+                "This application requires administrator privileges for fast account switching.\n\nPlease restart as administrator.",
+            )
+
+        self.jobs = JobRunner(self)
+        self.jobs.job_started.connect(self.update_cancel_button)
+        self.jobs.job_ended.connect(self.update_cancel_button)
+        self.jobs.job_cancelled.connect(self.on_job_cancelled)
+        self.settings_handler = SettingsActions(self)
+        self.context_handler = ContextActions(self)
+
+        with span("ui_build"):
+            self.account_widgets = {}
+            self.accounts = {}
+            self.selected_account_name = None
+            self.account_index = AccountIndex()
+            self.account_order = AccountOrder()
+            self.account_groups = {} # name -> group or None
+            self.group_headers = []
+            self.grid_rows = [] # HEADER_ROW / ACCOUNT_ROW for each row rearrange_grid laid out
+            self.search_matches = None # {name: score} while a search is typed, else None
+            self.quick_switch = None
+            self.init_ui()
+            self.load_accounts()
+            self.center_on_screen()
+
+        self.service = None
+        if self.switcher.get_ima_config().get("background_service", True):
+            # Serves --switch shortcuts and iMA Menu clicks from this warm process.
+            self.remote_switch_done.connect(self.on_remote_switch_done)
+            self.service = SwitchService(self.switcher, on_switched=self.remote_switch_done.emit)
+            if not self.service.start(): self.service = None
+
+        self.watcher = None
+        if self.switcher.get_ima_config().get("watch_profiles", True):
+            # Picks up restores, other processes and edits made in Explorer without a full reload.
+            self.watcher = ProfileWatcher(self.switcher, self)
+            self.watcher.changed.connect(self.apply_profile_changes)
+            self.watcher.config_changed.connect(self.on_config_changed)
+            self.watcher.start()
+        self.switcher.start_trash_reaper() # deletes trashed folders, also those --switch runs left behind
+        self.switcher.schedule_prefetch() # warms the likely next accounts once startup has settled
+        self.switcher.schedule_compaction() # packs rarely used profiles into cold storage in the background
+
+        self.hotkey = None
+        hotkey = self.switcher.get_ima_config().get("quick_switch_hotkey")
+        if hotkey:
+            # Resident palette, built and ranked now so the hotkey only has to show it.
+            self.hotkey = GlobalHotkey(hotkey, self)
+            if self.hotkey.start():
+                self.quick_switch = QuickSwitchPalette(self.account_index, self._account_icon)
+                self.quick_switch.switch_requested.connect(self.on_quick_switch)
+                self.hotkey.activated.connect(self.quick_switch.toggle)
+                self.refresh_quick_switch()
+            else:
+                self.hotkey = None
+
+    def init_ui(self):
+        self.setWindowTitle("iMA Switcher")
+        self.setWindowIcon(generate_icon("V"))
+        self.setStyleSheet(
+            """#main_widget { background-color: #2c2a2b; border-radius: 15px; border: 1px solid #4f4a4b; } 
+               QScrollArea { border: none; background-color: transparent; } 
+               QWidget#grid_container { background-color: transparent; } 
+               QMenu { background-color: #3a3637; color: #e0d6d1; border: 1px solid #4f4a4b; border-radius: 8px; } 
+               QMenu::item { padding: 8px 20px; border-radius: 5px; } 
+               QMenu::item:selected { background-color: #c89f68; color: #2c2a2b; }"""
+        )
+
+        self.main_widget = QWidget(objectName="main_widget")
+        self.setCentralWidget(self.main_widget)
+
+        main_layout = QVBoxLayout(self.main_widget)
+        main_layout.setContentsMargins(1, 1, 1, 1)
+        main_layout.setSpacing(0)
+        
+        self.title_bar = CustomTitleBar("iMA Switcher", self)
+        main_layout.addWidget(self.title_bar)
+        
+        content_layout = QVBoxLayout()
+        content_layout.setContentsMargins(10, 10, 10, 10)
+        main_layout.addLayout(content_layout)
+
+        self.search_box = QLineEdit(placeholderText="Search accounts, games or tags...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet(
+            "QLineEdit { background-color: #3a3637; color: #e0d6d1; border: 1px solid #4f4a4b; border-radius: 8px; padding: 6px 10px; font-size: 13px; } "
+            "QLineEdit:focus { border-color: #c89f68; }"
+        )
+        self.search_box.textChanged.connect(self.on_search_changed)
+        self.search_box.returnPressed.connect(self.switch_to_top_hit)
+        content_layout.addWidget(self.search_box)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        content_layout.addWidget(self.scroll_area)
+
+        bottom_layout = QGridLayout()
+        content_layout.addLayout(bottom_layout)
+
+        self.status_label = QLabel(
+            "Ready", styleSheet="color: #e0d6d1; font-size: 12px; padding-top: 5px;"
+        )
+        # Shown while a cancellable job (switch, backup, restore) runs.
+        self.cancel_job_button = QPushButton("Cancel")
+        self.cancel_job_button.setStyleSheet(
+            "QPushButton { background-color: #4f4a4b; color: #e0d6d1; border-radius: 8px; padding: 3px 10px; font-size: 12px; } "
+            "QPushButton:hover { background-color: #c89f68; color: #2c2a2b; }"
+        )
+        self.cancel_job_button.clicked.connect(self.cancel_running_job)
+        self.cancel_job_button.hide()
+        status_layout = QHBoxLayout()
+        status_layout.setSpacing(8)
+        status_layout.addWidget(self.status_label)
+        status_layout.addWidget(self.cancel_job_button)
+        bottom_layout.addLayout(status_layout, 0, 0, Qt.AlignLeft)
+
+        self.add_account_button = HoverButton()
+        self.add_account_button.setIcon(self.create_add_icon(QColor("#e0d6d1"), QColor("#c89f68")))
+        self.add_account_button.clicked.connect(self.settings_handler.add_account)
+        self.add_account_button.setFixedSize(40, 40)
+        self.add_account_button.setIconSize(QSize(24, 24))
+        self.add_account_button.setStyleSheet(
+            "QPushButton {background-color: #4f4a4b; border-radius: 20px;} QPushButton:hover { background-color: #d9b68b; }"
+        )
+        bottom_layout.addWidget(self.add_account_button, 0, 1, Qt.AlignCenter)
+
+        self.settings_button = HoverButton()
+        self.settings_button.setIcon(self.create_gear_icon(QColor("#e0d6d1")))
+        self.settings_button.clicked.connect(self.show_settings_dialog)
+        self.settings_button.setFixedSize(40, 40)
+        self.settings_button.setIconSize(QSize(24, 24))
+        self.settings_button.setStyleSheet(
+            "QPushButton {background-color: #4f4a4b; border-radius: 20px;} QPushButton:hover { background-color: #c89f68; }"
+        )
+        bottom_layout.addWidget(self.settings_button, 0, 2, Qt.AlignRight)
+
+        bottom_layout.setColumnStretch(0, 1)
+        bottom_layout.setColumnStretch(1, 0)
+        bottom_layout.setColumnStretch(2, 1)
+        
+
+    def setup_grid_container(self):
+        if hasattr(self, "grid_container") and self.grid_container:
+            self.grid_container.deleteLater()
+        self.grid_container = QWidget(objectName="grid_container")
+        
+        self.grid_layout = QGridLayout(self.grid_container)
+        self.grid_layout.setContentsMargins(10, 10, 10, 10)
+        self.grid_layout.setSpacing(10)
+
+        self.grid_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.scroll_area.setWidget(self.grid_container)
+
+    def load_accounts(self):
+        with span("grid_build"):
+            previously_selected = self.selected_account_name
+            self.setup_grid_container()
+            self.account_widgets.clear()
+            self.group_headers = [] # went with the old grid container
+            accounts = self.switcher.get_saved_accounts()
+            self.accounts = accounts
+            metas = {name: self.switcher.get_account_meta(name) for name in accounts}
+            self.account_groups = {name: self.switcher.get_account_group(name, meta) for name, meta in metas.items()}
+            self.account_index.rebuild({name: (game, self.switcher.get_account_tags(name, metas[name])) for name, (_, game) in accounts.items()})
+            if self.search_matches is not None:
+                self.search_matches = self.account_index.match(self.search_box.text())
+
+            self.account_order = self.switcher.get_account_order()
+            account_names_in_order = self.account_order.ordered(accounts)
+
+            show_game_icons = self.switcher.get_ima_config().get("ui_settings", {}).get("show_game_icons", True)
+
+            for name in account_names_in_order:
+                icon_path, game = accounts[name]
+                self.account_widgets[name] = self._create_account_widget(name, icon_path, game, show_game_icons)
+
+            self.rearrange_grid()
+
+            if previously_selected and previously_selected in self.account_widgets:
+                self.on_account_selected(previously_selected)
+            elif accounts:
+                first_account_name = next(iter(account_names_in_order), None)
+                if first_account_name:
+                    self.on_account_selected(first_account_name)
+            else:
+                self.selected_account_name = None
+                self.status_label.setText("No accounts found.")
+            self.refresh_quick_switch()
+
+    def refresh_accounts(self, *names):
+        """Brings the grid up to date after a change to profiles/ (to names, if given): incrementally if the watcher runs."""
+        if self.watcher is None:
+            self.load_accounts()
+            return
+        self.watcher.sync(accounts=names)
+
+    def _account_icon(self, name):
+        return generate_icon(name, self.accounts.get(name, (None, None))[0])
+
+    def refresh_quick_switch(self):
+        """Re-ranks the quick switch palette by usage; called when accounts change or a switch finishes."""
+        if self.quick_switch is not None:
+            self.quick_switch.set_ranking(self.switcher.usage.ranked(list(self.accounts)))
+
+    def on_quick_switch(self, name, intent):
+        if name not in self.account_widgets: return
+        self.on_account_selected(name)
+        self.switch_to_selected_account(intent=intent)
+
+    def _create_account_widget(self, name, icon_path, game, show_game_icon):
+        widget = AccountWidget(name, generate_icon(name, icon_path), game, self.grid_container)
+        widget.selected.connect(self.on_account_selected)
+        widget.double_clicked.connect(self.on_account_double_clicked)
+        widget.context_menu_requested.connect(self.show_context_menu)
+        widget.dropped.connect(self.on_account_dropped)
+        widget.set_show_game_icon(show_game_icon)
+        return widget
+
+    def on_account_dropped(self, name, target, after):
+        """Drag and drop in the grid: move name next to target, into target's group."""
+        if name not in self.account_widgets or target not in self.account_widgets: return
+        with span("account_move", account=name):
+            self.account_order = self.switcher.move_account(name, **({"after": target} if after else {"before": target}))
+            group = self.account_groups.get(target)
+            if self.account_groups.get(name) != group:
+                self.switcher.set_account_group(name, group)
+                self.account_groups[name] = group
+            self.rearrange_grid()
+
+    def apply_profile_changes(self, events):
+        with span("grid_update", events=len(events)):
+            show_game_icons = self.switcher.get_ima_config().get("ui_settings", {}).get("show_game_icons", True)
+            layout_changed = False
+            for change in events:
+                event, name = change["event"], change["account"]
+                if event in (ADDED, RENAMED, META_CHANGED):
+                    meta = self.switcher.get_account_meta(name)
+                    if event == RENAMED: self.account_groups.pop(change["old_name"], None)
+                    group = self.switcher.get_account_group(name, meta)
+                    layout_changed = layout_changed or self.account_groups.get(name) != group
+                    self.account_groups[name] = group
+                    self.account_index.add(name, change["game"], self.switcher.get_account_tags(name, meta))
+                if event in (REMOVED, RENAMED):
+                    self.account_index.remove(change["old_name"] if event == RENAMED else name)
+                if event == REMOVED:
+                    self.account_groups.pop(name, None)
+                if self.quick_switch is not None and event in (REMOVED, RENAMED, ICON_CHANGED):
+                    self.quick_switch.forget_icon(change["old_name"] if event == RENAMED else name)
+
+                if event == ADDED and name not in self.account_widgets:
+                    self.account_widgets[name] = self._create_account_widget(name, change["icon_path"], change["game"], show_game_icons)
+                    self.accounts[name] = (change["icon_path"], change["game"])
+                    layout_changed = True
+                elif event == REMOVED and name in self.account_widgets:
+                    widget = self.account_widgets.pop(name)
+                    self.grid_layout.removeWidget(widget)
+                    widget.deleteLater()
+                    self.accounts.pop(name, None)
+                    if self.selected_account_name == name: self.selected_account_name = None
+                    layout_changed = True
+                elif event == RENAMED and change["old_name"] in self.account_widgets and name not in self.account_widgets:
+                    widget = self.account_widgets.pop(change["old_name"])
+                    widget.set_account_name(name)
+                    self.account_widgets[name] = widget
+                    self.accounts[name] = self.accounts.pop(change["old_name"], (change["icon_path"], change["game"]))
+                    if self.selected_account_name == change["old_name"]: self.selected_account_name = name
+                    self.account_order.rename(change["old_name"], name)
+                    layout_changed = True
+                elif event == ICON_CHANGED and name in self.account_widgets:
+                    self.account_widgets[name].set_icon(generate_icon(name, change["icon_path"]), 70)
+                    self.accounts[name] = (change["icon_path"], self.accounts.get(name, (None, change["game"]))[1])
+                elif event == GAME_CHANGED and name in self.account_widgets:
+                    self.account_widgets[name].set_game(change["game"])
+                    self.accounts[name] = (self.accounts.get(name, (None, None))[0], change["game"])
+
+            if self.search_matches is not None:
+                self.search_matches = self.account_index.match(self.search_box.text())
+                layout_changed = True
+            if layout_changed:
+                self.rearrange_grid()
+            if self.selected_account_name is None and self.account_widgets:
+                self.on_account_selected(next(iter(self.account_widgets)))
+            elif not self.account_widgets:
+                self.status_label.setText("No accounts found.")
+            if any(change["event"] in (ADDED, REMOVED, RENAMED) for change in events):
+                self.refresh_quick_switch()
+
+    def on_config_changed(self):
+        show_game_icons = self.switcher.get_ima_config().get("ui_settings", {}).get("show_game_icons", True)
+        for widget in self.account_widgets.values():
+            widget.set_show_game_icon(show_game_icons)
+        self.account_order = self.switcher.get_account_order()
+        self.rearrange_grid()
+
+    def on_search_changed(self, text):
+        with span("account_search"):
+            self.search_matches = self.account_index.match(text) if text.strip() else None
+        self.rearrange_grid()
+        if self.search_matches is not None:
+            self.status_label.setText(f"{len(self.search_matches)} match(es)." if self.search_matches else "No matching accounts.")
+
+    def switch_to_top_hit(self):
+        text = self.search_box.text()
+        name = self.account_index.top_hit(text) if text.strip() else self.selected_account_name
+        if name is None or name not in self.account_widgets: return
+        self.on_account_selected(name)
+        self.switch_to_selected_account()
+
+    def rearrange_grid(self):
+        for header in self.group_headers:
+            self.grid_layout.removeWidget(header)
+            header.deleteLater()
+        self.group_headers = []
+        self.grid_rows = []
+        if not self.account_widgets:
+            self.update_window_size()
+            return
+        num_columns = 4
+        for widget in self.account_widgets.values():
+            self.grid_layout.removeWidget(widget)
+
+        matches = self.search_matches
+        row = 0
+        for group, names in group_accounts(self.account_order.ordered(self.account_widgets), self.account_groups):
+            visible_names = []
+            for name in names:
+                widget = self.account_widgets[name]
+                visible = matches is None or name in matches
+                if widget.isVisibleTo(self.grid_container) != visible: widget.setVisible(visible)
+                if visible: visible_names.append(name)
+            if not visible_names: continue
+            if group is not None:
+                header = QLabel(group, self.grid_container, styleSheet="color: #c89f68; font-size: 13px; font-weight: bold; padding-top: 4px;")
+                self.grid_layout.addWidget(header, row, 0, 1, num_columns)
+                self.group_headers.append(header)
+                self.grid_rows.append(HEADER_ROW)
+                row += 1
+            for i, name in enumerate(visible_names):
+                self.grid_layout.addWidget(self.account_widgets[name], row + i // num_columns, i % num_columns)
+            account_rows = math.ceil(len(visible_names) / num_columns)
+            self.grid_rows.extend([ACCOUNT_ROW] * account_rows)
+            row += account_rows
+        self.update_window_size()
+
+    def update_window_size(self):
+        COLS, W_W, W_H, HEADER_H, S, H_M, V_M, T_B, B_B = 4, 120, 140, 26, 10, 20, 20, 40, 60
+        if not self.account_widgets: self.setFixedSize(300, 200); return
+        # Sized to the rows rearrange_grid laid out (group headers included, filtered accounts not),
+        # up to the fourth row of accounts; anything below scrolls.
+        display_rows = []
+        for kind in self.grid_rows or [ACCOUNT_ROW]:
+            display_rows.append(kind)
+            if display_rows.count(ACCOUNT_ROW) == 4: break
+        grid_width = (COLS * W_W) + ((COLS - 1) * S) + H_M
+        grid_height = sum(W_H if kind == ACCOUNT_ROW else HEADER_H for kind in display_rows) + ((len(display_rows) - 1) * S) + V_M
+        self.setFixedSize(grid_width + 20, grid_height + T_B + B_B)
+
+    def show_settings_dialog(self):
+        actions = self.get_settings_actions()
+        dialog = SettingsDialog(actions, self)
+        dialog.exec_()
+
+    def get_settings_actions(self):
+        return {
+            "Add Account": (self.settings_handler.add_account, "Add.png"),
+            "Save Current Account": (self.settings_handler.save_current_account, "Save.png"),
+            "Backup": (self.settings_handler.backup_profiles, "Backup.png"),
+            "Restore": (self.settings_handler.restore_profiles, "Restore.png"),
+            "Open Profiles Folder": (self.settings_handler.open_profiles_folder, "Open.png"),
+            "Switch Stats": (self.settings_handler.show_switch_stats, "Switch.png"),
+            "Export to iMA Menu": (self.settings_handler.export_ima_menu, "ima.png"),
+            "Options": (self.settings_handler.open_options_dialog, "Options.png"),
+        }
+
+    def center_on_screen(self):
+        self.move(QDesktopWidget().availableGeometry().center() - self.frameGeometry().center())
+    
+    def create_gear_icon(self, color):
+        from PyQt5.QtCore import QRectF
+        from PyQt5.QtGui import QPainterPath
+        pixmap = QPixmap(64, 64); pixmap.fill(Qt.transparent)
+        p = QPainter(pixmap); p.setRenderHint(QPainter.Antialiasing); p.setPen(Qt.NoPen); p.setBrush(color)
+        p.translate(32, 32)
+        for _ in range(8): p.drawRect(QRectF(-3, -28, 6, 12)); p.rotate(45)
+        path = QPainterPath(); path.addEllipse(QRectF(-16, -16, 32, 32)); path.addEllipse(QRectF(-10, -10, 20, 20))
+        path.setFillRule(Qt.OddEvenFill); p.drawPath(path); p.end()
+        return QIcon(pixmap)
+
+    def create_add_icon(self, plus_color, bg_color):
+        pixmap = QPixmap(64, 64); pixmap.fill(Qt.transparent)
+        p = QPainter(pixmap); p.setRenderHint(QPainter.Antialiasing); p.setPen(Qt.NoPen); p.setBrush(bg_color)
+        p.drawEllipse(0, 0, 64, 64)
+        p.setBrush(plus_color)
+        p.drawRect(18, 28, 28, 8)
+        p.drawRect(28, 18, 8, 28)
+        p.end()
+        return QIcon(pixmap)
+
+    def on_account_selected(self, name):
+        self.selected_account_name = name
+        for n, w in self.account_widgets.items(): w.set_selected(n == name)
+        self.status_label.setText(f"Selected '{name}'.")
+
+    def on_account_double_clicked(self, name):
+        self.on_account_selected(name)
+        self.switch_to_selected_account()
+
+    def show_context_menu(self, name, pos):
+        self.on_account_selected(name)
+        menu = QMenu(self)
+        actions = {
+            "Switch Account": (self.switch_to_selected_account, "Switch.png"),
+            "Rename": (self.context_handler.rename, "Rename.png"),
+            "Change Icon": (self.context_handler.change_icon, "Change.png"),
+        }
+
+        if name in self.accounts and self.accounts[name][0]:
+            actions["Remove Icon"] = (self.context_handler.remove_icon, "Remove.png")
+
+        actions["Create Desktop Shortcut"] = (self.context_handler.create_shortcut, "Create.png")
+        
+        change_game_menu = QMenu("Change Game", self)
+        change_game_menu.setIcon(game_icon("both") or QIcon())
+        for label, game in (("Valorant", "valorant"), ("League of Legends", "lol"), ("Both", "both")):
+            action = QAction(label, self, triggered=lambda _, g=game: self.context_handler.change_game(g))
+            icon = game_icon(game)
+            if icon: action.setIcon(icon)
+            change_game_menu.addAction(action)
+
+        menu.addMenu(change_game_menu)
+
+        group_menu = QMenu("Group", self)
+        current_group = self.account_groups.get(name)
+        for label, group in [("No Group", None)] + [(g, g) for g in sorted({g for g in self.account_groups.values() if g})]:
+            action = QAction(label, self, checkable=True, triggered=lambda _, g=group: self.context_handler.set_group(g))
+            action.setChecked(group == current_group)
+            group_menu.addAction(action)
+        group_menu.addSeparator()
+        group_menu.addAction(QAction("New Group...", self, triggered=self.context_handler.new_group))
+        menu.addMenu(group_menu)
+        menu.addAction(QAction("Edit Tags...", self, triggered=self.context_handler.edit_tags))
+
+        presets = self.switcher.get_presets()
+        if presets:
+            preset_menu = QMenu("Settings Preset", self)
+            current_preset = self.switcher.get_account_preset(name)
+            for label, preset_id in [("Global", None)] + [(p["name"], pid) for pid, p in presets.items()]:
+                action = QAction(label, self, checkable=True, triggered=lambda _, p=preset_id: self.context_handler.assign_preset(p))
+                action.setChecked(preset_id == current_preset)
+                preset_menu.addAction(action)
+            menu.addMenu(preset_menu)
+        menu.addSeparator()
+        actions["Delete Account"] = (self.context_handler.delete, "Delete.png")
+
+        for text, data in actions.items():
+            if text:
+                func, icon_name = data
+                icon = asset_icon(icon_name)
+                if icon:
+                    menu.addAction(QAction(icon, text, self, triggered=func))
+                else:
+                    menu.addAction(QAction(text, self, triggered=func))
+        menu.exec_(pos)
+
+    def get_selected_account_name(self):
+        if self.selected_account_name: return self.selected_account_name
+        QMessageBox.warning(self, "No Account Selected", "Please click on an account to select it first.")
+        return None
+
+    def switch_to_selected_account(self, selected_game=None, intent=None):
+        name = self.get_selected_account_name()
+        if not name: return
+
+        # Get account data to pass to GameSelectionDialog if needed
+        account_data = self.accounts.get(name)
+        account_icon_path = account_data[0] if account_data else None
+        account_icon_pixmap = QPixmap() # Default empty pixmap
+        if account_icon_path and os.path.exists(account_icon_path):
+            account_icon = generate_icon(name, account_icon_path)
+            account_icon_pixmap = account_icon.pixmap(account_icon.actualSize(QSize(180, 180)))
+        else:
+            # Generate a default icon if no custom icon is set
+            default_icon = generate_icon(name)
+            account_icon_pixmap = default_icon.pixmap(default_icon.actualSize(QSize(180, 180)))
+
+        self.status_label.setText(f"Switching to '{name}'...")
+        job = self.jobs.submit(
+            "switch",
+            lambda job: self.switcher.switch_account(name, selected_game=selected_game, progress=job.report_progress, cancel_event=job.cancel_event, intent=intent),
+            on_finished=lambda result: self._on_switch_finished(name, account_icon_pixmap, result),
+            on_failed=lambda error: self._on_switch_failed(name, error),
+            on_progress=self.on_job_progress,
+            share_with_same_name=True, # a newer switch replaces a running one instead of being refused
+            cancellable=True,
+        )
+        if job is None:
+            self.status_label.setText("Another operation is still running. Please wait.")
+
+    def _on_switch_finished(self, name, account_icon_pixmap, result):
+        result, message, game_type_or_selected_game = result
+
+        if game_type_or_selected_game == COALESCED:
+            return # a newer request took over; it reports for itself
+        if game_type_or_selected_game == "both":
+            # If game is 'both', show selection dialog
+            self.launch_notification = LaunchNotificationWidget(name, account_icon_pixmap, standalone=False) # Show temporary notification
+            self.launch_notification.show()
+
+            selection_dialog = GameSelectionDialog(name, account_icon_pixmap, self)
+            selection_dialog.game_selected.connect(lambda game: self._handle_game_selection(name, game))
+            selection_dialog.finished.connect(self.launch_notification.close) # Close notification when dialog is done
+            selection_dialog.exec_()
+
+        elif not result:
+            self._on_switch_failed(name, message)
+        else:
+            # If a game was directly launched (not 'both'), show the 6-second notification
+            self.status_label.setText(f"Switched to '{name}'.")
+            self.refresh_quick_switch()
+            try:
+                self.launch_notification = LaunchNotificationWidget(name, account_icon_pixmap, monitor=self.switcher.last_launch)
+                self.launch_notification.show()
+            except Exception as e: print(f"Could not create notification: {e}")
+
+    def _on_switch_failed(self, name, message):
+        self.status_label.setText(f"Failed to switch to '{name}'.")
+        QMessageBox.critical(self, "Switch Failed", message)
+        if hasattr(self, "launch_notification"): self.launch_notification.close()
+
+    def on_job_progress(self, percent, message):
+        if message: self.status_label.setText(message)
+
+    def update_cancel_button(self, *_):
+        self.cancel_job_button.setVisible(self.jobs.running() is not None)
+
+    def cancel_running_job(self):
+        job = self.jobs.cancel_running()
+        if job is not None:
+            self.status_label.setText(f"Cancelling {job.name}...")
+        self.update_cancel_button()
+
+    def on_job_cancelled(self, name):
+        self.status_label.setText(f"{name.capitalize()} cancelled.")
+
+    def _handle_game_selection(self, account_name, game):
+        # This method is called when a game is selected from the GameSelectionDialog
+        self.status_label.setText(f"Launching {game.capitalize()} for '{account_name}'...")
+        self.jobs.submit(
+            "switch",
+            lambda job: self.switcher.switch_account(account_name, selected_game=game, progress=job.report_progress, cancel_event=job.cancel_event),
+            on_finished=lambda result: self._on_game_selection_finished(account_name, game, result),
+            on_failed=lambda error: self._on_game_selection_finished(account_name, game, (False, error, None)),
+            on_progress=self.on_job_progress,
+            share_with_same_name=True,
+            cancellable=True,
+        )
+
+    def _on_game_selection_finished(self, account_name, game, result):
+        result, message, launched = result
+        if launched == COALESCED:
+            return
+        if not result:
+            self.status_label.setText(f"Failed to launch {game.capitalize()} for '{account_name}'.")
+            QMessageBox.critical(self, "Launch Failed", message)
+        else:
+            self.status_label.setText(f"Successfully launched {game.capitalize()} for '{account_name}'.")
+            self.refresh_quick_switch()
+
+    def on_remote_switch_done(self, name, result):
+        self.status_label.setText(f"Switched to '{name}'.")
+        self.refresh_quick_switch()
+        icon_path = self.accounts.get(name, (None, None))[0]
+        icon = generate_icon(name, icon_path)
+        self.launch_notification = LaunchNotificationWidget(name, icon.pixmap(icon.actualSize(QSize(180, 180))), monitor=self.switcher.last_launch)
+        self.launch_notification.show()
+
+    def closeEvent(self, event):
+        if self.service: self.service.stop()
+        if self.watcher: self.watcher.stop()
+        if self.hotkey: self.hotkey.stop()
+        if self.quick_switch: self.quick_switch.close()
+        self.jobs.cancel_all()
+        self.jobs.wait_for_done(10000)
+        super().closeEvent(event)
+
+
+def run_gui():
+    app = _create_app()
+    ex = ModernValorantSwitcher()
+    ex.show()
+    return app.exec_()
+
+def select_game(account_name, icon_path):
+    """Shows the game selection dialog for a 'both' account. Returns the chosen game or None."""
+    _create_app()
+    icon = generate_icon(account_name, icon_path)
+    selection_dialog = GameSelectionDialog(account_name, icon.pixmap(icon.actualSize(QSize(180, 180))))
+    if selection_dialog.exec_() == QDialog.Accepted:
+        return selection_dialog.game_selected_value
+    return None
+
+def show_launch_notification(account_name, icon_path, monitor=None):
+    app = _create_app()
+    icon = generate_icon(account_name, icon_path)
+    notification = LaunchNotificationWidget(account_name, icon.pixmap(icon.actualSize(QSize(180, 180))), standalone=True, monitor=monitor)
+    notification.show()
+    return app.exec_()
@@ -0,0 +1,341 @@
+import os
+import sys
+import csv
+import time
+import signal
+import threading
+import subprocess
+
+PLATFORM_ENV = "IMA_SWITCHER_PLATFORM"
+
+
+class PlatformBackend:
+    """
+    Everything GameSwitcher needs from the OS: privilege check, process table, links,
+    client launch and path discovery. Pick one with get_backend().
+    """
+    name = "base"
+
+    def is_admin(self):
+        raise NotImplementedError
+
+    def list_processes(self):
+        """Returns a list of (pid, executable name) tuples."""
+        raise NotImplementedError
+
+    def kill_processes(self, names):
+        """Force-kills every process whose executable name is in names. Returns the pids that were signalled."""
+        raise NotImplementedError
+
+    def wait_for_exit(self, pids, timeout):
+        """Blocks until every pid has exited or timeout seconds pass. Returns the pids still running."""
+        raise NotImplementedError
+
+    def create_link(self, source, link_name):
+        raise NotImplementedError
+
+    def launch(self, command):
+        raise NotImplementedError
+
+    def local_app_data(self):
+        raise NotImplementedError
+
+    def riot_client_candidates(self):
+        """Likely RiotClientServices.exe locations, most likely first."""
+        return []
+
+    def open_path(self, path):
+        raise NotImplementedError
+
+    def lower_thread_priority(self):
+        """Drops the calling thread to background CPU/IO priority. Best effort."""
+
+    def readahead(self, path, buffer):
+        """
+        Pulls a file into the OS page cache so the next reader finds it warm. This default reads it through
+        buffer (a reusable bytearray) and throws the data away. Returns the number of bytes warmed.
+        """
+        total = 0
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    return total
+                total += read
+
+
+class WindowsBackend(PlatformBackend):
+    name = "windows"
+
+    def _hidden_startupinfo(self):
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return startupinfo
+
+    def is_admin(self):
+        try:
+            import ctypes
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return False
+
+    def list_processes(self):
+        result = subprocess.run(["tasklist", "/fo", "csv", "/nh"], capture_output=True, text=True,
+                                startupinfo=self._hidden_startupinfo(), check=False)
+        processes = []
+        for row in csv.reader(result.stdout.splitlines()):
+            if len(row) >= 2 and row[1].isdigit():
+                processes.append((int(row[1]), row[0]))
+        return processes
+
+    def kill_processes(self, names):
+        if not names: return []
+        wanted = {n.lower() for n in names}
+        pids = [pid for pid, exe in self.list_processes() if exe.lower() in wanted]
+        if pids:
+            # One taskkill for all targets instead of one shell per executable name.
+            command = ["taskkill", "/f"]
+            for pid in pids: command += ["/pid", str(pid)]
+            subprocess.run(command, capture_output=True, startupinfo=self._hidden_startupinfo(), check=False)
+        return pids
+
+    def wait_for_exit(self, pids, timeout):
+        import ctypes
+        SYNCHRONIZE, WAIT_TIMEOUT = 0x00100000, 0x00000102
+        kernel32 = ctypes.windll.kernel32
+        deadline = time.monotonic() + timeout
+        remaining = []
+        for pid in pids:
+            handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+            if not handle:
+                continue # already gone
+            try:
+                wait_ms = max(0, int((deadline - time.monotonic()) * 1000))
+                if kernel32.WaitForSingleObject(handle, wait_ms) == WAIT_TIMEOUT:
+                    remaining.append(pid)
+            finally:
+                kernel32.CloseHandle(handle)
+        return remaining
+
+    def create_link(self, source, link_name):
+        try:
+            import _winapi
+            _winapi.CreateJunction(source, link_name)
+        except (ImportError, AttributeError):
+            subprocess.run(['cmd', '/c', 'mklink', '/J', link_name, source], check=True, startupinfo=self._hidden_startupinfo())
+
+    def launch(self, command):
+        return subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP, close_fds=True)
+
+    def local_app_data(self):
+        return os.getenv('LOCALAPPDATA') or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+
+    def riot_client_candidates(self):
+        candidates = [os.path.join("C:", os.sep, "Riot Games", "Riot Client", "RiotClientServices.exe")]
+        for env_name in ('PROGRAMFILES', 'PROGRAMFILES(X86)'):
+            program_files = os.getenv(env_name)
+            if program_files:
+                candidates.append(os.path.join(program_files, "Riot Games", "Riot Client", "RiotClientServices.exe"))
+        return candidates
+
+    def open_path(self, path):
+        os.startfile(path)
+
+    def lower_thread_priority(self):
+        try:
+            import ctypes
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000 # lowers CPU, disk and memory priority
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        except Exception:
+            pass
+
+
+def _exe_name(path):
+    """The file name of an executable path, also for Wine's Windows paths (C:\\...\\RiotClientServices.exe)."""
+    return path.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+class PosixBackend(PlatformBackend):
+    """Runs the switcher against a Wine prefix or a test tree. Symlinks need no elevation here."""
+    name = "posix"
+
+    def is_admin(self):
+        return True
+
+    def list_processes(self):
+        if os.path.isdir("/proc"):
+            return self._list_proc()
+        # Without /proc (macOS, BSD) ps reports the full executable path, which is not truncated there.
+        result = subprocess.run(["ps", "-A", "-o", "pid=,comm="], capture_output=True, text=True, check=False)
+        processes = []
+        for line in result.stdout.splitlines():
+            pid, _, exe = line.strip().partition(" ")
+            if pid.isdigit():
+                processes.append((int(pid), _exe_name(exe.strip())))
+        return processes
+
+    def _list_proc(self):
+        # ps's comm is cut to 15 characters on Linux ("RiotClientServi"), so argv[0] is read instead.
+        processes = []
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit(): continue
+            try:
+                with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                    argv0 = f.read().split(b"\0", 1)[0].decode('utf-8', 'replace')
+            except OSError:
+                continue # exited, or not ours to read
+            if argv0:
+                processes.append((int(pid), _exe_name(argv0)))
+        return processes
+
+    def kill_processes(self, names):
+        if not names: return []
+        wanted = {n.lower() for n in names}
+        pids = []
+        for pid, exe in self.list_processes():
+            if exe.lower() in wanted:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                    pids.append(pid)
+                except OSError:
+                    pass
+        return pids
+
+    def _alive(self, pid):
+        try:
+            # Reap our own children (e.g. a client the service launched), or they linger as zombies.
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                return False
+        except ChildProcessError:
+            pass
+        except OSError:
+            return False
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+    def wait_for_exit(self, pids, timeout):
+        deadline = time.monotonic() + timeout
+        remaining = list(pids)
+        while remaining:
+            remaining = [pid for pid in remaining if self._alive(pid)]
+            if not remaining or time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        return remaining
+
+    def create_link(self, source, link_name):
+        os.symlink(source, link_name, target_is_directory=True)
+
+    def launch(self, command):
+        return subprocess.Popen(command, start_new_session=True, close_fds=True)
+
+    def local_app_data(self):
+        return os.getenv('LOCALAPPDATA') or os.path.join(os.path.expanduser("~"), ".local", "share")
+
+    def riot_client_candidates(self):
+        wine_prefix = os.getenv('WINEPREFIX') or os.path.join(os.path.expanduser("~"), ".wine")
+        return [os.path.join(wine_prefix, "drive_c", "Riot Games", "Riot Client", "RiotClientServices.exe")]
+
+    def open_path(self, path):
+        subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", path])
+
+    def readahead(self, path, buffer):
+        if not hasattr(os, "posix_fadvise"):
+            return super().readahead(path, buffer)
+        # Asks the kernel to read the file in the background; nothing is copied into this process.
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            return os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+    def lower_thread_priority(self):
+        try:
+            # Linux applies PRIO_PROCESS with a thread id to just that thread.
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+
+class FakeProcess:
+    def __init__(self, backend, pid, command):
+        self.backend = backend
+        self.pid = pid
+        self.args = command
+
+    def poll(self):
+        return None if self.pid in self.backend.processes else 0
+
+    def wait(self, timeout=None):
+        return self.poll()
+
+
+class FakeBackend(PosixBackend):
+    """
+    In-memory process table and no-op launches, for benchmarks, profiling and CI.
+    Links are real symlinks so the profile tree behaves as it would on disk.
+    """
+    name = "fake"
+
+    def __init__(self, local_app_data=None, riot_client_path=None, exit_delay=0.0):
+        self._local_app_data = local_app_data
+        self._riot_client_path = riot_client_path
+        self.exit_delay = exit_delay # how long a killed process takes to exit, as seen by wait_for_exit
+        self._exiting = {}
+        self.processes = {}
+        self.launched = []
+        self.killed = []
+        self._next_pid = 1000
+
+    def spawn(self, exe_name):
+        self._next_pid += 1
+        self.processes[self._next_pid] = exe_name
+        return self._next_pid
+
+    def list_processes(self):
+        return list(self.processes.items())
+
+    def kill_processes(self, names):
+        wanted = {n.lower() for n in names}
+        pids = [pid for pid, exe in self.processes.items() if exe.lower() in wanted]
+        for pid in pids:
+            del self.processes[pid]
+            self._exiting[pid] = time.monotonic() + self.exit_delay
+        self.killed.extend(pids)
+        return pids
+
+    def wait_for_exit(self, pids, timeout):
+        exit_at = max((self._exiting.pop(pid, 0) for pid in pids), default=0)
+        delay = exit_at - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return list(pids)
+        if delay > 0:
+            time.sleep(delay)
+        return []
+
+    def launch(self, command):
+        self.launched.append(list(command))
+        return FakeProcess(self, self.spawn(os.path.basename(command[0])), command)
+
+    def local_app_data(self):
+        return self._local_app_data or super().local_app_data()
+
+    def riot_client_candidates(self):
+        return [self._riot_client_path] if self._riot_client_path else []
+
+    def open_path(self, path):
+        pass
+
+
+def get_backend(name=None):
+    name = (name or os.getenv(PLATFORM_ENV) or ("windows" if sys.platform == "win32" else "posix")).lower()
+    backends = {"windows": WindowsBackend, "posix": PosixBackend, "fake": FakeBackend}
+    if name not in backends:
+        raise ValueError(f"Unknown platform backend '{name}'. Choose one of: {', '.join(backends)}")
+    return backends[name]()
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+
+# Accounts warmed after each switch, most likely first.
+PREFETCH_ACCOUNTS = 2
+# Most bytes one round may pull into the page cache, so warming never pushes out much else.
+BUDGET_BYTES = 64 * 1024 * 1024
+# Warming waits this long after it is scheduled (the launch settling) so it never competes with a client start.
+IDLE_DELAY = 5.0
+# Pages warmed longer ago than this have likely been evicted again; a switch then counts as a miss.
+WARM_TTL = 20 * 60
+READ_BUFFER_BYTES = 1024 * 1024
+
+HIT = "hit"
+MISS = "miss"
+
+
+class ProfilePrefetcher:
+    """
+    Warms the profile folders of the accounts a switch is most likely to go to next into the OS page cache, so
+    the client reads them from memory instead of a cold HDD or network share. One low-priority thread does the
+    work during idle time, within a byte budget per round, and stops between files as soon as a switch starts.
+    claim() tells whether a switch's target was warm, which the switch records as its "prefetch" field.
+    """
+
+    def __init__(self, backend, budget_bytes=BUDGET_BYTES, idle_delay=IDLE_DELAY, warm_ttl=WARM_TTL):
+        self.backend = backend
+        self.budget_bytes = budget_bytes
+        self.idle_delay = idle_delay
+        self.warm_ttl = warm_ttl
+        self.hits = 0
+        self.misses = 0
+        self.bytes_warmed = 0
+        self._warm = {} # account -> monotonic time it was warmed
+        self._queue = [] # [(account, [folders])]
+        self._due = 0.0
+        self._generation = 0 # bumped by claim() and schedule(); a running round stops when it changes
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, targets, delay=None):
+        """targets: [(account, [folders or files])], most likely first. Replaces whatever has not been warmed yet."""
+        with self._condition:
+            self._generation += 1
+            self._queue = list(targets)
+            self._due = time.monotonic() + (self.idle_delay if delay is None else delay)
+            if self._queue and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="ProfilePrefetch", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def claim(self, account):
+        """
+        Called as a switch to account starts: stops any warming in progress and returns HIT if the account's
+        files were warmed recently, else MISS. Returns None before anything was ever warmed.
+        """
+        with self._condition:
+            self._generation += 1
+            self._queue = []
+            if not self._warm:
+                return None
+            warmed = self._warm.pop(account, None)
+            if warmed is not None and time.monotonic() - warmed <= self.warm_ttl:
+                self.hits += 1
+                return HIT
+            self.misses += 1
+            return MISS
+
+    def forget(self, account):
+        with self._condition:
+            self._warm.pop(account, None)
+
+    def stats(self):
+        with self._condition:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else None,
+                    "bytes_warmed": self.bytes_warmed, "warm": sorted(self._warm)}
+
+    def wait_idle(self, timeout=None):
+        """Blocks until the queue has been worked off. Returns True if it was."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._thread is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining if remaining is not None else 0.5)
+            return True
+
+    def _run(self):
+        self.backend.lower_thread_priority()
+        buffer = bytearray(READ_BUFFER_BYTES)
+        while True:
+            with self._condition:
+                while True:
+                    if not self._queue:
+                        self._thread = None
+                        self._condition.notify_all()
+                        return # the next schedule() starts a new thread
+                    wait = self._due - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                generation, targets, self._queue = self._generation, self._queue, []
+            budget = self.budget_bytes
+            for account, folders in targets:
+                result = self._warm_folders(folders, budget, buffer, generation)
+                if result is None:
+                    break # a switch started or new targets came in
+                warmed, complete = result
+                budget -= warmed
+                with self._condition:
+                    if generation != self._generation:
+                        break
+                    self.bytes_warmed += warmed
+                    if complete: self._warm[account] = time.monotonic()
+                if budget <= 0:
+                    break
+
+    def _warm_folders(self, folders, budget, buffer, generation):
+        """
+        (bytes warmed, whether every file fit) for folders (or single files) within budget, or None if
+        interrupted. Files that do not fit are skipped.
+        """
+        warmed, complete = 0, True
+        files = [path for path in folders if os.path.isfile(path)]
+        pending = [path for path in folders if path not in files]
+        while files or pending:
+            if not files:
+                try:
+                    with os.scandir(pending.pop()) as it:
+                        for entry in it:
+                            (pending if entry.is_dir() else files).append(entry.path)
+                except OSError:
+                    pass
+                continue
+            if generation != self._generation:
+                return None
+            try:
+                path = files.pop()
+                if os.path.getsize(path) > budget - warmed:
+                    complete = False
+                    continue
+                warmed += self.backend.readahead(path, buffer)
+            except OSError:
+                complete = False
+        return warmed, complete
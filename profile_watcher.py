@@ -0,0 +1,283 @@
+import os
+import threading
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+ADDED = "added"
+REMOVED = "removed"
+RENAMED = "renamed"
+ICON_CHANGED = "icon_changed"
+GAME_CHANGED = "game_changed"
+META_CHANGED = "meta_changed" # game.json was rewritten (group, tags, preset, ...)
+
+DEBOUNCE_MS = 300
+# Only accounts whose folder could not get a native watch (e.g. the OS watch limit was reached) are re-stat'ed
+# at this interval; every other account is only looked at when a notification flags it.
+CONTENT_POLL_MS = 3000
+# Full sweeps, on a worker thread, when native notifications are unavailable or IMA_SWITCHER_WATCH=poll.
+POLL_INTERVAL_MS = 2000
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _stat_id(path):
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return 0
+
+
+def _entry_id(entry):
+    try:
+        return entry.inode()
+    except OSError:
+        return 0
+
+
+def _replaced(old_id, new_id):
+    """True if a folder is not the one seen before. 0 means the filesystem gave no identity."""
+    return bool(old_id and new_id and old_id != new_id)
+
+
+class ProfileWatcher(QObject):
+    """
+    Keeps the account grid in step with profiles/ and config.json, whoever changes them (a restore, another
+    process, the CLI, Explorer). profiles/, every account folder and config.json's folder are watched natively;
+    notifications are debounced and turned into fine-grained events, and only the folder listing and the
+    accounts that were flagged are looked at, never the whole tree. In polling mode a worker thread sweeps
+    everything instead, and all events come from it.
+
+    changed carries a list of {"event", "account", "old_name", "icon_path", "game"} dicts, in order.
+    """
+
+    changed = pyqtSignal(list)
+    config_changed = pyqtSignal()
+
+    def __init__(self, switcher, parent=None, debounce_ms=DEBOUNCE_MS, force_polling=None):
+        super().__init__(parent)
+        self.switcher = switcher
+        self.profiles_dir = switcher.profiles_dir
+        self.config_path = switcher.config_path
+        if force_polling is None:
+            force_polling = os.environ.get("IMA_SWITCHER_WATCH", "").lower() == "poll"
+        self.force_polling = force_polling
+        self.polling = force_polling
+        self._accounts = {} # name -> {"id", "icon", "meta", "game"}
+        self._config_key = None
+        self._dirty_root = False
+        self._dirty_accounts = set()
+        self._dirty_config = False
+        self._unwatched = set() # accounts without a native watch, re-stat'ed every CONTENT_POLL_MS
+        self._paused = False
+        self._lock = threading.Lock() # guards the state above against the polling sweep thread
+        self._sweep_pending = False
+        self._sweeper = None
+
+        self._watcher = None
+        self._debounce = QTimer(self, singleShot=True, interval=debounce_ms)
+        self._debounce.timeout.connect(self.sync)
+        self._poll = QTimer(self)
+        self._poll.timeout.connect(self._on_poll)
+
+    def start(self):
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        self._config_key = _stat_key(self.config_path)
+        self._accounts = {}
+        for name, entry in self._list_profiles().items():
+            self._accounts[name] = self._scan_account(name, entry)
+        if not self.force_polling:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.directoryChanged.connect(self._on_directory_changed)
+            self.polling = not self._watch_paths()
+            if self.polling:
+                print("Native file notifications unavailable; polling the profiles folder instead.")
+        self._poll.start(POLL_INTERVAL_MS if self.polling else CONTENT_POLL_MS)
+
+    def stop(self):
+        self._poll.stop()
+        self._debounce.stop()
+        if self._watcher is not None:
+            paths = self._watcher.directories()
+            if paths: self._watcher.removePaths(paths)
+
+    def pause(self):
+        """
+        Drops the account folder watches until resume(). On Windows an open watch handle on a folder inside
+        profiles/ keeps profiles/ itself from being renamed, which a restore does.
+        """
+        self._paused = True
+        if self._watcher is not None and not self.polling:
+            self._watch_paths()
+
+    def resume(self):
+        self._paused = False
+        self.sync(rescan=True)
+
+    def _watch_paths(self):
+        # config.json is replaced atomically, which ends a watch on the file itself, so its folder is watched.
+        wanted = [self.profiles_dir, os.path.dirname(self.config_path)]
+        if not self._paused:
+            wanted.extend(os.path.join(self.profiles_dir, name) for name in self._accounts)
+        watched = {_norm(p): p for p in self._watcher.directories()}
+        wanted_keys = {_norm(p) for p in wanted}
+        stale = [p for key, p in watched.items() if key not in wanted_keys]
+        if stale: self._watcher.removePaths(stale)
+        missing = [p for p in wanted if _norm(p) not in watched and os.path.isdir(p)]
+        if missing: self._watcher.addPaths(missing)
+        watched = {_norm(p) for p in self._watcher.directories()}
+        self._unwatched = set() if self._paused else {
+            name for name in self._accounts if _norm(os.path.join(self.profiles_dir, name)) not in watched}
+        return _norm(self.profiles_dir) in watched
+
+    def _on_directory_changed(self, path):
+        key, root = _norm(path), _norm(self.profiles_dir)
+        if key == root:
+            self._dirty_root = True
+        elif _norm(os.path.dirname(path)) == root:
+            self._dirty_accounts.add(os.path.basename(path))
+        else:
+            self._dirty_config = True
+        self._debounce.start()
+
+    def _on_poll(self):
+        if self.polling:
+            self._request_sweep()
+        elif self._unwatched:
+            self._dirty_accounts.update(self._unwatched)
+            self.sync()
+
+    def _request_sweep(self):
+        with self._lock:
+            self._sweep_pending = True
+            if self._sweeper is not None:
+                return # the running sweep picks the request up
+            self._sweeper = threading.Thread(target=self._run_sweeps, name="ProfileWatcherPoll", daemon=True)
+        self._sweeper.start()
+
+    def _run_sweeps(self):
+        while True:
+            with self._lock:
+                if not self._sweep_pending:
+                    self._sweeper = None
+                    return
+                self._sweep_pending = False
+            self._sync(rescan=True)
+
+    def _list_profiles(self):
+        try:
+            with os.scandir(self.profiles_dir) as it:
+                return {e.name: e for e in it if e.is_dir()}
+        except OSError:
+            return {}
+
+    def _scan_account(self, name, entry=None):
+        account_path = os.path.join(self.profiles_dir, name)
+        folder_id = _entry_id(entry) if entry is not None else _stat_id(account_path)
+        meta = _stat_key(os.path.join(account_path, "game.json"))
+        previous = self._accounts.get(name)
+        if previous and previous["meta"] == meta and not _replaced(previous["id"], folder_id):
+            game = previous["game"]
+        else:
+            game = self.switcher.get_account_game(name)
+        return {"id": folder_id, "icon": _stat_key(os.path.join(account_path, "icon.png")), "meta": meta, "game": game}
+
+    def _event(self, event, name, info, old_name=None):
+        icon = os.path.join(self.profiles_dir, name, "icon.png") if info and info["icon"] else None
+        return {"event": event, "account": name, "old_name": old_name, "icon_path": icon, "game": info["game"] if info else None}
+
+    def sync(self, rescan=False, accounts=()):
+        """
+        Applies everything marked dirty now, plus the listing and the given accounts, which the UI uses right
+        after its own changes. rescan=True re-checks every account. In polling mode the work is handed to the
+        sweep thread, so events keep their order, and nothing is returned.
+        """
+        self._debounce.stop()
+        if self.polling:
+            self._request_sweep()
+            return []
+        return self._sync(rescan, accounts)
+
+    def _sync(self, rescan=False, accounts=()):
+        config_changed = False
+        with self._lock:
+            if rescan:
+                self._dirty_accounts.update(self._accounts)
+            if rescan or accounts:
+                self._dirty_root = self._dirty_config = True
+                self._dirty_accounts.update(accounts)
+            events = []
+            if self._dirty_root:
+                self._dirty_root = False
+                events.extend(self._sync_listing())
+            dirty, self._dirty_accounts = self._dirty_accounts, set()
+            for name in sorted(dirty):
+                old = self._accounts.get(name)
+                if old is None or not os.path.isdir(os.path.join(self.profiles_dir, name)):
+                    continue
+                new = self._scan_account(name)
+                self._accounts[name] = new
+                events.extend(self._content_events(name, old, new))
+            if self._watcher is not None and not self.polling:
+                self._watch_paths() # new or renamed accounts, and a restore swaps profiles/ for a new folder
+            if self._dirty_config:
+                self._dirty_config = False
+                key = _stat_key(self.config_path)
+                if key != self._config_key:
+                    self._config_key = key
+                    config_changed = True
+        if events:
+            self.changed.emit(events)
+        if config_changed:
+            self.config_changed.emit()
+        return events
+
+    def _content_events(self, name, old, new):
+        # A folder replaced under the same name (e.g. by a restore) may keep equal stat keys, so report everything.
+        replaced = _replaced(old["id"], new["id"])
+        events = []
+        if replaced or new["icon"] != old["icon"]:
+            events.append(self._event(ICON_CHANGED, name, new))
+        if new["game"] != old["game"]:
+            events.append(self._event(GAME_CHANGED, name, new))
+        if replaced or new["meta"] != old["meta"]:
+            events.append(self._event(META_CHANGED, name, new))
+        return events
+
+    def _sync_listing(self):
+        listing = self._list_profiles()
+        gone = [n for n in self._accounts if n not in listing]
+        new = [n for n in listing if n not in self._accounts]
+        events = []
+        for name in sorted(set(listing).intersection(self._accounts)):
+            if _replaced(self._accounts[name]["id"], _entry_id(listing[name])):
+                old = self._accounts[name]
+                self._accounts[name] = self._scan_account(name, listing[name])
+                events.extend(self._content_events(name, old, self._accounts[name]))
+        if not gone and not new:
+            return events
+        scanned = {name: self._scan_account(name, listing[name]) for name in new}
+        for old_name in gone:
+            old = self._accounts.pop(old_name)
+            # A rename keeps the folder's identity (inode / file index); pair it with the new name it now has.
+            match = next((n for n in new if old["id"] and scanned[n]["id"] == old["id"]), None)
+            if match is None and len(gone) == 1 and len(new) == 1 and (scanned[new[0]]["icon"], scanned[new[0]]["meta"]) == (old["icon"], old["meta"]):
+                match = new[0]
+            if match is not None:
+                new.remove(match)
+                self._accounts[match] = scanned[match]
+                events.append(self._event(RENAMED, match, scanned[match], old_name=old_name))
+            else:
+                events.append(self._event(REMOVED, old_name, None))
+        for name in sorted(new):
+            self._accounts[name] = scanned[name]
+            events.append(self._event(ADDED, name, scanned[name]))
+        return events
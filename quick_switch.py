@@ -0,0 +1,232 @@
+import sys
+import time
+import heapq
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QApplication, QAbstractItemView
+from PyQt5.QtCore import Qt, QSize, QObject, QAbstractNativeEventFilter, pyqtSignal
+from instrumentation import span
+
+DEFAULT_HOTKEY = "Ctrl+Alt+S"
+# Rows shown at once; with an empty query the first nine can also be picked with the digit keys.
+MAX_RESULTS = 9
+
+_MODIFIERS = {"alt": 0x0001, "ctrl": 0x0002, "control": 0x0002, "shift": 0x0004, "win": 0x0008, "meta": 0x0008}
+_MOD_NOREPEAT = 0x4000
+_WM_HOTKEY = 0x0312
+_NAMED_KEYS = {"space": 0x20, "tab": 0x09, "enter": 0x0D, "return": 0x0D, "esc": 0x1B, "escape": 0x1B,
+               "insert": 0x2D, "delete": 0x2E, "home": 0x24, "end": 0x23, "pageup": 0x21, "pagedown": 0x22,
+               "`": 0xC0, "pause": 0x13}
+
+
+def parse_hotkey(text):
+    """"Ctrl+Alt+S" -> (modifier flags, virtual-key code) as RegisterHotKey takes them, or None if it is not valid."""
+    parts = [p.strip().lower() for p in (text or "").split("+") if p.strip()]
+    if len(parts) < 2:
+        return None # a bare key would swallow that key everywhere
+    modifiers = 0
+    for part in parts[:-1]:
+        if part not in _MODIFIERS:
+            return None
+        modifiers |= _MODIFIERS[part]
+    key = parts[-1]
+    if len(key) == 1 and key.isalnum():
+        vk = ord(key.upper())
+    elif key[0] == "f" and key[1:].isdigit() and 1 <= int(key[1:]) <= 24:
+        vk = 0x6F + int(key[1:])
+    else:
+        vk = _NAMED_KEYS.get(key)
+    return (modifiers, vk) if vk is not None else None
+
+
+class _HotkeyFilter(QAbstractNativeEventFilter):
+    def __init__(self, hotkey):
+        super().__init__()
+        self.hotkey = hotkey
+
+    def nativeEventFilter(self, event_type, message):
+        if event_type == b"windows_generic_MSG":
+            from ctypes import wintypes
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == _WM_HOTKEY and msg.wParam == self.hotkey.hotkey_id:
+                self.hotkey.activated.emit()
+                return True, 0
+        return False, 0
+
+
+class GlobalHotkey(QObject):
+    """
+    A system-wide hotkey, registered with RegisterHotKey on Windows and delivered through Qt's native event
+    filter, so no hook or polling thread is involved. Other platforms have no global hotkey; start() says so.
+    """
+
+    activated = pyqtSignal()
+    _next_id = 0xB100
+
+    def __init__(self, sequence=DEFAULT_HOTKEY, parent=None):
+        super().__init__(parent)
+        self.sequence = sequence
+        GlobalHotkey._next_id += 1
+        self.hotkey_id = GlobalHotkey._next_id
+        self._filter = None
+        self.registered = False
+
+    def start(self):
+        parsed = parse_hotkey(self.sequence)
+        if parsed is None:
+            print(f"Invalid quick switch hotkey '{self.sequence}'.")
+            return False
+        if sys.platform != "win32":
+            print("Global hotkeys are only supported on Windows.")
+            return False
+        import ctypes
+        modifiers, vk = parsed
+        if not ctypes.windll.user32.RegisterHotKey(None, self.hotkey_id, modifiers | _MOD_NOREPEAT, vk):
+            print(f"Could not register the quick switch hotkey '{self.sequence}'; another program may be using it.")
+            return False
+        self._filter = _HotkeyFilter(self)
+        QApplication.instance().installNativeEventFilter(self._filter)
+        self.registered = True
+        return True
+
+    def stop(self):
+        if not self.registered:
+            return
+        import ctypes
+        ctypes.windll.user32.UnregisterHotKey(None, self.hotkey_id)
+        QApplication.instance().removeNativeEventFilter(self._filter)
+        self._filter = None
+        self.registered = False
+
+
+class QuickSwitchPalette(QWidget):
+    """
+    A small always-on-top launcher: type to filter, Enter (or 1-9 before typing) to switch. It shares the main
+    window's AccountIndex and icons and keeps its list for the empty query built ahead of time, so opening it is
+    a show() and nothing more. Rows are ranked by match score, then by usage (frecency).
+
+    switch_requested carries the account and the time.perf_counter() of the keystroke that picked it.
+    """
+
+    switch_requested = pyqtSignal(str, float)
+
+    def __init__(self, index, icon_for, parent=None):
+        super().__init__(parent, Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.index = index # AccountIndex kept current by the main window
+        self.icon_for = icon_for # name -> QIcon
+        self.ranking = {} # name -> position by usage, most used first
+        self._icons = {}
+        self._names = []
+        self._numbered = False
+        self.setObjectName("QuickSwitchPalette")
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setStyleSheet(
+            "QWidget#palette_body { background-color: #2c2a2b; border: 1px solid #c89f68; border-radius: 12px; } "
+            "QLineEdit { background-color: #3a3637; color: #e0d6d1; border: 1px solid #4f4a4b; border-radius: 8px; padding: 8px 10px; font-size: 15px; } "
+            "QListWidget { background-color: transparent; color: #e0d6d1; border: none; font-size: 14px; outline: none; } "
+            "QListWidget::item { padding: 4px; border-radius: 6px; } "
+            "QListWidget::item:selected { background-color: #c89f68; color: #2c2a2b; }"
+        )
+        body = QWidget(self, objectName="palette_body")
+        outer = QVBoxLayout(self)
+        outer.setContentsMargins(0, 0, 0, 0)
+        outer.addWidget(body)
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(10, 10, 10, 10)
+        self.query_box = QLineEdit(placeholderText="Switch to...")
+        self.query_box.textChanged.connect(self._refresh)
+        self.query_box.installEventFilter(self)
+        layout.addWidget(self.query_box)
+        self.results = QListWidget()
+        self.results.setIconSize(QSize(28, 28))
+        self.results.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results.setFocusPolicy(Qt.NoFocus)
+        self.results.itemClicked.connect(lambda item: self._pick(item.data(Qt.UserRole)))
+        layout.addWidget(self.results)
+        self.setFixedWidth(380)
+
+    def set_ranking(self, names):
+        """names in usage order, most used first (UsageStats.ranked). Rebuilds the idle list right away."""
+        self.ranking = {name: i for i, name in enumerate(names)}
+        if not self.isVisible() or not self.query_box.text().strip():
+            self._refresh(self.query_box.text())
+
+    def forget_icon(self, name):
+        self._icons.pop(name, None)
+        if name in self._names:
+            self._names = [] # rebuild the rows with the new icon
+            self._refresh(self.query_box.text())
+
+    def _icon(self, name):
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = self._icons[name] = self.icon_for(name)
+        return icon
+
+    def _refresh(self, text=""):
+        with span("quick_switch_filter"):
+            scores = self.index.match(text)
+            last = len(self.ranking)
+            names = heapq.nsmallest(MAX_RESULTS, scores, key=lambda n: (-scores[n], self.ranking.get(n, last), n.casefold()))
+            numbered = not text.strip()
+            if (names, numbered) == (self._names, self._numbered):
+                return
+            self._names, self._numbered = names, numbered
+            self.results.clear()
+            for i, name in enumerate(names):
+                label = f"{i + 1}   {name}" if numbered else name
+                item = QListWidgetItem(self._icon(name), label)
+                item.setData(Qt.UserRole, name)
+                self.results.addItem(item)
+            if names: self.results.setCurrentRow(0)
+
+    def toggle(self):
+        if self.isVisible() and self.isActiveWindow():
+            self.hide()
+        else:
+            self.open()
+
+    def open(self):
+        with span("quick_switch_open"):
+            screen = QApplication.desktop().availableGeometry(QApplication.desktop().screenNumber(self.cursor().pos()))
+            self.adjustSize()
+            self.move(screen.center().x() - self.width() // 2, screen.top() + screen.height() // 4)
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            self.query_box.setFocus()
+
+    def _pick(self, name):
+        intent = time.perf_counter()
+        if not name:
+            return
+        self.hide()
+        self.switch_requested.emit(name, intent)
+
+    def hideEvent(self, event):
+        self.query_box.clear() # the next open starts from the usage-ranked list
+        super().hideEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == event.ActivationChange and not self.isActiveWindow() and self.isVisible():
+            self.hide()
+        super().changeEvent(event)
+
+    def eventFilter(self, obj, event):
+        if obj is self.query_box and event.type() == event.KeyPress:
+            key = event.key()
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                item = self.results.currentItem()
+                self._pick(item.data(Qt.UserRole) if item else None)
+                return True
+            if key in (Qt.Key_Down, Qt.Key_Up) and self.results.count():
+                step = 1 if key == Qt.Key_Down else -1
+                self.results.setCurrentRow((self.results.currentRow() + step) % self.results.count())
+                return True
+            if Qt.Key_1 <= key <= Qt.Key_9 and not self.query_box.text():
+                row = key - Qt.Key_1
+                if row < len(self._names):
+                    self._pick(self._names[row])
+                    return True
+        return super().eventFilter(obj, event)
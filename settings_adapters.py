@@ -0,0 +1,398 @@
+import os
+import json
+import io
+import hashlib
+from types import MappingProxyType
+
+# Riot settings values that mean "let the game use its default", i.e. remove the line.
+DEFAULT_SENTINELS = frozenset(("High", "On", "MAX"))
+
+VALORANT_DISPLAY_MODES = {
+    "Fullscreen": {
+        "ResolutionSizeX": "1920", "ResolutionSizeY": "1080",
+        "LastUserConfirmedResolutionSizeX": "1920", "LastUserConfirmedResolutionSizeY": "1080",
+        "WindowPosX": "0", "WindowPosY": "0",
+        "LastConfirmedFullscreenMode": "0", "PreferredFullscreenMode": "0"
+    },
+    "Windowed Fullscreen": {
+        "ResolutionSizeX": "1920", "ResolutionSizeY": "1080",
+        "LastUserConfirmedResolutionSizeX": "1280", "LastUserConfirmedResolutionSizeY": "720",
+        "WindowPosX": "0", "WindowPosY": "0",
+        "LastConfirmedFullscreenMode": "1", "PreferredFullscreenMode": "1"
+    },
+    "Windowed": {
+        "ResolutionSizeX": "1920", "ResolutionSizeY": "1032",
+        "LastUserConfirmedResolutionSizeX": "1280", "LastUserConfirmedResolutionSizeY": "720",
+        "WindowPosX": "0", "WindowPosY": "24",
+        "LastConfirmedFullscreenMode": "2", "PreferredFullscreenMode": "1"
+    },
+}
+
+# Compiled plans are kept per distinct settings dict (global settings plus each preset in use).
+PLAN_CACHE_SIZE = 16
+
+# League's WindowMode: 0 fullscreen, 1 windowed, 2 borderless.
+LEAGUE_WINDOW_MODES = {"Fullscreen": "0", "Windowed": "1", "Windowed Fullscreen": "2"}
+
+
+SET, DELETE = "set", "delete"
+
+
+class PatchPlan:
+    """
+    Immutable, precompiled edits for a key=value file. actions maps each key to
+    (SET, value, rendered line) or (DELETE, None, None), so applying it is one dict lookup per line.
+    anchors holds pre-rendered lines to insert after an anchor key; append holds keys to add if never
+    seen, after the last line starting with append_after_prefix. digest identifies the plan's content.
+    """
+    __slots__ = ("actions", "anchors", "append", "append_after_prefix", "digest")
+
+    def __init__(self, set_values=None, delete_keys=(), insert_after=None, append_missing=False, append_after_prefix=None):
+        actions = {key: (DELETE, None, None) for key in delete_keys}
+        for key, value in (set_values or {}).items():
+            value = str(value)
+            actions[key] = (SET, value, f"{key}={value}\n")
+        anchors = {
+            anchor: tuple((key, str(value), f"{key}={value}\n") for key, value in lines)
+            for anchor, lines in (insert_after or {}).items()
+        }
+        append = ()
+        if append_missing:
+            append = tuple((key, action[1], action[2]) for key, action in sorted(actions.items()) if action[0] == SET)
+        digest = hashlib.sha1(repr((sorted(actions.items()), sorted(anchors.items()), append, append_after_prefix)).encode("utf-8")).hexdigest()
+        for name, value in (("actions", MappingProxyType(actions)), ("anchors", MappingProxyType(anchors)),
+                            ("append", append), ("append_after_prefix", append_after_prefix), ("digest", digest)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PatchPlan is immutable")
+
+    def is_empty(self):
+        return not (self.actions or self.anchors)
+
+    def set_value(self, key):
+        action = self.actions.get(key)
+        return action[1] if action and action[0] == SET else None
+
+
+class SettingsPlan:
+    """A compiled graphics_settings dict for one adapter: {file kind: PatchPlan} plus a combined digest."""
+    __slots__ = ("patches", "digest")
+
+    def __init__(self, patches):
+        object.__setattr__(self, "patches", MappingProxyType(dict(patches)))
+        combined = "|".join(f"{kind}:{plan.digest}" for kind, plan in sorted(self.patches.items()))
+        object.__setattr__(self, "digest", hashlib.sha1(combined.encode("utf-8")).hexdigest())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsPlan is immutable")
+
+
+def _net_changes(changes):
+    """Collapses per-line edits into one (key, old, new) per key, dropping edits that cancel out."""
+    net = {}
+    for key, old, new in changes:
+        if key in net:
+            net[key] = (net[key][0], new)
+        else:
+            net[key] = (old, new)
+    return [(key, old, new) for key, (old, new) in net.items() if old != new]
+
+
+def patch_lines(lines, plan):
+    """Runs a PatchPlan over lines in a single pass. Returns (new lines, net changes)."""
+    out, changes, seen = [], [], set()
+    actions, anchors, prefix = plan.actions, plan.anchors, plan.append_after_prefix
+    last_prefix_index = -1
+    for line in lines:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            out.append(line)
+            continue
+        key = key.strip()
+        action = actions.get(key)
+        if action is not None:
+            value = value.strip()
+            if action[0] == DELETE:
+                changes.append((key, value, None))
+                continue
+            seen.add(key)
+            if value != action[1]:
+                changes.append((key, value, action[1]))
+                line = action[2]
+        out.append(line)
+        if prefix and key.startswith(prefix):
+            last_prefix_index = len(out) - 1
+        for insert_key, insert_value, rendered in anchors.get(key, ()):
+            out.append(rendered)
+            changes.append((insert_key, None, insert_value))
+
+    missing = [entry for entry in plan.append if entry[0] not in seen]
+    if missing:
+        changes.extend((key, None, value) for key, value, _ in missing)
+        if last_prefix_index != -1:
+            # Keys used to be inserted one by one at the same index, so they end up in reverse key order.
+            missing.reverse()
+            index = last_prefix_index + 1
+        else:
+            index = len(out)
+        if index > 0 and not out[index - 1].endswith("\n"):
+            out[index - 1] += "\n"
+        out[index:index] = [rendered for _, _, rendered in missing]
+    return out, _net_changes(changes)
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def patch_text_file(path, plan, write=True, before_write=None):
+    """
+    Patches a key=value file in place. Only rewrites it when something changed, calling
+    before_write(path, original bytes) first. Returns the net changes.
+    """
+    raw = _read_bytes(path)
+    # Same newline handling as reading the file in text mode.
+    lines = io.StringIO(raw.decode('utf-8'), newline=None).readlines()
+    new_lines, changes = patch_lines(lines, plan)
+    if write and changes:
+        if before_write: before_write(path, raw)
+        _atomic_write(path, "".join(new_lines))
+    return changes
+
+
+def _atomic_write(path, text):
+    temp_path = path + ".ima-tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def read_key_values(path, prefix=None):
+    settings = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, sep, value = line.strip().partition("=")
+            if sep and (prefix is None or key.startswith(prefix)):
+                settings[key.strip()] = value.strip()
+    return settings
+
+
+def settings_fingerprint(settings):
+    """Stable hash of a settings dict, independent of key order."""
+    return hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+
+class SettingsAdapter:
+    """
+    Knows where one title keeps its settings files and how to turn the switcher's graphics_settings
+    into patches for them. Subclasses implement discover() and build_patches(); read, diff, apply and
+    fingerprint are shared.
+    """
+    game = None
+
+    def __init__(self, app_data_path, riot_client_exe=None):
+        self.app_data_path = app_data_path
+        self.riot_client_exe = riot_client_exe
+        self._plan_cache = {}
+        self._applied_fingerprint = None
+
+    def discover(self):
+        """Returns {file kind: [paths]}."""
+        raise NotImplementedError
+
+    def build_patches(self, graphics_settings):
+        """Returns {file kind: PatchPlan}. Kinds without a plan are left alone."""
+        raise NotImplementedError
+
+    def compile(self, graphics_settings):
+        """
+        The SettingsPlan for graphics_settings, compiled once per distinct settings content.
+        Apply, diff and fingerprint all run from the same plan.
+        """
+        key = settings_fingerprint(graphics_settings)
+        plan = self._plan_cache.get(key)
+        if plan is None:
+            plan = SettingsPlan(self.build_patches(graphics_settings))
+            if len(self._plan_cache) >= PLAN_CACHE_SIZE:
+                self._plan_cache.pop(next(iter(self._plan_cache)))
+            self._plan_cache[key] = plan
+        return plan
+
+    def read(self, path):
+        return read_key_values(path)
+
+    def patch_file(self, kind, path, plan, write=True, before_write=None):
+        return patch_text_file(path, plan, write, before_write)
+
+    def run_plan(self, settings_plan, write, snapshot=None):
+        """
+        Runs a compiled plan over every discovered file. Returns ({path: changes}, {path: error}).
+        With a snapshot operation, each file's original bytes are recorded just before it is rewritten.
+        """
+        before_write = snapshot.record if snapshot is not None else None
+        results, errors = {}, {}
+        for kind, paths in self.discover().items():
+            plan = settings_plan.patches.get(kind)
+            if plan is None or plan.is_empty(): continue
+            for path in paths:
+                try:
+                    results[path] = self.patch_file(kind, path, plan, write, before_write)
+                except Exception as e:
+                    errors[path] = str(e)
+        return results, errors
+
+    def diff(self, graphics_settings):
+        """{path: [(key, old, new), ...]} for every file that would change. Nothing is written."""
+        results, _ = self.run_plan(self.compile(graphics_settings), write=False)
+        return {path: changes for path, changes in results.items() if changes}
+
+    def is_applied(self, graphics_settings):
+        """True if these settings were the last ones applied and no target file has changed since."""
+        return self._applied_fingerprint is not None and self._applied_fingerprint == self.fingerprint(graphics_settings)
+
+    def apply(self, graphics_settings, snapshot=None):
+        # Skips reading every file when nothing changed since the last apply.
+        if self.is_applied(graphics_settings):
+            print(f"{self.game} settings already up to date.")
+            return True, None
+        results, errors = self.run_plan(self.compile(graphics_settings), write=True, snapshot=snapshot)
+        for path, changes in results.items():
+            if changes: print(f"Successfully updated: {path}")
+        for path, error in errors.items():
+            print(f"Error updating {path}: {error}")
+        if not results and not errors:
+            print(f"No {self.game} settings files found to update.")
+        if errors:
+            self._applied_fingerprint = None
+            return False, "One or more files failed to update."
+        self._applied_fingerprint = self.fingerprint(graphics_settings)
+        return True, None
+
+    def fingerprint(self, graphics_settings):
+        """Changes whenever the compiled plan or any target file changes, so callers can skip redundant applies."""
+        files = sorted((path, file_fingerprint(path)) for paths in self.discover().values() for path in paths)
+        return settings_fingerprint({"plan": self.compile(graphics_settings).digest, "files": files})
+
+
+class ValorantSettingsAdapter(SettingsAdapter):
+    game = "valorant"
+
+    def config_root(self):
+        return os.path.join(self.app_data_path, "VALORANT", "Saved", "Config")
+
+    def discover(self):
+        found = {"game_user": [], "riot_user": []}
+        # One walk for both files; each account's settings live in <config>/<id>/Windows/.
+        for root, dirs, files in os.walk(self.config_root()):
+            if os.path.basename(root) != "Windows": continue
+            if "GameUserSettings.ini" in files: found["game_user"].append(os.path.join(root, "GameUserSettings.ini"))
+            if "RiotUserSettings.ini" in files: found["riot_user"].append(os.path.join(root, "RiotUserSettings.ini"))
+        return found
+
+    def build_patches(self, graphics_settings):
+        display_mode = graphics_settings.get("display_mode", "Default")
+        set_values = dict(VALORANT_DISPLAY_MODES.get(display_mode, {}))
+        set_values.update(graphics_settings.get("quality", {}))
+        delete_keys, insert_after = (), None
+        if display_mode != "Default":
+            delete_keys = ("FullscreenMode",)
+            if display_mode in ("Windowed", "Windowed Fullscreen"):
+                insert_after = {"HDRDisplayOutputNits": [("FullscreenMode", "1" if display_mode == "Windowed Fullscreen" else "2")]}
+        game_user = PatchPlan(set_values, delete_keys, insert_after)
+
+        riot_values = {**graphics_settings.get("riot_settings", {}), **graphics_settings.get("audio_settings", {})}
+        riot_user = PatchPlan(
+            {k: v for k, v in riot_values.items() if v not in DEFAULT_SENTINELS},
+            [k for k, v in riot_values.items() if v in DEFAULT_SENTINELS],
+            append_missing=True, append_after_prefix="EAres")
+        return {"game_user": game_user, "riot_user": riot_user}
+
+
+class LeagueSettingsAdapter(SettingsAdapter):
+    """
+    Patches League's Config/game.cfg and Config/PersistedSettings.json. The client rewrites game.cfg
+    from PersistedSettings.json on start, so both get the same values.
+    Reads graphics_settings["lol_display_mode"] and the raw game.cfg keys in graphics_settings["lol_settings"].
+    Valorant's display_mode is not used, so WindowMode is left alone unless lol_display_mode is set.
+    """
+    game = "lol"
+
+    def config_dirs(self):
+        roots = [os.path.join("C:", os.sep, "Riot Games")]
+        if self.riot_client_exe:
+            # <Riot Games>/Riot Client/RiotClientServices.exe -> <Riot Games>
+            roots.insert(0, os.path.dirname(os.path.dirname(self.riot_client_exe)))
+        return list(dict.fromkeys(os.path.join(root, "League of Legends", "Config") for root in roots))
+
+    def discover(self):
+        found = {"game_cfg": [], "persisted": []}
+        for config_dir in self.config_dirs():
+            game_cfg = os.path.join(config_dir, "game.cfg")
+            persisted = os.path.join(config_dir, "PersistedSettings.json")
+            if os.path.isfile(game_cfg): found["game_cfg"].append(game_cfg)
+            if os.path.isfile(persisted): found["persisted"].append(persisted)
+        return found
+
+    def _values(self, graphics_settings):
+        values = {}
+        window_mode = LEAGUE_WINDOW_MODES.get(graphics_settings.get("lol_display_mode", "Default"))
+        if window_mode is not None: values["WindowMode"] = window_mode
+        values.update(graphics_settings.get("lol_settings", {}))
+        return values
+
+    def build_patches(self, graphics_settings):
+        plan = PatchPlan(self._values(graphics_settings))
+        return {"game_cfg": plan, "persisted": plan}
+
+    def read(self, path):
+        if not path.endswith(".json"):
+            return read_key_values(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {s["name"]: s.get("value") for s, _ in _persisted_settings(data)}
+
+    def patch_file(self, kind, path, plan, write=True, before_write=None):
+        if kind != "persisted":
+            return patch_text_file(path, plan, write, before_write)
+        raw = _read_bytes(path)
+        data = json.loads(raw.decode('utf-8'))
+        changes = []
+        for setting, _ in _persisted_settings(data):
+            new_value = plan.set_value(setting.get("name"))
+            if new_value is not None and setting.get("value") != new_value:
+                changes.append((setting["name"], setting.get("value"), new_value))
+                setting["value"] = new_value
+        if write and changes:
+            if before_write: before_write(path, raw)
+            _atomic_write(path, json.dumps(data, indent=4))
+        return changes
+
+
+def _persisted_settings(data):
+    """Yields (setting, section) for every entry in PersistedSettings.json's files/sections/settings tree."""
+    for file_entry in data.get("files", []):
+        for section in file_entry.get("sections", []):
+            for setting in section.get("settings", []):
+                if "name" in setting:
+                    yield setting, section
+
+
+ADAPTERS = {
+    "valorant": ValorantSettingsAdapter,
+    "lol": LeagueSettingsAdapter,
+}
+
+
+def get_adapter(key, app_data_path, riot_client_exe=None):
+    adapter_class = ADAPTERS.get(key)
+    return adapter_class(app_data_path, riot_client_exe) if adapter_class else None
@@ -0,0 +1,163 @@
+import os
+import json
+import zlib
+import hashlib
+import threading
+from datetime import datetime
+
+MAX_OPERATIONS = 20
+
+
+class SnapshotOperation:
+    """
+    Collects the pre-change bytes of each file one settings apply modifies. Files are recorded
+    right before they are overwritten, so an apply that changes nothing costs nothing.
+    """
+
+    def __init__(self, store, label):
+        self.store = store
+        self.label = label
+        self.op_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f-") + os.urandom(2).hex()
+        self.files = []
+        self._lock = threading.Lock()
+
+    def record(self, path, original_bytes):
+        digest = self.store.put_object(original_bytes, pending=self.op_id)
+        with self._lock:
+            if not any(f["path"] == path for f in self.files):
+                self.files.append({"path": path, "hash": digest, "size": len(original_bytes)})
+
+    def commit(self):
+        """Writes the manifest if anything was recorded. Returns the op id, or None for a no-op apply."""
+        if not self.files:
+            return None
+        try:
+            self.store.write_manifest(self.op_id, {
+                "op_id": self.op_id,
+                "label": self.label,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "files": self.files,
+            })
+        finally:
+            self.store.release(self.op_id)
+        self.store.prune()
+        return self.op_id
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of settings files as they were before an apply:
+    <root>/objects/<aa>/<sha1> holds zlib-compressed bytes (one copy per distinct content),
+    <root>/manifests/<op id>.json lists the files one apply changed. Only the newest MAX_OPERATIONS are kept,
+    and an object is deleted once no manifest (or apply still in progress) references it.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+        self._pending = {} # op id -> digests stored by an apply whose manifest is not written yet
+        self._lock = threading.Lock()
+
+    def begin(self, label):
+        return SnapshotOperation(self, label)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def put_object(self, data, pending=None):
+        digest = hashlib.sha1(data).hexdigest()
+        object_path = self._object_path(digest)
+        with self._lock:
+            if pending is not None:
+                self._pending.setdefault(pending, set()).add(digest)
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                temp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(zlib.compress(data, 6))
+                os.replace(temp_path, object_path)
+        return digest
+
+    def release(self, op_id):
+        with self._lock:
+            self._pending.pop(op_id, None)
+
+    def get_object(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha1(data).hexdigest() != digest:
+            raise ValueError(f"Snapshot object {digest} is corrupted.")
+        return data
+
+    def write_manifest(self, op_id, manifest):
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        with open(os.path.join(self.manifests_dir, f"{op_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def read_manifest(self, op_id):
+        try:
+            with open(os.path.join(self.manifests_dir, f"{op_id}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def list_operations(self):
+        """Op ids, newest first. Ids start with a timestamp, so name order is time order."""
+        try:
+            names = os.listdir(self.manifests_dir)
+        except FileNotFoundError:
+            return []
+        return sorted((n[:-5] for n in names if n.endswith(".json")), reverse=True)
+
+    def rollback(self, op_id):
+        """Restores every file op_id changed to its pre-apply bytes. Returns (success, message)."""
+        manifest = self.read_manifest(op_id)
+        if manifest is None:
+            return False, f"No settings snapshot '{op_id}'."
+        failed = []
+        for entry in manifest["files"]:
+            try:
+                data = self.get_object(entry["hash"])
+                temp_path = entry["path"] + ".ima-tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, entry["path"])
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"Could not restore {entry['path']}: {e}")
+                failed.append(entry["path"])
+        if failed:
+            return False, f"Restored {len(manifest['files']) - len(failed)} of {len(manifest['files'])} files."
+        return True, f"Restored {len(manifest['files'])} files from {manifest.get('label', op_id)}."
+
+    def _remove_manifest(self, op_id):
+        try: os.remove(os.path.join(self.manifests_dir, f"{op_id}.json"))
+        except OSError: pass
+
+    def discard(self, op_id):
+        """Forgets op_id and deletes the objects only it referenced."""
+        self._remove_manifest(op_id)
+        self.collect_garbage()
+
+    def prune(self, keep=MAX_OPERATIONS):
+        """Drops all but the newest keep operations, then deletes every object no remaining one references."""
+        for op_id in self.list_operations()[keep:]:
+            self._remove_manifest(op_id)
+        self.collect_garbage()
+
+    def collect_garbage(self):
+        """Deletes objects no manifest references. Returns how many were deleted."""
+        with self._lock:
+            referenced = set().union(*self._pending.values())
+            for op_id in self.list_operations():
+                manifest = self.read_manifest(op_id) or {"files": []}
+                referenced.update(entry["hash"] for entry in manifest["files"])
+            removed = 0
+            for root, dirs, files in os.walk(self.objects_dir):
+                for name in files:
+                    if name not in referenced and not name.endswith(".tmp"):
+                        try:
+                            os.remove(os.path.join(root, name))
+                            removed += 1
+                        except OSError: pass
+            return removed
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import threading
+from file_locks import FileLock, LockTimeout, LOCKS_DIR, write_json_atomic
+
+SWITCH_LOCK_FILE = "switch.lock"
+SWITCH_REQUEST_FILE = "switch.request"
+REQUEST_LOCK_FILE = "switch.request.lock"
+LOCK_TIMEOUT = 60
+# Third element of the result tuple for a request that was dropped in favour of another one (like "both" for a prompt).
+COALESCED = "coalesced"
+
+
+class _SwitchTicket:
+    def __init__(self, account_name, selected_game, cancel_event, intent=None):
+        self.target = (account_name, selected_game)
+        self.intent = intent
+        self.request_id = f"{os.getpid()}-{time.time_ns()}"
+        self.issued = time.time()
+        self.caller_cancel = cancel_event
+        self.superseded = threading.Event()
+
+    def is_set(self):
+        # Handed to switch_account as its cancel_event: a newer request cancels this one at the next safe point.
+        return self.superseded.is_set() or (self.caller_cancel is not None and self.caller_cancel.is_set())
+
+
+class SwitchCoordinator:
+    """
+    Serializes every switch of one install. Inside a process, requests queue with latest-wins: a new target
+    cancels the running switch at its next safe point and replaces any waiting one, and a request for the
+    target already in flight is dropped. Across processes, an exclusive FileLock serializes switches and a request
+    file lets a process skip its switch when a newer one was issued while it waited, and records the last
+    completed switch so a request for it that was issued while it ran is dropped instead of run again. A request
+    issued after it finished (a retry after the client was closed) always runs.
+    Dropped requests return (True, message, COALESCED).
+    """
+
+    def __init__(self, run_switch, base_dir, lock_timeout=LOCK_TIMEOUT, on_lock_wait=None):
+        self.run_switch = run_switch # run_switch(account_name, selected_game, progress, cancel_event, intent) -> (success, message, game)
+        self.lock = FileLock(os.path.join(base_dir, LOCKS_DIR, SWITCH_LOCK_FILE), "switch", lock_timeout, on_lock_wait)
+        self.request_path = os.path.join(base_dir, LOCKS_DIR, SWITCH_REQUEST_FILE)
+        # Only held for the read-modify-write of the request file, never while taking the switch lock.
+        self.request_lock = FileLock(os.path.join(base_dir, LOCKS_DIR, REQUEST_LOCK_FILE), "switch request", lock_timeout)
+        self._condition = threading.Condition()
+        self._running = None
+        self._pending = None
+
+    def _coalesced(self, message):
+        return True, message, COALESCED
+
+    def _read_state(self):
+        try:
+            with open(self.request_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _update_state(self, updates):
+        try:
+            os.makedirs(os.path.dirname(self.request_path), exist_ok=True)
+            with self.request_lock.hold():
+                state = self._read_state()
+                state.update(updates)
+                write_json_atomic(self.request_path, state)
+        except (OSError, LockTimeout) as e:
+            print(f"Could not record switch request: {e}")
+
+    def _publish(self, ticket):
+        self._update_state({"id": ticket.request_id, "account": ticket.target[0]})
+
+    def _record_done(self, ticket):
+        self._update_state({"done": {"account": ticket.target[0], "game": ticket.target[1], "at": time.time()}})
+
+    def _newer_request(self, ticket, state):
+        """The account of a request another process issued after this ticket, or None."""
+        return state.get("account") if state.get("id", ticket.request_id) != ticket.request_id else None
+
+    def _just_done(self, ticket, state):
+        """True if a switch to this ticket's target completed after the ticket was issued."""
+        done = state.get("done")
+        if not isinstance(done, dict) or (done.get("account"), done.get("game")) != ticket.target:
+            return False
+        return ticket.issued <= done.get("at", 0)
+
+    def submit(self, account_name, selected_game=None, progress=None, cancel_event=None, intent=None):
+        ticket = _SwitchTicket(account_name, selected_game, cancel_event, intent)
+        with self._condition:
+            if self._pending is not None and self._pending.target == ticket.target:
+                return self._coalesced(f"A switch to '{account_name}' is already queued.")
+            if self._running is not None and self._running.target == ticket.target and not self._running.superseded.is_set():
+                if self._pending is not None:
+                    self._pending.superseded.set()
+                    self._pending = None
+                return self._coalesced(f"Already switching to '{account_name}'.")
+            if self._pending is not None:
+                self._pending.superseded.set()
+            if self._running is not None:
+                self._running.superseded.set()
+            self._pending = ticket
+            self._publish(ticket)
+            self._condition.notify_all()
+            while self._running is not None and not ticket.is_set():
+                self._condition.wait(0.1) # polled so a cancelled caller (e.g. the app closing) stops waiting
+            if self._pending is ticket:
+                self._pending = None
+            if ticket.superseded.is_set():
+                return self._coalesced(f"Switch to '{account_name}' replaced by a newer request.")
+            if ticket.is_set():
+                return False, "Switch cancelled.", None
+            self._running = ticket
+
+        try:
+            try:
+                self.lock.acquire()
+            except LockTimeout as e:
+                return False, f"Another switch is still running. Please try again.\n{e}", None
+            try:
+                state = self._read_state()
+                newer = self._newer_request(ticket, state)
+                if newer is not None:
+                    return self._coalesced(f"Switch to '{account_name}' replaced by a newer request for '{newer}'.")
+                if self._just_done(ticket, state):
+                    return self._coalesced(f"Already switched to '{account_name}'.")
+                result = self.run_switch(account_name, selected_game, progress, ticket, ticket.intent)
+                if result[0] and result[2] not in ("both", COALESCED):
+                    self._record_done(ticket)
+            finally:
+                self.lock.release()
+        finally:
+            with self._condition:
+                self._running = None
+                self._condition.notify_all()
+        if ticket.superseded.is_set() and not result[0]:
+            return self._coalesced(f"Switch to '{account_name}' replaced by a newer request.")
+        return result
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+METRICS_FILE = "switch_metrics.jsonl"
+MAX_BYTES = 512 * 1024
+BACKUPS = 2
+
+# Stage order used when printing a summary; anything else is listed after these.
+STAGE_ORDER = ("intent", "kill", "prepare", "unlink", "link", "launch", "ready", "settings")
+
+
+class MetricsOperation:
+    """
+    Timing for one switch, save, backup or restore. Stages accumulate, so a stage timed once per
+    LoginData item adds up to one total. finish() writes the record once; later calls are ignored.
+    Usable as a context manager: leaving the block finishes the operation (failed if it raised).
+    """
+
+    def __init__(self, log, kind, account=None, start=None):
+        self.log = log
+        self.kind = kind
+        self.account = account
+        self.fields = {}
+        self.stages = {}
+        self._start = time.perf_counter()
+        if start is not None and start <= self._start:
+            # Timed from the user's action (a perf_counter() value), e.g. the palette keystroke that asked for it.
+            self.stages["intent"] = round((self._start - start) * 1000, 2)
+            self._start = start
+        self._finished = False
+        self._lock = threading.Lock() # the launch monitor thread and the next switch may both finish a switch
+
+    def stage(self, name):
+        return _StageTimer(self, name)
+
+    def add_stage(self, name, ms):
+        self.stages[name] = round(self.stages.get(name, 0.0) + ms, 2)
+
+    def finish(self, success, error=None):
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "op": self.kind,
+            "account": self.account,
+            "ok": bool(success),
+            "ms": round((time.perf_counter() - self._start) * 1000, 2),
+            "stages": self.stages,
+        }
+        record.update(self.fields)
+        if error:
+            record["error"] = str(error)
+        self.log.append(record)
+
+    def cancel(self):
+        """Drops the operation without writing a record (e.g. a switch that only asked which game to launch)."""
+        self._finished = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc_type is None, error=exc if exc_type is not None else None)
+        return False
+
+
+class _StageTimer:
+    __slots__ = ("operation", "name", "start")
+
+    def __init__(self, operation, name):
+        self.operation = operation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.operation.add_stage(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class MetricsLog:
+    """
+    Append-only JSON-lines history of switch/save/backup/restore timings.
+    The file rotates to .1, .2 ... once it passes max_bytes, so it stays small without any cleanup.
+    """
+
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def begin(self, kind, account=None, start=None):
+        return MetricsOperation(self, kind, account, start)
+
+    def append(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                self._rotate_if_needed()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"Could not write switch metrics: {e}")
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def records(self, kind=None):
+        """Every record still on disk, oldest first. Unreadable lines are skipped."""
+        paths = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)] + [self.path]
+        records = []
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if kind is None or record.get("op") == kind:
+                            records.append(record)
+            except OSError:
+                continue
+        return records
+
+    def summary(self, kind=None, last=None):
+        """
+        {op: {"count", "failures", "failure_rate", "total": (p50, p95), "stages": {stage: (p50, p95)}, "last_error"}}
+        over the newest `last` records of each op (all of them if None). Failed operations count toward
+        the failure rate but not the latencies. Switches that recorded a profile prefetch outcome also get
+        "prefetch": {"hits", "misses", "hit_rate", "ready_hit": (p50, p95), "ready_miss": (p50, p95)}.
+        """
+        by_kind = {}
+        for record in self.records(kind):
+            by_kind.setdefault(record.get("op"), []).append(record)
+        summary = {}
+        for op, records in by_kind.items():
+            if last:
+                records = records[-last:]
+            succeeded = [r for r in records if r.get("ok")]
+            stage_samples = {}
+            for record in succeeded:
+                for stage, ms in record.get("stages", {}).items():
+                    stage_samples.setdefault(stage, []).append(ms)
+            failures = [r for r in records if not r.get("ok")]
+            summary[op] = {
+                "count": len(records),
+                "failures": len(failures),
+                "failure_rate": len(failures) / len(records),
+                "total": _percentiles([r["ms"] for r in succeeded]),
+                "stages": {stage: _percentiles(samples) for stage, samples in stage_samples.items()},
+                "last_error": failures[-1].get("error") if failures else None,
+            }
+            prefetched = [r for r in records if r.get("prefetch")]
+            if prefetched:
+                hits = [r for r in prefetched if r["prefetch"] == "hit"]
+                misses = [r for r in prefetched if r["prefetch"] != "hit"]
+                summary[op]["prefetch"] = {
+                    "hits": len(hits),
+                    "misses": len(misses),
+                    "hit_rate": len(hits) / len(prefetched),
+                    "ready_hit": _percentiles([r["stages"]["ready"] for r in hits if r.get("ok") and "ready" in r.get("stages", {})]),
+                    "ready_miss": _percentiles([r["stages"]["ready"] for r in misses if r.get("ok") and "ready" in r.get("stages", {})]),
+                }
+        return summary
+
+
+def _percentiles(samples):
+    if not samples:
+        return None, None
+    ordered = sorted(samples)
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+    return pick(0.50), pick(0.95)
+
+
+def _ordered_stages(stages):
+    return [s for s in STAGE_ORDER if s in stages] + sorted(s for s in stages if s not in STAGE_ORDER)
+
+
+def format_summary(summary):
+    """Plain-text table of a MetricsLog.summary(), used by --stats and the Switch Stats dialog."""
+    if not summary:
+        return "No switches recorded yet."
+    lines = []
+    for op in sorted(summary):
+        stats = summary[op]
+        p50, p95 = stats["total"]
+        lines.append(f"{op}: {stats['count']} run(s), {stats['failures']} failed ({stats['failure_rate']:.0%})")
+        if p50 is not None:
+            lines.append(f"  {'total':<10} p50 {p50:>9.1f} ms   p95 {p95:>9.1f} ms")
+        for stage in _ordered_stages(stats["stages"]):
+            s50, s95 = stats["stages"][stage]
+            lines.append(f"  {stage:<10} p50 {s50:>9.1f} ms   p95 {s95:>9.1f} ms")
+        prefetch = stats.get("prefetch")
+        if prefetch:
+            line = f"  {'prefetch':<10} {prefetch['hits']}/{prefetch['hits'] + prefetch['misses']} hits ({prefetch['hit_rate']:.0%})"
+            if prefetch["ready_hit"][0] is not None and prefetch["ready_miss"][0] is not None:
+                line += f", ready p50 {prefetch['ready_hit'][0]:.1f} ms warm vs {prefetch['ready_miss'][0]:.1f} ms cold"
+            lines.append(line)
+        if stats["last_error"]:
+            lines.append(f"  last error: {stats['last_error'].splitlines()[0]}")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+import os
+import sys
+import hashlib
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from switch_coordinator import COALESCED
+
+SERVICE_KEY_FILE = "service.key"
+REPLY_TIMEOUT = 60
+# A switch request is acknowledged as soon as the service has read it; without that, the service counts as down.
+ACK_TIMEOUT = 5
+QUEUED = "queued"
+
+
+def service_address(base_dir):
+    """One endpoint per install folder: a named pipe on Windows, a Unix socket elsewhere."""
+    if sys.platform == "win32":
+        suffix = hashlib.sha1(os.path.normcase(os.path.abspath(base_dir)).encode("utf-8")).hexdigest()[:12]
+        return rf"\\.\pipe\iMASwitcher-{suffix}"
+    return os.path.join(base_dir, "switcher.sock")
+
+
+def _service_family():
+    return "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+def _read_key(base_dir):
+    try:
+        with open(os.path.join(base_dir, SERVICE_KEY_FILE), "r", encoding="utf-8") as f:
+            return bytes.fromhex(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_key(base_dir):
+    key = os.urandom(32)
+    key_path = os.path.join(base_dir, SERVICE_KEY_FILE)
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(key.hex())
+    return key
+
+
+def send_request(base_dir, request, timeout=REPLY_TIMEOUT):
+    """Sends one request to a running service. Returns its reply, or None if no service answered."""
+    key = _read_key(base_dir)
+    if key is None:
+        return None
+    try:
+        with Client(service_address(base_dir), family=_service_family(), authkey=key) as conn:
+            conn.send(request)
+            if not conn.poll(timeout):
+                return None
+            return conn.recv()
+    except (OSError, EOFError, ValueError, AuthenticationError) as e:
+        # Covers a missing pipe/socket, a stale key and a service that went away mid-request.
+        print(f"Switch service unavailable: {e}")
+        return None
+
+
+def request_switch(base_dir, account_name, selected_game=None, timeout=REPLY_TIMEOUT):
+    """
+    Asks a running service to switch. Returns (success, message, game), or None to use the cold path. None only
+    means the request never reached a service: once it is acknowledged, the service owns the switch, and a slow or
+    lost reply is reported instead of switching a second time in this process.
+    """
+    key = _read_key(base_dir)
+    if key is None:
+        return None
+    try:
+        conn = Client(service_address(base_dir), family=_service_family(), authkey=key)
+    except (OSError, EOFError, ValueError, AuthenticationError) as e:
+        print(f"Switch service unavailable: {e}")
+        return None
+    with conn:
+        try:
+            conn.send({"cmd": "switch", "account": account_name, "game": selected_game})
+            if not conn.poll(ACK_TIMEOUT) or conn.recv() != QUEUED:
+                print("Switch service did not accept the request.")
+                return None
+        except (OSError, EOFError, ValueError) as e:
+            print(f"Switch service unavailable: {e}")
+            return None
+        try:
+            if not conn.poll(timeout):
+                return (True, f"The switch to '{account_name}' is still running in the background.", COALESCED)
+            return tuple(conn.recv())
+        except (OSError, EOFError, ValueError) as e:
+            return (False, f"Lost the switch service while it was switching to '{account_name}': {e}", None)
+
+
+def is_service_running(base_dir):
+    return send_request(base_dir, {"cmd": "ping"}, timeout=2) == "pong"
+
+
+class SwitchService:
+    """
+    Keeps a warm GameSwitcher resident and serves switch requests from shortcuts and the iMA Menu,
+    so a --switch launch costs one IPC round trip instead of a cold start.
+    """
+
+    def __init__(self, switcher, on_switched=None):
+        self.switcher = switcher
+        self.on_switched = on_switched
+        self.address = service_address(switcher.base_dir)
+        self._listener = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        if is_service_running(self.switcher.base_dir):
+            print("Switch service already running for this install.")
+            return False
+        if sys.platform != "win32" and os.path.exists(self.address):
+            os.remove(self.address)
+        try:
+            key = _write_key(self.switcher.base_dir)
+            self._listener = Listener(self.address, family=_service_family(), authkey=key)
+        except OSError as e:
+            print(f"Could not start switch service: {e}")
+            return False
+        self._thread = threading.Thread(target=self._serve, name="SwitchService", daemon=True)
+        self._thread.start()
+        return True
+
+    def serve_forever(self):
+        if self.start():
+            self._thread.join()
+
+    def stop(self):
+        self._stopping.set()
+        if self._listener is not None:
+            try:
+                # Unblock accept() with a throwaway connection before closing.
+                with Client(self.address, family=_service_family(), authkey=_read_key(self.switcher.base_dir)):
+                    pass
+            except (OSError, EOFError, AuthenticationError):
+                pass
+            finally:
+                self._listener.close()
+                self._listener = None
+                try: os.remove(os.path.join(self.switcher.base_dir, SERVICE_KEY_FILE))
+                except OSError: pass
+
+    def _serve(self):
+        # Stopping is only checked after accept(), so the wake-up connection from stop() is always accepted.
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                if self._stopping.is_set(): break
+                print(f"Switch service: rejected connection: {e}")
+                continue
+            if self._stopping.is_set():
+                conn.close()
+                break
+            # Each connection gets its own thread so a request arriving mid-switch reaches the coordinator
+            # right away and is coalesced with the running one instead of waiting behind it.
+            threading.Thread(target=self._serve_connection, args=(conn,), name="SwitchServiceConnection", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        with conn:
+            try:
+                conn.send(self._handle(conn.recv(), conn))
+            except (OSError, EOFError) as e:
+                print(f"Switch service: client went away: {e}")
+
+    def _handle(self, request, conn=None):
+        if not isinstance(request, dict):
+            return (False, "Malformed request.", None)
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return "pong"
+        if cmd == "switch":
+            account_name = request.get("account")
+            if conn is not None:
+                conn.send(QUEUED) # from here on the request is ours; the client must not fall back to switching itself
+            try:
+                result = self.switcher.switch_account(account_name, selected_game=request.get("game"))
+            except Exception as e:
+                result = (False, f"Switch failed: {e}", None)
+            if self.on_switched and result[0] and result[2] not in ("both", COALESCED):
+                self.on_switched(account_name, result)
+            return result
+        return (False, f"Unknown command: {cmd}", None)
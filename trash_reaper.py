@@ -0,0 +1,144 @@
+import os
+import stat
+import time
+import shutil
+import threading
+from file_locks import LockTimeout
+
+TRASH_DIR_NAME = ".ima-trash"
+# Seconds to wait before retrying a folder that could not be fully deleted (e.g. a file the client still has open).
+RETRY_DELAYS = (1, 2, 5, 15, 60)
+MAX_ATTEMPTS = 10
+
+
+def _clear_readonly(func, path, exc_info):
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+
+class TrashReaper:
+    """
+    Makes directory removal O(1) for the caller: discard() renames the folder into a trash folder on the
+    same volume and a low-priority background thread deletes it. Folders that cannot be deleted yet are
+    retried with backoff. Anything left in a trash folder (e.g. after a crash) is picked up again by recover().
+
+    Only one long-lived process deletes: until start() is called (and wins the cross-process reaper lock),
+    discard() only renames, and the folder waits in the trash for the process that reaps.
+    """
+
+    def __init__(self, backend=None, retry_delays=RETRY_DELAYS, max_attempts=MAX_ATTEMPTS):
+        self.backend = backend
+        self.retry_delays = retry_delays
+        self.max_attempts = max_attempts
+        self._pending = [] # [due time, attempts, path]
+        self._condition = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._lock = None
+        self.active = False
+
+    def start(self, lock=None):
+        """Makes this process the one that deletes. lock is taken without waiting; returns False if another process holds it."""
+        if lock is not None:
+            try:
+                lock.acquire(timeout=0)
+            except LockTimeout:
+                return False
+        self._lock = lock # held (and kept open) until the process exits
+        self.active = True
+        return True
+
+    def discard(self, path, trash_dir):
+        """
+        Moves the directory at path into trash_dir and queues it for deletion. Falls back to deleting in place
+        when the rename is not possible (different volume, folder in use). Returns True if path is gone.
+        """
+        os.makedirs(trash_dir, exist_ok=True)
+        target = os.path.join(trash_dir, f"{os.path.basename(path)}-{time.time_ns()}-{os.urandom(2).hex()}")
+        try:
+            os.rename(path, target)
+        except OSError as e:
+            print(f"Could not move {path} to trash ({e}); deleting in place.")
+            shutil.rmtree(path, onerror=_clear_readonly)
+            return not os.path.exists(path)
+        if self.active: self._enqueue(target)
+        return True
+
+    def recover(self, trash_dir):
+        """Queues whatever an earlier run (or another process) left in trash_dir. Returns the number of entries found."""
+        if not self.active:
+            return 0
+        try:
+            names = os.listdir(trash_dir)
+        except OSError:
+            return 0
+        for name in names:
+            self._enqueue(os.path.join(trash_dir, name))
+        return len(names)
+
+    def pending(self):
+        with self._condition:
+            return len(self._pending) + (1 if self._busy else 0)
+
+    def wait_idle(self, timeout=None):
+        """Blocks until the queue is empty or only holds folders waiting for a retry. Returns True if fully empty."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._busy or any(due <= time.monotonic() for due, _, _ in self._pending):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining if remaining is not None else 0.5)
+            return not self._pending and not self._busy
+
+    def _enqueue(self, path, attempts=0, delay=0):
+        with self._condition:
+            self._pending.append([time.monotonic() + delay, attempts, path])
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="TrashReaper", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        if self.backend is not None:
+            self.backend.lower_thread_priority()
+        while True:
+            with self._condition:
+                while True:
+                    if not self._pending:
+                        self._thread = None
+                        self._condition.notify_all()
+                        return # a later discard() starts a new thread
+                    self._pending.sort()
+                    due, attempts, path = self._pending[0]
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        self._pending.pop(0)
+                        self._busy = True
+                        break
+                    self._condition.wait(wait)
+            self._delete(path, attempts)
+
+    def _delete(self, path, attempts):
+        try:
+            os.rmdir(path) # a junction that ended up here: remove the link, never what it points to
+        except OSError:
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path, onerror=_clear_readonly)
+                elif os.path.lexists(path):
+                    os.remove(path)
+            except OSError:
+                pass
+        with self._condition:
+            if os.path.lexists(path):
+                attempts += 1
+                if attempts < self.max_attempts:
+                    self._enqueue(path, attempts, self.retry_delays[min(attempts, len(self.retry_delays)) - 1])
+                else:
+                    print(f"Giving up on deleting {path} for now; it will be retried on the next start.")
+            self._busy = False
+            self._condition.notify_all()
@@ -8,7 +8,6 @@ from PyQt5.QtWidgets import (
     QLabel,
     QFileDialog,
     QDialog,
-    QScrollArea,
     QGridLayout,
     QGraphicsDropShadowEffect,
     QDesktopWidget,
@@ -26,7 +25,7 @@ from PyQt5.QtWidgets import (
     QGroupBox,
     QFormLayout
 )
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QFont, QPainterPath
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QPainterPath, QDrag
 from PyQt5.QtCore import (
     Qt,
     QSize,
@@ -34,23 +33,84 @@ from PyQt5.QtCore import (
     pyqtSignal,
     QPropertyAnimation,
     QEasingCurve,
-    QRect,
     QRectF,
     QTimer,
+    QMimeData,
 )
+from asset_cache import asset_icon, asset_pixmap, game_icon, game_pixmap
+
+# League's quality levels in game.cfg order; the index is the value written.
+LOL_QUALITY_LEVELS = ["Very Low", "Low", "Medium", "High", "Very High"]
+
+COMBO_STYLE = """
+    QComboBox { 
+        background-color: #4a4647; 
+        border: 1px solid #c89f68; 
+        border-radius: 8px; 
+        padding: 8px; 
+        color: #e0d6d1; 
+        font-weight: bold;
+    }
+    QComboBox:hover { border: 1px solid #d9b68b; }
+    QComboBox::drop-down { border: none; }
+    QComboBox::down-arrow { image: none; /* Can add a custom arrow icon here */ }
+    QComboBox QAbstractItemView { 
+        background-color: #3a3637; 
+        border: 1px solid #c89f68; 
+        selection-background-color: #c89f68;
+        color: #e0d6d1;
+        selection-color: #2c2a2b;
+        padding: 5px;
+    }
+"""
 
 
 class LaunchNotificationWidget(QWidget):
-    def __init__(self, account_name, icon_pixmap, parent=None, standalone=False):
+    # Launch monitor events arrive on its thread; the signal queues them onto the GUI thread.
+    launch_event = pyqtSignal(dict)
+
+    def __init__(self, account_name, icon_pixmap, parent=None, standalone=False, monitor=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground); self.setAttribute(Qt.WA_DeleteOnClose)
+        self.standalone = standalone
+        self.monitor = monitor
         self.setup_ui(account_name, icon_pixmap)
         self.center_on_screen()
-        if standalone:
-            QTimer.singleShot(6000, self.close_and_exit)
+        if monitor is None:
+            QTimer.singleShot(6000, self.finish)
+        else:
+            # Fallback in case the monitor never reports; normally the widget closes shortly after "ready".
+            QTimer.singleShot(int((monitor.ready_timeout + 5) * 1000), self.finish)
+            self.launch_event.connect(self.on_launch_event)
+            monitor.subscribe(self.launch_event.emit)
+
+    def on_launch_event(self, event):
+        kind = event["event"]
+        if kind == "launched":
+            self.status_label.setText("Starting Riot Client...")
+        elif kind == "ready":
+            self.status_label.setText("Riot Client ready")
+            QTimer.singleShot(1500, self.finish)
+        elif kind == "game_started":
+            self.status_label.setText("Game started")
+            QTimer.singleShot(1500, self.finish)
+        elif kind == "failed":
+            self.status_label.setText(event["detail"].get("reason", "Launch failed."))
+            self.status_label.setStyleSheet("color: #e06c75; font-size: 14px;")
+            QTimer.singleShot(4000, self.finish)
+
+    def finish(self):
+        if self.standalone:
+            self.close_and_exit()
         else:
-            QTimer.singleShot(6000, self.close)
+            self.close()
+
+    def closeEvent(self, event):
+        if self.monitor is not None:
+            self.monitor.unsubscribe(self.launch_event.emit)
+            self.monitor = None
+        super().closeEvent(event)
 
     def close_and_exit(self):
         """Closes the widget and quits the QApplication."""
@@ -77,6 +137,12 @@ class LaunchNotificationWidget(QWidget):
         name_label.setStyleSheet("color: white; font-size: 28px; font-weight: bold; text-align: center;")
         layout.addWidget(name_label)
 
+        self.status_label = QLabel("", self)
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("color: #e0d6d1; font-size: 14px;")
+        layout.addWidget(self.status_label)
+
     def center_on_screen(self):
         self.move(QDesktopWidget().availableGeometry().center() - self.frameGeometry().center())
 
@@ -392,6 +458,63 @@ class CustomMessageDialog(PopupDialog):
         button_layout.addWidget(ok_button)
         self.content_layout.addLayout(button_layout)
 
+class SettingsPreviewDialog(PopupDialog):
+    def __init__(self, preview, parent=None):
+        super().__init__("Settings Preview", parent)
+        self.setFixedSize(520, 420)
+
+        summary = f"{preview['keys_changed']} change(s) in {preview['files_changed']} of {preview['files_scanned']} file(s)."
+        if not preview["keys_changed"]:
+            summary = f"Nothing to change. All {preview['files_scanned']} file(s) already match."
+        summary_label = QLabel(summary)
+        summary_label.setStyleSheet("color: #e0d6d1; font-size: 14px; font-weight: bold;")
+        self.content_layout.addWidget(summary_label)
+        per_game = "   ".join(f"{game}: {counts['keys_changed']} in {counts['files_scanned']} file(s)" for game, counts in preview.get("games", {}).items())
+        if per_game:
+            self.content_layout.addWidget(QLabel(per_game, styleSheet="color: #e0d6d1; font-size: 12px;"))
+
+        change_list = QListWidget()
+        change_list.setStyleSheet("QListWidget { background-color: #3a3637; border: 1px solid #4f4a4b; border-radius: 8px; color: #e0d6d1; padding: 5px; }")
+        for path, changes in preview["files"].items():
+            header = QListWidgetItem(path)
+            header.setForeground(QColor("#c89f68"))
+            change_list.addItem(header)
+            for key, old, new in changes:
+                change_list.addItem(f"    {key}: {'(missing)' if old is None else old} -> {'(removed)' if new is None else new}")
+        for path, error in preview["errors"].items():
+            change_list.addItem(f"{path}: {error}")
+        self.content_layout.addWidget(change_list)
+
+        ok_button = QPushButton("OK")
+        ok_button.setStyleSheet("background-color: #c89f68; color: #2c2a2b; font-weight: bold; border-radius: 8px; padding: 8px;")
+        ok_button.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        self.content_layout.addLayout(button_layout)
+
+class SwitchStatsDialog(PopupDialog):
+    def __init__(self, stats_text, parent=None):
+        super().__init__("Switch Stats", parent)
+        self.setFixedSize(520, 420)
+
+        stats_list = QListWidget()
+        stats_list.setStyleSheet("QListWidget { background-color: #3a3637; border: 1px solid #4f4a4b; border-radius: 8px; color: #e0d6d1; padding: 5px; font-family: Consolas, monospace; }")
+        for line in stats_text.splitlines():
+            item = QListWidgetItem(line)
+            if not line.startswith(" "):
+                item.setForeground(QColor("#c89f68"))
+            stats_list.addItem(item)
+        self.content_layout.addWidget(stats_list)
+
+        ok_button = QPushButton("OK")
+        ok_button.setStyleSheet("background-color: #c89f68; color: #2c2a2b; font-weight: bold; border-radius: 8px; padding: 8px;")
+        ok_button.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        self.content_layout.addLayout(button_layout)
+
 class InputDialog(PopupDialog):
     def __init__(self, title, prompt, default_text="", parent=None):
         super().__init__(title, parent)
@@ -455,24 +578,12 @@ class SaveAccountDialog(PopupDialog):
             }
         """)
         
-        valorant_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "valorant.png")
-        lol_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "lol.png")
-
-        if os.path.exists(valorant_icon_path):
-            self.game_combo.addItem(QIcon(valorant_icon_path), "Valorant", "valorant")
-        else:
-            self.game_combo.addItem("Valorant", "valorant")
-
-        if os.path.exists(lol_icon_path):
-            self.game_combo.addItem(QIcon(lol_icon_path), "League of Legends", "lol")
-        else:
-            self.game_combo.addItem("League of Legends", "lol")
-
-        riot_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "Riot.png")
-        if os.path.exists(riot_icon_path):
-            self.game_combo.addItem(QIcon(riot_icon_path), "Both", "both")
-        else:
-            self.game_combo.addItem("Both", "both")
+        for label, game in (("Valorant", "valorant"), ("League of Legends", "lol"), ("Both", "both")):
+            icon = game_icon(game)
+            if icon:
+                self.game_combo.addItem(icon, label, game)
+            else:
+                self.game_combo.addItem(label, game)
             
         self.content_layout.addWidget(self.game_combo)
 
@@ -507,11 +618,11 @@ class SettingsDialog(PopupDialog):
         self.content_layout.setSpacing(10)
         button_style = """QPushButton { background-color: #c89f68; color: #2c2a2b; font-size: 15px; font-weight: bold; border: none; border-radius: 12px; padding: 8px 15px; text-align: left; } QPushButton:hover { background-color: #d9b68b; } QPushButton::icon { width: 24px; height: 24px; } """
         for text, (action, icon_name) in actions.items():
-            icon_path = os.path.join(os.path.dirname(__file__), "Assets", icon_name)
             button = QPushButton(text)
             button.setStyleSheet(button_style) # Apply style directly to each button
-            if os.path.exists(icon_path):
-                button.setIcon(QIcon(icon_path))
+            icon = asset_icon(icon_name)
+            if icon:
+                button.setIcon(icon)
             button.clicked.connect(lambda _, a=action: (self.close(), a()))
             self.content_layout.addWidget(button)
 
@@ -521,7 +632,7 @@ class OptionsDialog(PopupDialog):
     def __init__(self, switcher_instance, parent=None):
         super().__init__("Options", parent)
         self.switcher = switcher_instance
-        self.setFixedSize(600, 700)
+        self.setFixedSize(600, 750)
 
         self.quality_settings_map = {
             "sg.ViewDistanceQuality": "View Distance", "sg.AntiAliasingQuality": "Anti-Aliasing",
@@ -549,9 +660,15 @@ class OptionsDialog(PopupDialog):
             "EAresBoolSettingName::PushToTalkEnabled": "Party Voice Activation",
             "EAresBoolSettingName::EnableHRTF": "HRTF"
         }
+        # League's game.cfg [Performance] levels, 0 (very low) to 4 (very high). "Default" leaves a key as it is.
+        self.lol_quality_settings_map = {
+            "CharacterQuality": "Characters", "EnvironmentQuality": "Environment",
+            "EffectsQuality": "Effects", "ShadowQuality": "Shadows",
+        }
         self.riot_combo_boxes = {}
         self.audio_controls = {}
         self.spin_boxes = {}
+        self.lol_combo_boxes = {}
 
         self.main_widget.setStyleSheet("""
             #popup_widget { background-color: #2c2a2b; border-radius: 15px; border: 1px solid #4f4a4b; }
@@ -582,11 +699,13 @@ class OptionsDialog(PopupDialog):
             }
             QTabBar::tab:selected { background-color: #c89f68; color: #2c2a2b; }
         """)
+        self.setup_preset_row()
         self.content_layout.addWidget(self.tab_widget)
 
         self.setup_graphics_tab()
         self.setup_audio_tab()
         self.setup_advanced_tab()
+        self.setup_lol_tab()
         self.setup_ui_tab()
 
         self.status_label = QLabel("")
@@ -597,6 +716,8 @@ class OptionsDialog(PopupDialog):
         button_layout.setSpacing(10)
         
         apply_button = QPushButton("Apply")
+        preview_button = QPushButton("Preview")
+        undo_button = QPushButton("Undo Last Apply")
         close_button = QPushButton("Close")
         
         button_style = """
@@ -618,17 +739,66 @@ class OptionsDialog(PopupDialog):
             QPushButton:pressed { background-color: #454142; }
         """
         close_button.setStyleSheet(close_button_style)
+        preview_button.setStyleSheet(close_button_style)
+        undo_button.setStyleSheet(close_button_style)
 
         apply_button.clicked.connect(self.apply_settings)
+        preview_button.clicked.connect(self.preview_settings)
+        undo_button.clicked.connect(self.undo_last_apply)
         close_button.clicked.connect(self.close)
 
+        button_layout.addWidget(undo_button)
         button_layout.addStretch()
         button_layout.addWidget(close_button)
+        button_layout.addWidget(preview_button)
         button_layout.addWidget(apply_button)
         self.content_layout.addLayout(button_layout)
 
         self.load_current_settings()
 
+    def setup_preset_row(self):
+        preset_layout = QHBoxLayout()
+        preset_layout.setSpacing(10)
+        preset_layout.addWidget(QLabel("Preset:"))
+
+        self.preset_combo = QComboBox()
+        self.preset_combo.setStyleSheet(COMBO_STYLE)
+        self.populate_presets()
+        self.preset_combo.currentIndexChanged.connect(lambda _: self.load_current_settings())
+        preset_layout.addWidget(self.preset_combo, 1)
+
+        save_preset_button = QPushButton("Save as Preset")
+        save_preset_button.setStyleSheet("background-color: #4f4a4b; color: #e0d6d1; font-weight: bold; border-radius: 8px; padding: 8px;")
+        save_preset_button.clicked.connect(self.save_as_preset)
+        preset_layout.addWidget(save_preset_button)
+        self.content_layout.addLayout(preset_layout)
+
+    def populate_presets(self, select_id=None):
+        self.preset_combo.blockSignals(True)
+        self.preset_combo.clear()
+        self.preset_combo.addItem("Global (all accounts)", None)
+        for preset_id, preset in self.switcher.get_presets().items():
+            self.preset_combo.addItem(preset["name"], preset_id)
+        index = self.preset_combo.findData(select_id)
+        self.preset_combo.setCurrentIndex(max(index, 0))
+        self.preset_combo.blockSignals(False)
+
+    def current_preset_settings(self):
+        preset_id = self.preset_combo.currentData()
+        presets = self.switcher.get_presets()
+        if preset_id in presets:
+            return presets[preset_id]["settings"]
+        return self.switcher.get_graphics_settings()
+
+    def save_as_preset(self):
+        dialog = InputDialog("Save Preset", "Name for these settings:", self.preset_combo.currentData() and self.preset_combo.currentText() or "", self)
+        if dialog.exec_() != QDialog.Accepted or not dialog.get_text(): return
+        settings = self.collect_settings()
+        settings.pop("ui_settings", None)
+        preset_id = self.switcher.save_preset(dialog.get_text(), settings)
+        self.populate_presets(preset_id)
+        self.status_label.setText(f"Saved preset '{dialog.get_text()}'. Assign it to accounts from their right-click menu.")
+
     def setup_graphics_tab(self):
         graphics_tab = QWidget()
         layout = QVBoxLayout(graphics_tab)
@@ -641,31 +811,9 @@ class OptionsDialog(PopupDialog):
         form_layout.setLabelAlignment(Qt.AlignLeft)
         form_layout.setRowWrapPolicy(QFormLayout.WrapAllRows)
         
-        combo_style = """
-            QComboBox { 
-                background-color: #4a4647; 
-                border: 1px solid #c89f68; 
-                border-radius: 8px; 
-                padding: 8px; 
-                color: #e0d6d1; 
-                font-weight: bold;
-            }
-            QComboBox:hover { border: 1px solid #d9b68b; }
-            QComboBox::drop-down { border: none; }
-            QComboBox::down-arrow { image: none; /* Can add a custom arrow icon here */ }
-            QComboBox QAbstractItemView { 
-                background-color: #3a3637; 
-                border: 1px solid #c89f68; 
-                selection-background-color: #c89f68;
-                color: #e0d6d1;
-                selection-color: #2c2a2b;
-                padding: 5px;
-            }
-        """
-
         self.display_mode_combo = QComboBox()
         self.display_mode_combo.addItems(["Default", "Fullscreen", "Windowed Fullscreen", "Windowed"])
-        self.display_mode_combo.setStyleSheet(combo_style)
+        self.display_mode_combo.setStyleSheet(COMBO_STYLE)
         form_layout.addRow(QLabel("Display Mode:"), self.display_mode_combo)
         
         quality_keys = [
@@ -680,13 +828,13 @@ class OptionsDialog(PopupDialog):
             else:
                 combo_box.addItems(["Low", "Med", "High"])
             
-            combo_box.setStyleSheet(combo_style)
+            combo_box.setStyleSheet(COMBO_STYLE)
             self.riot_combo_boxes[key] = combo_box
             form_layout.addRow(QLabel(self.riot_quality_settings_map[key] + ":"), combo_box)
         
         layout.addLayout(form_layout)
         layout.addStretch()
-        self.tab_widget.addTab(graphics_tab, QIcon(os.path.join(os.path.dirname(__file__), "Assets", "Graphics.png")), "Graphics")
+        self.tab_widget.addTab(graphics_tab, asset_icon("Graphics.png") or QIcon(), "Graphics")
 
     def setup_audio_tab(self):
         audio_tab = QWidget()
@@ -732,7 +880,7 @@ class OptionsDialog(PopupDialog):
         main_layout.addWidget(voice_group)
 
         main_layout.addStretch()
-        self.tab_widget.addTab(audio_tab, QIcon(os.path.join(os.path.dirname(__file__), "Assets", "Audio.png")), "Audio")
+        self.tab_widget.addTab(audio_tab, asset_icon("Audio.png") or QIcon(), "Audio")
 
     def setup_advanced_tab(self):
         advanced_tab = QWidget()
@@ -784,59 +932,41 @@ class OptionsDialog(PopupDialog):
 
         layout.addLayout(grid_layout)
         layout.addStretch()
-        self.tab_widget.addTab(advanced_tab, QIcon(os.path.join(os.path.dirname(__file__), "Assets", "Advanced.png")), "Advanced")
+        self.tab_widget.addTab(advanced_tab, asset_icon("Advanced.png") or QIcon(), "Advanced")
 
-    def setup_advanced_tab(self):
-        advanced_tab = QWidget()
-        layout = QVBoxLayout(advanced_tab)
-        layout.setContentsMargins(20, 15, 20, 15)
-        layout.setSpacing(10)
-        
-        preset_buttons_layout = QHBoxLayout()
-        recommended_button = QPushButton("Recommended (Low)")
-        default_button = QPushButton("Default (High)")
-        
-        preset_style = """
-            QPushButton {
-                background-color: #c89f68; color: #2c2a2b; font-weight: bold; 
-                border-radius: 8px; padding: 8px; border: 1px solid #c89f68;
-            }
-            QPushButton:hover { background-color: #d9b68b; }
-            QPushButton:pressed { background-color: #b88f58; }
-        """
-        recommended_button.setStyleSheet(preset_style)
-        default_button.setStyleSheet(preset_style)
-        
-        recommended_button.clicked.connect(lambda: self.set_all_qualities(0))
-        default_button.clicked.connect(lambda: self.set_all_qualities(3))
+    def setup_lol_tab(self):
+        lol_tab = QWidget()
+        layout = QVBoxLayout(lol_tab)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(15)
+        layout.setAlignment(Qt.AlignTop)
 
-        preset_buttons_layout.addWidget(recommended_button)
-        preset_buttons_layout.addWidget(default_button)
-        layout.addLayout(preset_buttons_layout)
-        layout.addSpacing(15)
+        form_layout = QFormLayout()
+        form_layout.setSpacing(10)
+        form_layout.setLabelAlignment(Qt.AlignLeft)
+        form_layout.setRowWrapPolicy(QFormLayout.WrapAllRows)
 
-        grid_layout = QGridLayout()
-        grid_layout.setSpacing(10)
-        
-        items = list(self.quality_settings_map.items())
-        num_rows = (len(items) + 1) // 2 
+        self.lol_display_mode_combo = QComboBox()
+        self.lol_display_mode_combo.addItems(["Default", "Fullscreen", "Windowed Fullscreen", "Windowed"])
+        self.lol_display_mode_combo.setStyleSheet(COMBO_STYLE)
+        form_layout.addRow(QLabel("Window Mode:"), self.lol_display_mode_combo)
 
-        for i, (key, display_name) in enumerate(items):
-            row, col = i % num_rows, (i // num_rows) * 2
-            
-            label = QLabel(display_name + ":")
-            grid_layout.addWidget(label, row, col)
-            
-            spin_box = QSpinBox()
-            spin_box.setRange(0, 3)
-            spin_box.setStyleSheet("QSpinBox { background-color: #4a4647; border: 1px solid #c89f68; border-radius: 8px; padding: 5px; color: #e0d6d1; }")
-            spin_box.setFixedWidth(60)
-            self.spin_boxes[key] = spin_box
-            grid_layout.addWidget(spin_box, row, col + 1, Qt.AlignLeft)
+        for key, display_name in self.lol_quality_settings_map.items():
+            combo_box = QComboBox()
+            combo_box.addItems(["Default"] + LOL_QUALITY_LEVELS)
+            combo_box.setStyleSheet(COMBO_STYLE)
+            self.lol_combo_boxes[key] = combo_box
+            form_layout.addRow(QLabel(display_name + ":"), combo_box)
 
-        layout.addLayout(grid_layout)
+        self.lol_vsync_combo = QComboBox()
+        self.lol_vsync_combo.addItems(["Default", "Off", "On"])
+        self.lol_vsync_combo.setStyleSheet(COMBO_STYLE)
+        self.lol_combo_boxes["WaitForVerticalSync"] = self.lol_vsync_combo
+        form_layout.addRow(QLabel("Vertical Sync:"), self.lol_vsync_combo)
+
+        layout.addLayout(form_layout)
         layout.addStretch()
-        self.tab_widget.addTab(advanced_tab, QIcon(os.path.join(os.path.dirname(__file__), "Assets", "Advanced.png")), "Advanced")
+        self.tab_widget.addTab(lol_tab, game_icon("lol") or QIcon(), "League")
 
     def setup_ui_tab(self):
         ui_tab = QWidget()
@@ -855,54 +985,13 @@ class OptionsDialog(PopupDialog):
         
         layout.addLayout(form_layout)
         layout.addStretch()
-        self.tab_widget.addTab(ui_tab, QIcon(os.path.join(os.path.dirname(__file__), "Assets", "Graphics.png")), "UI") # Using Graphics.png as a placeholder icon for now
+        self.tab_widget.addTab(ui_tab, asset_icon("Graphics.png") or QIcon(), "UI") # Using Graphics.png as a placeholder icon for now
 
     def set_all_qualities(self, value):
         for spin_box in self.spin_boxes.values():
             spin_box.setValue(value)
 
-    def load_current_settings(self):
-        settings = self.switcher.get_graphics_settings()
-        self.display_mode_combo.setCurrentText(settings.get("display_mode", "Default"))
-        
-        riot_settings = settings.get("riot_settings", {})
-        for key, combo_box in self.riot_combo_boxes.items():
-            if key == "EAresIntSettingName::MaterialQuality":
-                value = riot_settings.get(key, "High")
-                if value == "0": combo_box.setCurrentText("Low")
-                elif value == "2": combo_box.setCurrentText("Med")
-                else: combo_box.setCurrentText("High")
-            elif key == "EAresIntSettingName::NvidiaReflexLowLatencySetting":
-                value = riot_settings.get(key, "On")
-                if value == "0": combo_box.setCurrentText("Off")
-                elif value == "2": combo_box.setCurrentText("On + Boost")
-                else: combo_box.setCurrentText("On")
-            else: # Texture, Detail, UI Quality
-                value = riot_settings.get(key, "High")
-                if value == "0": combo_box.setCurrentText("Low")
-                elif value == "1": combo_box.setCurrentText("Med")
-                else: combo_box.setCurrentText("High")
-
-        audio_settings = settings.get("audio_settings", {})
-        for key, control in self.audio_controls.items():
-            value_str = audio_settings.get(key)
-            if value_str is None: 
-                if isinstance(control, ValueSlider):
-                    control.setValue(100)
-                elif isinstance(control, RadioButtonGroup):
-                    is_true_default = (key == "EAresBoolSettingName::PushToTalkEnabled")
-                    control.set_state(is_true_default)
-            else:
-                if key.startswith("EAresFloatSettingName::"):
-                    control.setValue(int(float(value_str) * 100))
-                elif key.startswith("EAresIntSettingName::"):
-                    control.setValue(int(value_str))
-                elif key.startswith("EAresBoolSettingName::"):
-                    control.set_state(value_str.lower() == 'true')
-        
-        self.status_label.setText("Loaded saved settings.")
-
-    def apply_settings(self):
+    def collect_settings(self):
         quality_settings = {key: spin_box.value() for key, spin_box in self.spin_boxes.items()}
         
         riot_settings_to_save = {}
@@ -936,6 +1025,12 @@ class OptionsDialog(PopupDialog):
             elif isinstance(control, RadioButtonGroup):
                 audio_settings_to_save[key] = "True" if control.get_state() else "False"
 
+        lol_settings_to_save = {}
+        for key, combo_box in self.lol_combo_boxes.items():
+            index = combo_box.currentIndex()
+            if index > 0: # 0 is "Default"
+                lol_settings_to_save[key] = str(index - 1)
+
         ui_settings_to_save = {
             "show_game_icons": self.show_game_icons_toggle.get_state()
         }
@@ -945,8 +1040,31 @@ class OptionsDialog(PopupDialog):
             "quality": quality_settings,
             "riot_settings": riot_settings_to_save,
             "audio_settings": audio_settings_to_save,
+            "lol_display_mode": self.lol_display_mode_combo.currentText(),
+            "lol_settings": lol_settings_to_save,
             "ui_settings": ui_settings_to_save
         }
+        return settings_to_save
+
+    def preview_settings(self):
+        settings = self.collect_settings()
+        settings.pop("ui_settings", None)
+        SettingsPreviewDialog(self.switcher.preview_settings(settings), self).exec_()
+
+    def undo_last_apply(self):
+        success, message = self.switcher.rollback_settings()
+        self.status_label.setText(message)
+
+    def apply_settings(self):
+        settings_to_save = self.collect_settings()
+        preset_id = self.preset_combo.currentData()
+        if preset_id:
+            self.switcher.set_ima_config({"ui_settings": settings_to_save.pop("ui_settings")})
+            self.switcher.save_preset(self.preset_combo.currentText(), settings_to_save, preset_id)
+            self.status_label.setText(f"Preset '{self.preset_combo.currentText()}' saved. Accounts using it get it on their next switch.")
+            self.settings_applied.emit()
+            return
+
         self.switcher.save_graphics_settings(settings_to_save)
         success, message = self.switcher.update_all_game_user_settings(settings_to_save)
         
@@ -957,7 +1075,7 @@ class OptionsDialog(PopupDialog):
             self.status_label.setText(f"Failed to apply settings: {message}")
 
     def load_current_settings(self):
-        settings = self.switcher.get_graphics_settings()
+        settings = self.current_preset_settings()
         self.display_mode_combo.setCurrentText(settings.get("display_mode", "Default"))
         
         riot_settings = settings.get("riot_settings", {})
@@ -994,6 +1112,12 @@ class OptionsDialog(PopupDialog):
                     control.setValue(int(value_str))
                 elif key.startswith("EAresBoolSettingName::"):
                     control.set_state(value_str.lower() == 'true')
+
+        self.lol_display_mode_combo.setCurrentText(settings.get("lol_display_mode", "Default"))
+        lol_settings = settings.get("lol_settings", {})
+        for key, combo_box in self.lol_combo_boxes.items():
+            value = str(lol_settings.get(key, ""))
+            combo_box.setCurrentIndex(int(value) + 1 if value.isdigit() and int(value) + 1 < combo_box.count() else 0)
         
         ui_settings = self.switcher.config.get("ui_settings", {})
         self.show_game_icons_toggle.set_state(ui_settings.get("show_game_icons", True))
@@ -1099,10 +1223,9 @@ class GameSelectionDialog(PopupDialog):
         layout.setAlignment(Qt.AlignCenter)
         layout.setSpacing(10)
 
-        icon_path = os.path.join(os.path.dirname(__file__), "Assets", icon_filename)
-        if os.path.exists(icon_path):
+        pixmap = asset_pixmap(icon_filename, 80)
+        if pixmap:
             icon_label = QLabel()
-            pixmap = QPixmap(icon_path).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             icon_label.setPixmap(pixmap)
             icon_label.setAlignment(Qt.AlignCenter)
             layout.addWidget(icon_label)
@@ -1119,10 +1242,14 @@ class GameSelectionDialog(PopupDialog):
         self.game_selected.emit(game_id)
         self.accept()
 
+ACCOUNT_MIME_TYPE = "application/x-ima-account"
+
+
 class AccountWidget(QWidget):
     selected = pyqtSignal(str)
     double_clicked = pyqtSignal(str)
     context_menu_requested = pyqtSignal(str, QPoint)
+    dropped = pyqtSignal(str, str, bool) # dragged account, this account, dropped on the right half (after it)
 
     def __init__(self, account_name, icon, game, parent=None, is_add_button=False):
         super().__init__(parent)
@@ -1132,6 +1259,8 @@ class AccountWidget(QWidget):
         self.setFixedSize(120, 140)
         self.is_selected, self.is_hovered = False, False
         self.is_add_button = is_add_button
+        self._press_pos = None
+        self.setAcceptDrops(not is_add_button)
         self.setStyleSheet("""QWidget#AccountWidget { background-color: #3a3637; border-radius: 15px; border: 3px solid transparent; } 
                               QWidget#AccountWidget[selected="true"] { border-color: #c89f68; } 
                               QLabel#NameLabel { color: #e0d6d1; font-size: 13px; font-weight: bold; } 
@@ -1166,20 +1295,10 @@ class AccountWidget(QWidget):
             self.game_icon_label.setFixedSize(game_icon_size, game_icon_size)
             self.game_icon_label.setAlignment(Qt.AlignCenter)
             self.game_icon_label.move(self.width() - game_icon_size - 10, self.height() - game_icon_size - 10)
-            
-            valorant_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "valorant.png")
-            lol_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "lol.png")
-            riot_icon_path = os.path.join(os.path.dirname(__file__), "Assets", "Riot.png")
 
             self.game_icon_label.setVisible(False) # Hide by default, will be set by load_accounts
-            if self.game == 'valorant' and os.path.exists(valorant_icon_path):
-                pixmap = QPixmap(valorant_icon_path).scaled(game_icon_size, game_icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.game_icon_label.setPixmap(pixmap)
-            elif self.game == 'lol' and os.path.exists(lol_icon_path):
-                pixmap = QPixmap(lol_icon_path).scaled(game_icon_size, game_icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.game_icon_label.setPixmap(pixmap)
-            elif self.game == 'both' and os.path.exists(riot_icon_path):
-                pixmap = QPixmap(riot_icon_path).scaled(game_icon_size, game_icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap = game_pixmap(self.game, game_icon_size)
+            if pixmap:
                 self.game_icon_label.setPixmap(pixmap)
 
     def init_animations(self):
@@ -1244,10 +1363,55 @@ class AccountWidget(QWidget):
         if hasattr(self, 'game_icon_label'):
             self.game_icon_label.setVisible(show)
 
+    def set_account_name(self, account_name):
+        self.account_name = account_name
+        self.name_label.setText(account_name)
+
+    def set_game(self, game):
+        self.game = game
+        if hasattr(self, 'game_icon_label'):
+            pixmap = game_pixmap(game, self.game_icon_label.width())
+            if pixmap: self.game_icon_label.setPixmap(pixmap)
+            else: self.game_icon_label.clear()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
+            self._press_pos = event.pos()
             self.selected.emit(self.account_name)
 
+    def mouseMoveEvent(self, event):
+        if self.is_add_button or self._press_pos is None or not event.buttons() & Qt.LeftButton: return
+        if (event.pos() - self._press_pos).manhattanLength() < QApplication.startDragDistance(): return
+        self._press_pos = None
+        mime = QMimeData()
+        mime.setData(ACCOUNT_MIME_TYPE, self.account_name.encode("utf-8"))
+        drag = QDrag(self)
+        drag.setMimeData(mime)
+        drag.setPixmap(self.grab())
+        drag.setHotSpot(event.pos())
+        drag.exec_(Qt.MoveAction)
+
+    def mouseReleaseEvent(self, event):
+        self._press_pos = None
+        super().mouseReleaseEvent(event)
+
+    def _dragged_name(self, event):
+        if not event.mimeData().hasFormat(ACCOUNT_MIME_TYPE): return None
+        name = bytes(event.mimeData().data(ACCOUNT_MIME_TYPE)).decode("utf-8")
+        return name if name != self.account_name else None
+
+    def dragEnterEvent(self, event):
+        if self._dragged_name(event): event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        if self._dragged_name(event): event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        name = self._dragged_name(event)
+        if not name: return
+        event.acceptProposedAction()
+        self.dropped.emit(name, self.account_name, event.pos().x() > self.width() // 2)
+
     def mouseDoubleClickEvent(self, event):
         if self.is_add_button: return
         if event.button() == Qt.LeftButton: